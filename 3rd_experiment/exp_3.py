@@ -3,93 +3,34 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from avl_tree import AVLTree
-import time
+from benchmarks.runner import measure
+from benchmarks.workloads import k_inversions
 import matplotlib.pyplot as plt
 import datetime
 import pandas as pd
 
-def generate_permutation(n, k):
-    """Generate a permutation of size n with exactly k inversions."""
-    inv = []
-    remaining = k
-    for i in range(n):
-        max_inv = n - 1 - i
-        val = min(remaining, max_inv)
-        inv.append(val)
-        remaining -= val
-    perm = []
-    for i in range(n, 0, -1):
-        perm.insert(inv[n - i], i)
-    return perm
-
-def run_experiment(n, num_points=80, repeats=1):
+def run_experiment(n, num_points=80, repeats=5):
     max_inv = n * (n - 1) // 2
     ks = [int(i * max_inv / (num_points - 1)) for i in range(num_points)]
-    times_max = []
+    summaries = []
     for k in ks:
-        total_time = 0
-        for _ in range(repeats):
-            perm = generate_permutation(n, k)
+        perm = k_inversions(n, k)
+
+        def insert_all(_):
             tree = AVLTree()
-            start_time = time.perf_counter()
             for x in perm:
                 tree.insert(x, str(x), start="max")
-            end_time = time.perf_counter()
-            total_time += (end_time - start_time)
-        avg_time = total_time / repeats
-        times_max.append(avg_time)
-    return ks, times_max
-
-def filter_local_outliers(xs, ys, factor=0.8, window=4):
-    """
-    Remove points where a value is much larger than the average of the next `window` neighbors.
-    Returns filtered (xs, ys) as new lists.
-    """
-    n = len(ys)
-    if n < window + 1:
-        return xs, ys
-    filtered_xs = [xs[i] for i in range(n - window)]
-    filtered_ys = [ys[i] for i in range(n - window)]
-    for i in range(n - window):
-        next_neighbors = ys[i+1:i+1+window]
-        if len(next_neighbors) < window:
-            continue
-        local_avg = sum(next_neighbors) / window
-        if ys[i] > factor * local_avg:
-            filtered_xs.remove(xs[i])
-            filtered_ys.remove(ys[i])
-    # Add the last `window` points (cannot be checked)
-    for i in range(n - window, n):
-        filtered_xs.append(xs[i])
-        filtered_ys.append(ys[i])
-    return filtered_xs, filtered_ys
-
-def remove_largest_points(xs, ys, num_remove=17):
-    """
-    Remove the num_remove largest points from ys (and corresponding xs).
-    Returns filtered (xs, ys) as new lists.
-    """
-    if len(ys) <= num_remove:
-        return xs, ys
-    # Get indices of the largest points
-    largest_indices = sorted(range(len(ys)), key=lambda i: ys[i], reverse=True)[:num_remove]
-    largest_indices_set = set(largest_indices)
-    filtered_xs = [x for i, x in enumerate(xs) if i not in largest_indices_set]
-    filtered_ys = [y for i, y in enumerate(ys) if i not in largest_indices_set]
-    return filtered_xs, filtered_ys
+        summaries.append(measure(insert_all, repeats=repeats))
+    return ks, summaries
 
-def plot_results(ks, times_max, n):
+def plot_results(ks, summaries, n):
     xs = [k / 1e6 for k in ks]  # convert to millions for readability
-    # Remove 10 largest points first
-    xs_filtered, times_max_filtered = remove_largest_points(xs, times_max, num_remove=10)
-    # Filter out local outliers (using 4 neighbors ahead)
-    xs_filtered, times_max_filtered = filter_local_outliers(xs_filtered, times_max_filtered, factor=1.0, window=4)
-    # Remove 10 largest points again
-    xs_filtered, times_max_filtered = remove_largest_points(xs_filtered, times_max_filtered, num_remove=10)
-    # Filter again at the end
-    xs_filtered, times_max_filtered = filter_local_outliers(xs_filtered, times_max_filtered, factor=1.0, window=4)
+    medians = [s["median"] for s in summaries]
     plt.figure(figsize=(12, 6))
-    plt.plot(xs_filtered, times_max_filtered, marker='o', linestyle='-')
+    # every measured point is shown, the band is the p10-p90 spread of the repeats
+    plt.fill_between(xs, [s["p10"] for s in summaries], [s["p90"] for s in summaries], alpha=0.3, label='p10-p90')
+    plt.plot(xs, medians, marker='o', linestyle='-', label='median')
+    plt.legend()
     plt.xlabel('Number of Inversions (millions)')
     plt.ylabel('Insertion Time (seconds)')
     plt.title(f'AVL Insert Time  (from max) vs Number Of inversions (n={n})')
@@ -102,8 +43,10 @@ def plot_results(ks, times_max, n):
     print(f"Saved graph: {out_path}")
     # Save results to Excel
     df = pd.DataFrame({
-        'Inversions (millions)': xs_filtered,
-        'Insertion Time (seconds)': times_max_filtered
+        'Inversions (millions)': xs,
+        'Median Insertion Time (seconds)': medians,
+        'p10 (seconds)': [s["p10"] for s in summaries],
+        'p90 (seconds)': [s["p90"] for s in summaries],
     })
     excel_path = os.path.join(out_dir, f'avl_insert_time_vs_inversions_{date_str}.xlsx')
     df.to_excel(excel_path, index=False)
@@ -113,9 +56,9 @@ def plot_results(ks, times_max, n):
 def main():
     n = 7_000
     num_points = 300
-    repeats = 1
-    ks, times_max = run_experiment(n, num_points, repeats)
-    plot_results(ks, times_max, n)
+    repeats = 5
+    ks, summaries = run_experiment(n, num_points, repeats)
+    plot_results(ks, summaries, n)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,139 @@
+# =============================
+# Monoid-augmented AVL Tree
+# =============================
+
+import math
+import operator
+from typing import Optional, Iterable, Tuple, Callable, Any, NamedTuple
+
+from avl_tree import AVLTree, AVLNode
+
+"""An AVL tree that keeps an associative aggregate of every subtree, for O(log n) range folds.
+
+Each node stores agg, the combination of lift(key, value) over its subtree in key order. It
+is recomputed in update_subtree_data next to subtree_size, so rotations, rebalancing, bulk
+builds and split/join maintain it with no extra passes. aggregate(lo, hi) then combines
+O(log n) stored subtree aggregates instead of visiting every node in the range.
+
+combine must be associative and identity its neutral element; it need not be commutative,
+the fold always runs in ascending key order."""
+
+
+class Monoid(NamedTuple):
+	identity: Any
+	combine: Callable[[Any, Any], Any]
+	lift: Callable[[Any, Any], Any]  # (key, value) -> the element a node contributes
+
+
+SUM = Monoid(0, operator.add, lambda key, value: value)
+MIN = Monoid(math.inf, min, lambda key, value: value)
+MAX = Monoid(-math.inf, max, lambda key, value: value)
+COUNT = Monoid(0, operator.add, lambda key, value: 1)
+
+
+class AggregateNode(AVLNode):
+	__slots__ = ("agg",)
+
+	def __init__(self, key: Optional[int], value: Optional[str], is_a_virtual_node: bool = False):
+		super().__init__(key, value, is_a_virtual_node)
+		self.agg: Any = None  # set by AggregateTree._new_node
+
+
+class AggregateTree(AVLTree):
+	"""
+	An AVLTree folding monoid (SUM by default) over its values.
+	Change a stored value with set_value, which refreshes the aggregates above the node;
+	assigning node.value directly leaves them stale. Multimap mode is not supported.
+	"""
+	node_class = AggregateNode
+
+	def __init__(self, monoid: Monoid = SUM, key: Optional[Callable[[Any], Any]] = None, multi: bool = False):
+		if multi:
+			raise ValueError("AggregateTree does not support multimap mode")
+		super().__init__(key=key)
+		self.monoid = monoid
+
+	@classmethod
+	def from_sorted(cls, items: Iterable[Tuple[int, Any]], key: Optional[Callable[[Any], Any]] = None,
+			multi: bool = False, monoid: Monoid = SUM) -> 'AggregateTree':
+		tree = cls(monoid, key=key, multi=multi)
+		tree._load_sorted(items)
+		return tree
+
+	def _new_node(self, key: int, val: Any) -> AVLNode:
+		node = super()._new_node(key, val)
+		# an inserted leaf gets no update_subtree_data call of its own, only its ancestors do
+		node.agg = self.monoid.lift(key, val)
+		return node
+
+	def update_subtree_data(self, node: AVLNode) -> None:
+		super().update_subtree_data(node)
+		identity, combine, lift = self.monoid
+		agg = lift(node.key, node.value)
+		if node.left.is_real_node():
+			agg = combine(node.left.agg, agg)
+		if node.right.is_real_node():
+			agg = combine(agg, node.right.agg)
+		node.agg = agg
+
+	def set_value(self, node: AVLNode, val: Any) -> None:
+		"""Replaces the value of node and refreshes the aggregates on its root path, O(log n)."""
+		node.value = val
+		while node is not None:
+			self.update_subtree_data(node)
+			node = node.parent
+
+	# --- Range Aggregates ---
+	def aggregate(self, lo: Optional[int] = None, hi: Optional[int] = None) -> Any:
+		"""Folds the monoid over the values with lo <= key <= hi (unbounded where None),
+		in O(log n); the identity if the range is empty."""
+		identity, combine, lift = self.monoid
+		lo, hi = self._sort_key(lo), self._sort_key(hi)
+		# descend to the highest node inside the range, where the paths to lo and hi split
+		node = self.root
+		while node.is_real_node():
+			if lo is not None and node.sort_key < lo:
+				node = node.right
+			elif hi is not None and node.sort_key > hi:
+				node = node.left
+			else:
+				break
+		if not node.is_real_node():
+			return identity
+		agg = lift(node.key, node.value)
+		return combine(combine(self._fold_from(node.left, lo), agg), self._fold_to(node.right, hi))
+
+	def _fold_from(self, node: AVLNode, lo) -> Any:
+		"""Fold over the keys >= lo in node's subtree."""
+		identity, combine, lift = self.monoid
+		if lo is None:
+			return node.agg if node.is_real_node() else identity
+		acc = identity
+		while node.is_real_node():
+			if node.sort_key >= lo:
+				# node and its right subtree come after anything still to be found on the left
+				part = lift(node.key, node.value)
+				if node.right.is_real_node():
+					part = combine(part, node.right.agg)
+				acc = combine(part, acc)
+				node = node.left
+			else:
+				node = node.right
+		return acc
+
+	def _fold_to(self, node: AVLNode, hi) -> Any:
+		"""Fold over the keys <= hi in node's subtree."""
+		identity, combine, lift = self.monoid
+		if hi is None:
+			return node.agg if node.is_real_node() else identity
+		acc = identity
+		while node.is_real_node():
+			if node.sort_key <= hi:
+				part = lift(node.key, node.value)
+				if node.left.is_real_node():
+					part = combine(node.left.agg, part)
+				acc = combine(acc, part)
+				node = node.right
+			else:
+				node = node.left
+		return acc
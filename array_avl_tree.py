@@ -0,0 +1,376 @@
+# =============================
+# Array-backed AVL Tree
+# =============================
+
+from array import array
+from typing import Optional, List, Tuple
+
+from printree import printree
+
+"""An AVL tree that keeps its nodes in parallel typed arrays instead of AVLNode objects.
+
+Slot 0 of every array is the virtual node (height -1), so a child index of 0 plays the
+role VirtualAVLNode plays in avl_tree.py. Keys must fit in a signed 64-bit int.
+Freed slots are chained through the left array and reused by later inserts."""
+
+NO_PARENT = -1
+
+
+class ArrayAVLNode(object):
+	"""A lightweight handle to one slot of an ArrayAVLTree.
+
+	Exposes the same read-only fields as AVLNode, so code written against AVLNode
+	(search(...).value, node.left.height, get_bf(), ...) works unchanged.
+	A handle is only valid until the node it points to is deleted.
+	"""
+	__slots__ = ("tree", "index")
+
+	def __init__(self, tree: 'ArrayAVLTree', index: int):
+		self.tree = tree
+		self.index = index
+
+	@property
+	def key(self) -> Optional[int]:
+		return self.tree._keys[self.index] if self.index else None
+
+	@property
+	def value(self) -> Optional[str]:
+		return self.tree._values[self.index]
+
+	@property
+	def parent(self) -> Optional['ArrayAVLNode']:
+		return self.tree._node(self.tree._parent[self.index])
+
+	@property
+	def left(self) -> Optional['ArrayAVLNode']:
+		return ArrayAVLNode(self.tree, self.tree._left[self.index]) if self.index else None
+
+	@property
+	def right(self) -> Optional['ArrayAVLNode']:
+		return ArrayAVLNode(self.tree, self.tree._right[self.index]) if self.index else None
+
+	@property
+	def height(self) -> int:
+		return self.tree._height[self.index]
+
+	@property
+	def is_balanced(self) -> bool:
+		return bool(self.tree._balanced[self.index])
+
+	def is_real_node(self) -> bool:
+		return self.index != 0
+
+	def get_bf(self) -> int:
+		return self.tree._balance_of(self.index)
+
+	def __eq__(self, other: object) -> bool:
+		return isinstance(other, ArrayAVLNode) and other.tree is self.tree and other.index == self.index
+
+	def __hash__(self) -> int:
+		return hash((id(self.tree), self.index))
+
+
+# =============================
+# Array AVL Tree Class
+# =============================
+
+class ArrayAVLTree(object):
+	"""
+	Drop-in alternative to AVLTree with structure-of-arrays storage.
+	"""
+	def __init__(self):
+		self._keys = array("q", [0])
+		self._values: List[Optional[str]] = [None]
+		self._left = array("q", [0])
+		self._right = array("q", [0])
+		self._parent = array("q", [NO_PARENT])
+		self._height = array("b", [-1])
+		self._balanced = array("b", [0])
+		self._free_head: int = 0
+		self._root: int = 0
+		self._max: int = 0
+		self._size: int = 0
+		self._balanced_nodes: int = 0
+
+	# --- Node Handles ---
+	def _node(self, index: int) -> Optional[ArrayAVLNode]:
+		if index == NO_PARENT:
+			return None
+		return ArrayAVLNode(self, index)
+
+	@property
+	def root(self) -> ArrayAVLNode:
+		return ArrayAVLNode(self, self._root)
+
+	@property
+	def max(self) -> ArrayAVLNode:
+		return ArrayAVLNode(self, self._max)
+
+	# --- Slot Allocation ---
+	def _alloc(self, key: int, val: str) -> int:
+		index = self._free_head
+		if index:
+			self._free_head = self._left[index]
+			self._keys[index] = key
+			self._values[index] = val
+			self._left[index] = 0
+			self._right[index] = 0
+			self._parent[index] = NO_PARENT
+			self._height[index] = 0
+			self._balanced[index] = 1
+		else:
+			index = len(self._keys)
+			self._keys.append(key)
+			self._values.append(val)
+			self._left.append(0)
+			self._right.append(0)
+			self._parent.append(NO_PARENT)
+			self._height.append(0)
+			self._balanced.append(1)
+		return index
+
+	def _free(self, index: int) -> None:
+		self._values[index] = None
+		self._left[index] = self._free_head
+		self._free_head = index
+
+	# --- Search Methods ---
+	def search(self, key: int) -> Optional[ArrayAVLNode]:
+		keys, left, right = self._keys, self._left, self._right
+		i = self._root
+		while i:
+			k = keys[i]
+			if key == k:
+				return ArrayAVLNode(self, i)
+			elif key < k:
+				i = left[i]
+			else:
+				i = right[i]
+		return None
+
+	def find(self, key: int) -> Optional[ArrayAVLNode]:
+		"""Alias for search method."""
+		return self.search(key)
+
+	# --- Insertion Methods ---
+	def insert(self, key: int, val: str, start: str = "root") -> int:
+		if not self._root:
+			self.create_root(key, val)
+			return 0
+
+		keys, left, right, parent_of = self._keys, self._left, self._right, self._parent
+		current = self._root if start == "root" else self._max
+
+		if start == "max":
+			while current != self._root and keys[current] > key and parent_of[current] != NO_PARENT:
+				current = parent_of[current]
+
+		parent = current
+		while current:
+			parent = current
+			current = left[current] if key < keys[current] else right[current]
+
+		new_index = self._alloc(key, val)
+		parent_of[new_index] = parent
+		if key < keys[parent]:
+			left[parent] = new_index
+		else:
+			right[parent] = new_index
+
+		if key > keys[self._max]:
+			self._max = new_index
+
+		self._size += 1
+		self._balanced_nodes += 1
+		return self.rebalance_after_change(new_index)
+
+	def create_root(self, key: int, val: str) -> None:
+		self._root = self._alloc(key, val)
+		self._max = self._root
+		self._size = 1
+		self._balanced_nodes = 1
+
+	# --- Deletion Methods ---
+	def delete(self, node: Optional[ArrayAVLNode]) -> int:
+		if node is None or not node.is_real_node():
+			return 0
+		index = node.index
+		left, right = self._left, self._right
+
+		if left[index] and right[index]:
+			succ = right[index]
+			while left[succ]:
+				succ = left[succ]
+			self._keys[index] = self._keys[succ]
+			self._values[index] = self._values[succ]
+			index = succ
+
+		if index == self._max:
+			self._update_max_on_delete()
+
+		child = left[index] if left[index] else right[index]
+
+		self._switch_node_with(index, child)
+		self._size -= 1
+		if self._balanced[index]:
+			self._balanced_nodes -= 1
+
+		rebalance_count = self.rebalance_after_change(child)
+		self._free(index)
+
+		if self._size == 0:
+			self._root = 0
+			self._max = 0
+
+		return rebalance_count
+
+	def _update_max_on_delete(self) -> None:
+		m = self._max
+		if self._left[m]:
+			self._max = self._left[m]
+		elif self._parent[m] != NO_PARENT:
+			self._max = self._parent[m]
+		else:
+			self._max = 0
+
+	def _switch_node_with(self, index: int, child: int) -> None:
+		parent = self._parent[index]
+		if parent == NO_PARENT:
+			self._root = child
+			self._parent[child] = NO_PARENT
+		else:
+			if self._left[parent] == index:
+				self._left[parent] = child
+			else:
+				self._right[parent] = child
+			self._parent[child] = parent
+
+	# --- Traversal Methods ---
+	def avl_to_array(self) -> List[Tuple[int, str]]:
+		keys, values, left, right = self._keys, self._values, self._left, self._right
+		result: List[Tuple[int, str]] = []
+		stack: List[int] = []
+		i = self._root
+		while stack or i:
+			while i:
+				stack.append(i)
+				i = left[i]
+			i = stack.pop()
+			result.append((keys[i], values[i]))
+			i = right[i]
+		return result
+
+	# --- Size/Root/Balance Methods ---
+	def size(self) -> int:
+		return self._size
+
+	def get_root(self) -> Optional[ArrayAVLNode]:
+		if self._root:
+			return ArrayAVLNode(self, self._root)
+		return None
+
+	def get_amir_balance_factor(self) -> float:
+		return self._balanced_nodes / self._size if self._size > 0 else 0
+
+	def get_max_node(self) -> ArrayAVLNode:
+		return ArrayAVLNode(self, self._max)
+
+	def get_balance(self, node: ArrayAVLNode) -> int:
+		return self._balance_of(node.index)
+
+	def _get_balance(self, node: ArrayAVLNode) -> int:
+		return self._balance_of(node.index)
+
+	def _balance_of(self, i: int) -> int:
+		return self._height[self._left[i]] - self._height[self._right[i]]
+
+	#prints tree fancily, useful for debugging
+	def print_tree_fancily(self, file: Optional[str] = None, append: bool = True, bykey: bool = True,
+			max_depth: Optional[int] = None, focus: Optional[int] = None) -> None:
+		node = self.root
+		if focus is not None:
+			node = self.search(focus)
+			if node is None:
+				raise ValueError(f"focus key {focus!r} is not in the tree")
+		printree(node, file=file, append=append, bykey=bykey, max_depth=max_depth)
+
+	# --- Rebalancing Methods ---
+	def rebalance_after_change(self, changed: int) -> int:
+		rebalance_count = 0
+		parent_of, height = self._parent, self._height
+		i = parent_of[changed]
+		while i != NO_PARENT:
+			old_height = height[i]
+			self.update_node_data(i)
+			if abs(self._balance_of(i)) > 1:
+				rebalance_count += self.rebalance_node(i)
+				i = parent_of[i]
+			else:
+				rebalance_count += 1
+			if height[i] == old_height:
+				break
+			i = parent_of[i]
+		return rebalance_count
+
+	def update_node_data(self, i: int) -> None:
+		height = self._height
+		lh = height[self._left[i]]
+		rh = height[self._right[i]]
+		height[i] = 1 + (lh if lh > rh else rh)
+		new_is_balanced = 1 if lh == rh else 0
+		if new_is_balanced != self._balanced[i]:
+			self._balanced_nodes += 1 if new_is_balanced else -1
+			self._balanced[i] = new_is_balanced
+
+	def rebalance_node(self, i: int) -> int:
+		rebalance_count = 0
+		balance = self._balance_of(i)
+		if balance > 1:
+			if self._balance_of(self._left[i]) < 0:
+				self.rotate_left(self._left[i])
+				rebalance_count += 1
+			self.rotate_right(i)
+		elif balance < -1:
+			if self._balance_of(self._right[i]) > 0:
+				self.rotate_right(self._right[i])
+				rebalance_count += 1
+			self.rotate_left(i)
+		return rebalance_count + 1
+
+	def rotate_left(self, x: int) -> None:
+		left, right, parent_of = self._left, self._right, self._parent
+		y = right[x]
+		right[x] = left[y]
+		if left[y]:
+			parent_of[left[y]] = x
+		xp = parent_of[x]
+		parent_of[y] = xp
+		if xp == NO_PARENT:
+			self._root = y
+		elif left[xp] == x:
+			left[xp] = y
+		else:
+			right[xp] = y
+		left[y] = x
+		parent_of[x] = y
+		self.update_node_data(x)
+		self.update_node_data(y)
+
+	def rotate_right(self, y: int) -> None:
+		left, right, parent_of = self._left, self._right, self._parent
+		x = left[y]
+		left[y] = right[x]
+		if right[x]:
+			parent_of[right[x]] = y
+		yp = parent_of[y]
+		parent_of[x] = yp
+		if yp == NO_PARENT:
+			self._root = x
+		elif left[yp] == y:
+			left[yp] = x
+		else:
+			right[yp] = x
+		right[x] = y
+		parent_of[y] = x
+		self.update_node_data(y)
+		self.update_node_data(x)
@@ -0,0 +1,133 @@
+# =============================
+# Asyncio AVL Tree
+# =============================
+
+import asyncio
+from itertools import groupby
+from typing import Optional, List, Tuple, AsyncIterator
+
+from avl_tree import AVLTree, AVLNode
+
+"""An asyncio front end for AVLTree.
+
+Writes are not applied when they are awaited: ainsert/adelete queue the operation and
+return a future, and a single flush task applies everything queued during the same
+event-loop turn as one batch (sorted, so consecutive keys share their search path through
+the tree's finger). Batches larger than max_batch are applied in slices with a yield to the
+event loop in between, and range scans yield every scan_chunk items, so readers keep
+getting scheduled during write bursts and long scans.
+
+Everything runs on the event loop thread; the tree itself is never touched concurrently."""
+
+INSERT = "insert"
+DELETE = "delete"
+
+
+class AsyncAVLTree(object):
+	"""
+	Wraps an AVLTree (a new one unless tree is given) for use from coroutines.
+	"""
+	def __init__(self, tree: Optional[AVLTree] = None, max_batch: int = 1024, scan_chunk: int = 256):
+		self.tree: AVLTree = tree if tree is not None else AVLTree()
+		self.max_batch = max_batch
+		self.scan_chunk = scan_chunk
+		self.batches_applied: int = 0
+		self._pending: List[Tuple[str, int, Optional[str], asyncio.Future]] = []
+		self._flush_task: Optional[asyncio.Task] = None
+
+	# --- Write Methods ---
+	async def ainsert(self, key: int, val: str) -> int:
+		"""Inserts (key, val) with the next batch; returns the rebalancing count of the insert."""
+		return await self._enqueue(INSERT, key, val)
+
+	async def adelete(self, key: int) -> int:
+		"""Deletes key with the next batch; returns the rebalancing count (0 if key is absent)."""
+		return await self._enqueue(DELETE, key, None)
+
+	async def drain(self) -> None:
+		"""Waits until every write queued so far has been applied."""
+		while self._flush_task is not None:
+			await asyncio.shield(self._flush_task)
+
+	def _enqueue(self, kind: str, key: int, val: Optional[str]) -> asyncio.Future:
+		loop = asyncio.get_running_loop()
+		future = loop.create_future()
+		self._pending.append((kind, key, val, future))
+		if self._flush_task is None:
+			self._flush_task = loop.create_task(self._flush())
+		return future
+
+	async def _flush(self) -> None:
+		try:
+			# let every writer that is ready in this loop turn join the batch
+			await asyncio.sleep(0)
+			while self._pending:
+				batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+				try:
+					self._apply(batch)
+				except Exception as e:
+					# e.g. a key function failing while the batch is sorted; no writer may hang
+					for *_, future in batch:
+						if not future.done():
+							future.set_exception(e)
+				self.batches_applied += 1
+				if self._pending:
+					await asyncio.sleep(0)
+		finally:
+			self._flush_task = None
+
+	def _apply(self, batch: List[Tuple[str, int, Optional[str], asyncio.Future]]) -> None:
+		"""Applies a batch in arrival order of its insert/delete runs, each run sorted by key."""
+		tree = self.tree
+		for kind, run in groupby(batch, key=lambda op: op[0]):
+			keyed = []
+			for op in run:
+				try:
+					keyed.append((tree._sort_key(op[1]), op))
+				except Exception as e:
+					# a key the key function rejects fails its own writer only
+					if not op[3].done():
+						op[3].set_exception(e)
+			keyed.sort(key=lambda pair: pair[0])
+			for _, (_, key, val, future) in keyed:
+				try:
+					if kind == INSERT:
+						result = tree.insert(key, val, start="finger")
+					else:
+						result = tree.delete(tree.search(key, start="finger"))
+				except Exception as e:
+					if not future.done():
+						future.set_exception(e)
+					continue
+				if not future.done():
+					future.set_result(result)
+
+	# --- Read Methods ---
+	def search(self, key: int) -> Optional[AVLNode]:
+		"""Reads are O(log n) and applied writes are already in the tree, so this is synchronous."""
+		return self.tree.search(key)
+
+	def size(self) -> int:
+		return self.tree.size()
+
+	async def aitems(self, lo: Optional[int] = None, hi: Optional[int] = None) -> AsyncIterator[Tuple[int, str]]:
+		"""Yields (key, value) with lo <= key <= hi in ascending order, scan_chunk items at a time.
+		Each chunk is read in one step and the scan resumes after the last key it returned, so
+		writes applied between chunks are seen by later chunks but never break the scan."""
+		order = self.tree._sort_key
+		after: Optional[int] = None
+		while True:
+			chunk: List[Tuple[int, str]] = []
+			for key, val in self.tree.items(lo if after is None else after, hi):
+				if after is not None and order(key) <= order(after):
+					continue
+				# never cut a run of equal keys, resuming after it would skip the rest
+				if len(chunk) >= self.scan_chunk and order(key) != order(chunk[-1][0]):
+					break
+				chunk.append((key, val))
+			for item in chunk:
+				yield item
+			if len(chunk) < self.scan_chunk:
+				return
+			after = chunk[-1][0]
+			await asyncio.sleep(0)
@@ -0,0 +1,214 @@
+# =============================
+# Binary Snapshots
+# =============================
+
+import mmap
+import os
+import pickle
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Optional, List, Tuple, Iterable, Iterator
+
+from avl_tree import AVLNode
+
+"""A compact flat file format for the contents of an AVL tree, and a read-only tree over it.
+
+Layout (little-endian):
+	header   magic b"AVLSNAP1", item count n (u64), value blob length (u64)
+	keys     n x int64, ascending
+	offsets  (n + 1) x u64, value i is blob[offsets[i]:offsets[i + 1]]
+	tags     n x u8, how value i is encoded: 0 None, 1 UTF-8 str, 2 pickle
+	blob     the encoded values
+
+Values that are neither None nor str are pickled, and reading a snapshot unpickles them, so
+only read snapshot files from a trusted source. Keys must fit in a signed 64-bit int. Because the keys are stored sorted, loading is a
+linear AVLTree.from_sorted over read_snapshot, and MappedAVLTree can binary search the mapped key array in
+place without creating any node objects."""
+
+MAGIC = b"AVLSNAP1"
+HEADER = struct.Struct("<8sQQ")
+
+TAG_NONE = 0
+TAG_STR = 1
+TAG_PICKLE = 2
+
+
+def _little_endian(values: array) -> array:
+	if sys.byteorder == "big":
+		values.byteswap()
+	return values
+
+
+def write_snapshot(path: str, items: Iterable[Tuple[int, str]]) -> int:
+	"""Writes (key, value) pairs in ascending key order to path; returns the item count.
+	The file is written under a temporary name and renamed, so path is always complete."""
+	keys = array("q")
+	offsets = array("Q", [0])
+	tags = bytearray()
+	blob: List[bytes] = []
+	size = 0
+	for key, val in items:
+		if keys and key < keys[-1]:
+			raise ValueError(f"write_snapshot got key {key!r} after {keys[-1]!r}")
+		keys.append(key)
+		if val is None:
+			tags.append(TAG_NONE)
+		elif isinstance(val, str):
+			tags.append(TAG_STR)
+			val = val.encode("utf-8")
+		else:
+			tags.append(TAG_PICKLE)
+			val = pickle.dumps(val)
+		if val is not None:
+			blob.append(val)
+			size += len(val)
+		offsets.append(size)
+	tmp_path = path + ".tmp"
+	with open(tmp_path, "wb") as f:
+		f.write(HEADER.pack(MAGIC, len(keys), size))
+		f.write(_little_endian(keys).tobytes())
+		f.write(_little_endian(offsets).tobytes())
+		f.write(tags)
+		for chunk in blob:
+			f.write(chunk)
+		f.flush()
+		os.fsync(f.fileno())
+	os.replace(tmp_path, path)
+	return len(keys)
+
+
+def read_snapshot(path: str) -> Iterator[Tuple[int, str]]:
+	"""Yields the (key, value) pairs of a snapshot file in ascending key order.
+	The file is read into memory and decoded with explicit byte order, so unlike
+	MappedAVLTree this works on any host."""
+	with open(path, "rb") as f:
+		header = f.read(HEADER.size)
+		if len(header) < HEADER.size or header[:len(MAGIC)] != MAGIC:
+			raise ValueError(f"{path} is not an AVL snapshot")
+		_, count, size = HEADER.unpack(header)
+		keys = _read_array(f, "q", count, path)
+		offsets = _read_array(f, "Q", count + 1, path)
+		tags = f.read(count)
+		blob = memoryview(f.read(size))
+	if len(tags) < count or len(blob) < size:
+		raise ValueError(f"{path} is truncated")
+	for i in range(count):
+		yield keys[i], _decode_value(tags[i], blob, offsets[i], offsets[i + 1])
+
+
+def _file_size(count: int, size: int) -> int:
+	"""Bytes of a snapshot of count items whose value blob is size bytes long."""
+	return HEADER.size + 8 * count + 8 * (count + 1) + count + size
+
+
+def _read_array(f, typecode: str, count: int, path: str) -> array:
+	values = array(typecode)
+	data = f.read(values.itemsize * count)
+	if len(data) < values.itemsize * count:
+		raise ValueError(f"{path} is truncated")
+	values.frombytes(data)
+	return _little_endian(values)
+
+
+def _decode_value(tag: int, blob, start: int, end: int) -> Optional[str]:
+	if tag == TAG_NONE:
+		return None
+	raw = blob[start:end]
+	if tag == TAG_STR:
+		return str(raw, "utf-8")
+	return pickle.loads(raw)
+
+
+# =============================
+# Memory-mapped Read-only Tree
+# =============================
+
+class MappedAVLTree(object):
+	"""
+	Answers search and range queries straight from a memory-mapped snapshot file.
+	Opening it costs O(1) regardless of size; pages are read in by the OS on first touch.
+	"""
+	def __init__(self, path: str):
+		self._file = open(path, "rb")
+		try:
+			self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+		except ValueError:
+			# an empty file cannot be mapped
+			self._file.close()
+			raise ValueError(f"{path} is not an AVL snapshot") from None
+		if len(self._map) < HEADER.size or self._map[:len(MAGIC)] != MAGIC:
+			self.close()
+			raise ValueError(f"{path} is not an AVL snapshot")
+		_, count, size = HEADER.unpack_from(self._map, 0)
+		if len(self._map) < _file_size(count, size):
+			self.close()
+			raise ValueError(f"{path} is truncated")
+		if sys.byteorder == "big":
+			self.close()
+			raise NotImplementedError("MappedAVLTree needs a little-endian host")
+		self._view = view = memoryview(self._map)
+		keys_at = HEADER.size
+		offsets_at = keys_at + 8 * count
+		tags_at = offsets_at + 8 * (count + 1)
+		blob_at = tags_at + count
+		self._count = count
+		self._keys = view[keys_at:offsets_at].cast("q")
+		self._offsets = view[offsets_at:tags_at].cast("Q")
+		self._tags = view[tags_at:blob_at]
+		self._blob = view[blob_at:]
+
+	def _value(self, i: int) -> Optional[str]:
+		return _decode_value(self._tags[i], self._blob, self._offsets[i], self._offsets[i + 1])
+
+	# --- Search Methods ---
+	def search(self, key: int) -> Optional[AVLNode]:
+		"""Returns a detached AVLNode holding key and its value, None if key is absent."""
+		i = bisect_left(self._keys, key)
+		if i < self._count and self._keys[i] == key:
+			return AVLNode(key, self._value(i))
+		return None
+
+	def find(self, key: int) -> Optional[AVLNode]:
+		"""Alias for search method."""
+		return self.search(key)
+
+	# --- Traversal Methods ---
+	def items(self, lo: Optional[int] = None, hi: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+		first = 0 if lo is None else bisect_left(self._keys, lo)
+		end = self._count if hi is None else bisect_right(self._keys, hi)
+		for i in range(first, end):
+			yield self._keys[i], self._value(i)
+
+	def __iter__(self) -> Iterator[int]:
+		return iter(self._keys)
+
+	def avl_to_array(self) -> List[Tuple[int, str]]:
+		return list(self.items())
+
+	def rank(self, key: int) -> int:
+		return bisect_left(self._keys, key)
+
+	def count_range(self, lo: int, hi: int) -> int:
+		if hi < lo:
+			return 0
+		return bisect_right(self._keys, hi) - bisect_left(self._keys, lo)
+
+	def size(self) -> int:
+		return self._count
+
+	# --- Lifecycle ---
+	def close(self) -> None:
+		for view in ("_keys", "_offsets", "_tags", "_blob", "_view"):
+			if hasattr(self, view):
+				getattr(self, view).release()
+				delattr(self, view)
+		self._map.close()
+		self._file.close()
+
+	def __enter__(self) -> 'MappedAVLTree':
+		return self
+
+	def __exit__(self, *exc_info) -> None:
+		self.close()
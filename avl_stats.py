@@ -0,0 +1,85 @@
+# =============================
+# AVL Tree Operation Statistics
+# =============================
+
+from collections import Counter
+from typing import Dict
+
+"""Counters an AVLTree fills in while tree.stats is set (see AVLTree.enable_stats).
+
+The tree only checks `self.stats is not None` on its hot paths, so a tree without stats
+pays one attribute test per operation. Histograms are Counters mapping a length to how
+many operations had it."""
+
+ROTATION_KINDS = ("single_left", "single_right", "double_left_right", "double_right_left")
+
+
+def rotation_kind(left_heavy: bool, double: bool) -> str:
+	"""Names the rotation that fixes a node whose left (or else right) subtree was too tall."""
+	if left_heavy:
+		return "double_left_right" if double else "single_right"
+	return "double_right_left" if double else "single_left"
+
+
+class AVLStats(object):
+	"""
+	operations:        searches, search hits, inserts, deletes and key comparisons made by search
+	search_path:       nodes visited per search
+	insert_path:       nodes descended per insert, from the start node to the new node's parent
+	rotations:         rebalance_node calls by rotation kind (a double rotation counts once)
+	rebalance_levels:  ancestors rebalance_after_change updated before heights stopped changing
+	"""
+	def __init__(self):
+		self.reset()
+
+	def reset(self) -> None:
+		self.operations: Counter = Counter()
+		self.search_path: Counter = Counter()
+		self.insert_path: Counter = Counter()
+		self.rotations: Counter = Counter({kind: 0 for kind in ROTATION_KINDS})
+		self.rebalance_levels: Counter = Counter()
+
+	# --- Recording Methods ---
+	def record_search(self, visited: int, comparisons: int, found: bool) -> None:
+		self.operations["search"] += 1
+		self.operations["search_hit"] += found
+		self.operations["comparisons"] += comparisons
+		self.search_path[visited] += 1
+
+	def record_insert(self, descended: int) -> None:
+		self.operations["insert"] += 1
+		self.insert_path[descended] += 1
+
+	def record_delete(self) -> None:
+		self.operations["delete"] += 1
+
+	def record_rotation(self, kind: str) -> None:
+		self.rotations[kind] += 1
+
+	def record_rebalance(self, levels: int) -> None:
+		self.rebalance_levels[levels] += 1
+
+	# --- Export ---
+	def as_dict(self) -> Dict[str, object]:
+		"""A JSON-friendly snapshot of every counter plus a few derived means."""
+		searches = self.operations["search"]
+		return {
+			"operations": dict(self.operations),
+			"rotations": dict(self.rotations),
+			"search_path": _sorted(self.search_path),
+			"insert_path": _sorted(self.insert_path),
+			"rebalance_levels": _sorted(self.rebalance_levels),
+			"mean_search_path": _mean(self.search_path),
+			"mean_insert_path": _mean(self.insert_path),
+			"mean_rebalance_levels": _mean(self.rebalance_levels),
+			"comparisons_per_search": self.operations["comparisons"] / searches if searches else 0.0,
+		}
+
+
+def _sorted(histogram: Counter) -> Dict[int, int]:
+	return dict(sorted(histogram.items()))
+
+
+def _mean(histogram: Counter) -> float:
+	total = sum(histogram.values())
+	return sum(length * count for length, count in histogram.items()) / total if total else 0.0
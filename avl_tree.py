@@ -2,7 +2,13 @@
 # AVL Tree Implementation
 # =============================
 
-from typing import Optional, List, Tuple
+import copy
+import sys
+from operator import attrgetter
+from typing import Optional, List, Tuple, Iterable, Iterator, Callable, Any
+
+from avl_stats import AVLStats, rotation_kind
+from printree import printree
 
 #username - complete info
 #id1      - complete info 
@@ -12,23 +18,33 @@ from typing import Optional, List, Tuple
 
 """A class represnting a node in an AVL tree"""
 
+# value of a node deleted in lazy-delete mode (see AVLTree), until compaction unlinks it
+_TOMBSTONE = object()
+
 
 class AVLNode(object):
 	"""Constructor, you are allowed to add more fields.
+	Fields are declared in __slots__ so nodes carry no per-instance __dict__;
+	any new field must be added there as well.
 
 	@type key: int or None
 	@param key: key of your node
 	@type value: string
 	@param value: data of your node
+	sort_key is what the tree compares: the key itself, or the tree's key function applied to it.
 	"""
+	__slots__ = ("key", "sort_key", "value", "parent", "left", "right", "height", "is_balanced", "subtree_size")
+
 	def __init__(self, key: Optional[int], value: Optional[str], is_a_virtual_node: bool = False):
 		self.key: Optional[int] = key
+		self.sort_key = key
 		self.value: Optional[str] = value
 		self.parent: Optional['AVLNode'] = None
 		self.left: Optional['AVLNode'] = None if is_a_virtual_node else VirtualAVLNode.get_create_instance()
 		self.right: Optional['AVLNode'] = None if is_a_virtual_node else VirtualAVLNode.get_create_instance()
 		self.height: int = 0 if not is_a_virtual_node else -1
 		self.is_balanced: bool = True if not is_a_virtual_node else False
+		self.subtree_size: int = 1 if not is_a_virtual_node else 0
 
 	def is_real_node(self) -> bool:
 		return True
@@ -42,7 +58,9 @@ class AVLNode(object):
 # =============================
 
 class VirtualAVLNode(AVLNode):
+	__slots__ = ()
 	singleton_object: Optional['VirtualAVLNode'] = None
+	value_count: int = 0  # the empty subtree of a multimap, see multimap_node_class
 
 	def __init__(self):
 		super().__init__(None, None, True)
@@ -58,6 +76,23 @@ class VirtualAVLNode(AVLNode):
 		return False
 
 
+# =============================
+# Multimap Nodes
+# =============================
+
+_multimap_node_classes: dict = {}
+
+
+def multimap_node_class(node_class: type) -> type:
+	"""The subclass of node_class a multimap builds its nodes from: it adds value_count, the
+	number of values in the node's subtree, so only multimaps pay for that slot."""
+	cls = _multimap_node_classes.get(node_class)
+	if cls is None:
+		cls = type("Multimap" + node_class.__name__, (node_class,), {"__slots__": ("value_count",)})
+		_multimap_node_classes[node_class] = cls
+	return cls
+
+
 # =============================
 # Utility Functions
 # =============================
@@ -72,6 +107,32 @@ def min_node_of(node: AVLNode) -> AVLNode:
 	return node
 
 
+def max_node_of(node: AVLNode) -> AVLNode:
+	while node.right.is_real_node():
+		node = node.right
+	return node
+
+
+def successor_of(node: AVLNode) -> Optional[AVLNode]:
+	"""Returns the next node in key order, None after the maximum."""
+	if node.right.is_real_node():
+		return min_node_of(node.right)
+	parent = node.parent
+	while parent is not None and node is parent.right:
+		node, parent = parent, parent.parent
+	return parent
+
+
+def predecessor_of(node: AVLNode) -> Optional[AVLNode]:
+	"""Returns the previous node in key order, None before the minimum."""
+	if node.left.is_real_node():
+		return max_node_of(node.left)
+	parent = node.parent
+	while parent is not None and node is parent.left:
+		node, parent = parent, parent.parent
+	return parent
+
+
 # =============================
 # AVL Tree Class
 # =============================
@@ -79,49 +140,197 @@ def min_node_of(node: AVLNode) -> AVLNode:
 class AVLTree(object):
 	"""
 	Constructor, you are allowed to add more fields.
+	key, like the key argument of sorted, maps a key to what the tree orders by (e.g. str.lower,
+	or a datetime to a timestamp). It is applied once per inserted node and once per query, so
+	the descent loops compare the stored results directly. For a two-argument comparator pass
+	functools.cmp_to_key(comparator), at the cost of a Python call per comparison.
+	multi=True makes the tree a multimap: each distinct key has one node whose value is the
+	list (bucket) of the values inserted under it, in insertion order. Traversals yield one
+	(key, value) pair per value and size() counts values, while rank, select and count_range
+	count distinct keys. Each multimap node also counts the values of its subtree, so size()
+	and split stay O(1) and O(log n).
+	lazy_delete=True makes delete mark the node as a tombstone (O(1) after the search, no
+	rotations) instead of unlinking it. Searches and traversals skip tombstones, and inserting a
+	tombstoned key revives its node. Once tombstones make up compact_ratio of the nodes, compact
+	relinks the live nodes as a balanced tree in O(n), so deletes cost O(1) amortized on top of
+	their search. subtree_size counts only live nodes, so rank, select and count_range stay
+	O(log n) reads with tombstones present; split and join compact first. Node handles stay
+	valid until their own key is deleted, as a lazy delete never moves keys between nodes.
+	Lazy mode is meant for unique keys: with duplicates a search may stop at a tombstone.
 	"""
-	def __init__(self):
+	node_class = AVLNode  # subclasses that keep extra per-node data use an AVLNode subclass
+
+	def __init__(self, key: Optional[Callable[[Any], Any]] = None, multi: bool = False,
+			lazy_delete: bool = False, compact_ratio: float = 0.5):
+		if not 0 < compact_ratio <= 1:
+			raise ValueError(f"compact_ratio must be in (0, 1], got {compact_ratio!r}")
+		self.key_func: Optional[Callable[[Any], Any]] = key
+		self.multi: bool = multi
+		if multi:
+			self.node_class = multimap_node_class(self.node_class)
+		self.lazy_delete: bool = lazy_delete
+		self.compact_ratio: float = compact_ratio
+		self._tombstones: int = 0  # nodes deleted in lazy-delete mode but still linked
 		self.root: AVLNode = VirtualAVLNode.get_create_instance()
 		self.max: AVLNode = self.root
+		self.finger: AVLNode = self.root  # last node touched by search/insert/delete
 		self._size: int = 0
 		self._balanced_nodes: int = 0
+		self._balanced_stale: bool = False  # _balanced_nodes needs a recount, see _refresh_totals
+		self.stats: Optional[AVLStats] = None  # collected only while enabled, see enable_stats
 
 	# --- Search Methods ---
-	def search(self, key: int) -> Optional[AVLNode]:
-		node = self.root
+	def search(self, key: int, start="root") -> Optional[AVLNode]:
+		"""start is "root", "max", "finger" or a node of this tree, see _start_node."""
+		if self.key_func is not None:
+			key = self.key_func(key)
+		node = self.root if start == "root" else self._start_node(start, key)
+		if self.stats is not None:
+			return self._search_counted(node, key)
 		while node.is_real_node():
-			if key == node.key:
+			if key == node.sort_key:
+				if node.value is _TOMBSTONE:
+					return None
+				self.finger = node
 				return node
-			elif key < node.key:
+			elif key < node.sort_key:
 				node = node.left
 			else:
 				node = node.right
 		return None
 	
+	def _lookup(self, key: int) -> Optional[AVLNode]:
+		"""search from the root that neither moves the finger nor records stats, so it
+		changes nothing and can run alongside other readers."""
+		key = self._sort_key(key)
+		node = self.root
+		while node.is_real_node():
+			if key == node.sort_key:
+				return node if node.value is not _TOMBSTONE else None
+			node = node.left if key < node.sort_key else node.right
+		return None
+
 	def find(self, key: int) -> Optional[AVLNode]:
 		"""Alias for search method."""
 		return self.search(key)
 
+	def search_all(self, key: int) -> List[str]:
+		"""Returns every value stored under key, in O(log n + k) (empty if key is absent)."""
+		return [val for _, val in self.items(key, key)]
+
+	def _search_counted(self, node: AVLNode, key: int) -> Optional[AVLNode]:
+		"""The search loop with visits and comparisons counted, kept apart so search without
+		stats runs no counting code."""
+		visited = comparisons = 0
+		found = None
+		while node.is_real_node():
+			visited += 1
+			comparisons += 1
+			if key == node.sort_key:
+				if node.value is not _TOMBSTONE:
+					self.finger = found = node
+				break
+			comparisons += 1
+			node = node.left if key < node.sort_key else node.right
+		self.stats.record_search(visited, comparisons, found is not None)
+		return found
+
 	# --- Insertion Methods ---
-	def insert(self, key: int, val: str, start: str = "root") -> int:
+	def insert(self, key: int, val: str, start="root") -> int:
+		if self._tombstones and self._revive(key, val):
+			return 0
+		if self.multi:
+			return self._insert_value(key, val, start)
+		return self._insert_node(self._new_node(key, val), start)
+
+	def _insert_value(self, key: int, val: str, start) -> int:
+		"""Multimap insert: adds val to the bucket of key, creating its node if needed."""
+		node = self.search(key, start)
+		if node is not None:
+			node.value.append(val)
+			self._adjust_counts(node, 0, 1)
+			return 0
+		return self._insert_node(self._new_node(key, [val]), start)
+
+	def _revive(self, key: int, val: str) -> bool:
+		"""Lazy-delete insert: if the descent for key stops at a tombstone, puts val back into
+		that node and returns True."""
+		sort_key = self._sort_key(key)
+		node = self.root
+		while node.is_real_node():
+			if sort_key == node.sort_key:
+				if node.value is not _TOMBSTONE:
+					return False
+				node.key = key
+				node.value = [val] if self.multi else val
+				self._tombstones -= 1
+				self._adjust_counts(node, 1, 1 if self.multi else 0)
+				self.finger = node
+				return True
+			node = node.left if sort_key < node.sort_key else node.right
+		return False
+
+	def _insert_node(self, new_node: AVLNode, start) -> int:
 		# Handle empty tree case
 		if not self.root.is_real_node():
-			self.create_root(key, val)
+			self._set_root_node(new_node)
+			if self.stats is not None:
+				self.stats.record_insert(0)
 			return 0
 
-		# Choose starting point
-		current = self.root if start == "root" else self.max
+		# Choose starting point: the root, or a node we climb up from (see _start_node)
+		current = self.root if start == "root" else self._start_node(start, new_node.sort_key)
 
-		# If starting from max, climb UP until we're at a node whose subtree should contain the new key
-		if start == "max":
-			while current != self.root and current.key > key and current.parent:
-				current = current.parent
+		self._insert_below(current, new_node)
+		self.finger = new_node
+		if self.stats is not None:
+			self.stats.record_insert(self._depth_below(current, new_node))
+		return self.rebalance_after_change(new_node)
+
+	def _new_node(self, key: int, val: str) -> AVLNode:
+		node = self.node_class(key, val)
+		if self.key_func is not None:
+			node.sort_key = self.key_func(key)
+		if self.multi:
+			node.value_count = len(val)
+		return node
+
+	@staticmethod
+	def _adjust_counts(node: AVLNode, keys: int, values: int) -> None:
+		"""Adds keys to subtree_size and values to value_count (multimaps only) of node and its
+		ancestors, after node was tombstoned or revived or its bucket changed in place."""
+		while node is not None:
+			node.subtree_size += keys
+			if values:
+				node.value_count += values
+			node = node.parent
 
-		# Now do standard BST descent from that node
+	def _start_node(self, start, key) -> AVLNode:
+		"""Resolves the start argument of search/insert to the node the descent begins at.
+		key is a sort key.
+		"max" climbs from the maximum, "finger" from the last node touched, and a node of this
+		tree (e.g. one returned by search) from that node. The climb stops at the lowest
+		ancestor whose subtree is where key belongs, so keys d positions away from the start
+		node are usually reached in O(log d) steps."""
+		if start == "max":
+			node = self.max
+		elif start == "finger":
+			node = self.finger
+		elif isinstance(start, AVLNode):
+			node = start
+		else:
+			raise ValueError(f"start must be 'root', 'max', 'finger' or a node, got {start!r}")
+		return self._climb_towards(node, key)
+
+	def _insert_below(self, current: AVLNode, new_node: AVLNode) -> None:
+		"""Attaches new_node somewhere under current (which must be a real node whose subtree
+		is where its key belongs); the caller rebalances."""
+		key = new_node.sort_key
+		# Standard BST descent from current
 		parent = None
 		while current.is_real_node():
 			parent = current
-			if key < current.key:
+			if key < current.sort_key:
 				if not current.left.is_real_node():
 					break
 				current = current.left
@@ -130,42 +339,317 @@ class AVLTree(object):
 					break
 				current = current.right
 
-		# Create and attach new node
-		new_node = AVLNode(key, val)
+		# Attach new node
 		new_node.parent = parent
-		if key < parent.key:
+		if key < parent.sort_key:
 			parent.left = new_node
 		else:
 			parent.right = new_node
 
 		# Update max if needed
-		if key > self.max.key:
+		if key > self.max.sort_key:
 			self.max = new_node
 
 		self._size += 1
 		self._balanced_nodes += 1
-		return self.rebalance_after_change(new_node)
 
 	def create_root(self, key: int, val: str) -> None:
-		self.root = AVLNode(key, val)
+		self._set_root_node(self._new_node(key, val))
+
+	def _set_root_node(self, node: AVLNode) -> None:
+		self.root = node
 		self.max = self.root
+		self.finger = self.root
 		self._size = 1
 		self._balanced_nodes = 1
+		self._balanced_stale = False
+
+	@staticmethod
+	def _depth_below(top: AVLNode, node: AVLNode) -> int:
+		"""Number of edges from top down to its descendant node."""
+		depth = 0
+		while node is not top:
+			node = node.parent
+			depth += 1
+		return depth
+
+	# --- Batch Methods ---
+	def insert_many(self, pairs: Iterable[Tuple[int, str]]) -> int:
+		"""Inserts a batch of (key, value) pairs and returns the total rebalancing count,
+		i.e. the sum of what insert would have returned for each pair in key order.
+		The batch is sorted first and each key is placed by climbing from the node inserted
+		before it, so neighbouring keys share their search path instead of each starting at
+		the root. An empty tree is bulk-loaded as in from_sorted, which does no rebalancing."""
+		if self.multi:
+			return sum(self.insert(key, val, start="finger") for key, val in sorted(pairs, key=self._pair_order))
+		if self._tombstones:
+			# a new node must not land next to a tombstone of its key, so those keys are revived
+			pairs = [(key, val) for key, val in pairs if not self._revive(key, val)]
+		batch = sorted((self._new_node(key, val) for key, val in pairs), key=attrgetter("sort_key"))
+		if not batch:
+			return 0
+		if not self.root.is_real_node():
+			self._link_sorted(batch)
+			return 0
+		rebalance_count = 0
+		for node in batch:
+			rebalance_count += self._insert_node(node, start="finger")
+		return rebalance_count
+
+	def delete_many(self, keys: Iterable[int]) -> int:
+		"""Deletes the node of every key in the batch and returns the total rebalancing count.
+		Keys are visited in sorted order, each search starting from where the previous one
+		ended. Keys that are not in the tree are skipped."""
+		rebalance_count = 0
+		for key in sorted(keys, key=self.key_func):
+			if not self.root.is_real_node():
+				break
+			node = self.search(key, start="finger")
+			if node is not None:
+				rebalance_count += self.delete(node)
+		return rebalance_count
+
+	def _pair_order(self, pair: Tuple[int, str]):
+		return self._sort_key(pair[0])
+
+	def _climb_towards(self, node: AVLNode, key) -> AVLNode:
+		"""Climbs from node to the lowest ancestor whose subtree is where (sort) key belongs.
+		Virtual and deleted nodes (no parent, yet not the root) fall back to the root."""
+		if not node.is_real_node() or (node.parent is None and node is not self.root):
+			return self.root
+		if key < node.sort_key:
+			# stop once an ancestor we are right of bounds the subtree below by key
+			parent = node.parent
+			while parent is not None and not (parent.sort_key < key and node is parent.right):
+				node, parent = parent, parent.parent
+		elif key >= self.max.sort_key:
+			# nothing bounds the max from above, so no climb could find a closer start
+			node = self.max
+		else:
+			# stop once an ancestor we are left of bounds the subtree above by key
+			parent = node.parent
+			while parent is not None and not (key < parent.sort_key and node is parent.left):
+				node, parent = parent, parent.parent
+		return node
+
+	# --- Persistence ---
+	def save(self, path: str) -> None:
+		"""Writes the tree to path in the flat binary format of avl_snapshot (int64 keys).
+		The format stores keys in ascending raw order, so trees with a key function, which
+		may order keys differently or hold non-int keys, cannot be saved."""
+		if self.key_func is not None:
+			raise ValueError("save needs a tree without a key function, the snapshot format orders raw int keys")
+		from avl_snapshot import write_snapshot
+		write_snapshot(path, self.items())
+
+	@classmethod
+	def load(cls, path: str, multi: bool = False) -> 'AVLTree':
+		"""Rebuilds a tree written by save, in O(n) (see from_sorted). Multimap mode is not
+		saved; pass the one the tree was built with."""
+		from avl_snapshot import read_snapshot
+		return cls.from_sorted(read_snapshot(path), multi=multi)
+
+	# --- Split/Join ---
+	def join(self, key: int, other: 'AVLTree', val: Optional[str] = None) -> 'AVLTree':
+		"""Joins a new node (key, val) and all of other into self, in O(log n).
+		Every key of self must be <= key and every key of other >= key. other is left empty.
+		Returns self, so AVLTree.join(t1, key, t2) reads as the joined tree.
+		A multimap needs key strictly between the two trees, as a key has only one node there.
+		Tombstones are carried over, except that a side whose deleted boundary key is not
+		strictly on its side of key is compacted first, in O(n)."""
+		mid = self._new_node(key, [val] if self.multi else val)
+		if self.max.value is _TOMBSTONE and self.max.sort_key >= mid.sort_key:
+			self.compact()
+		if other.root.is_real_node():
+			first = min_node_of(other.root)
+			if first.value is _TOMBSTONE and first.sort_key <= mid.sort_key:
+				other.compact()
+		if self.multi and ((self.root.is_real_node() and self.max.sort_key == mid.sort_key) or
+				(other.root.is_real_node() and min_node_of(other.root).sort_key == mid.sort_key)):
+			raise ValueError(f"join key {key!r} is already in a multimap being joined")
+		if self.root.is_real_node() and self.max.sort_key > mid.sort_key:
+			raise ValueError(f"join key {key!r} is smaller than the maximum {self.max.key!r} of the left tree")
+		if other.root.is_real_node() and min_node_of(other.root).sort_key < mid.sort_key:
+			raise ValueError(f"join key {key!r} is larger than the minimum of the right tree")
+		# mid arrives balanced; update_node_data's deltas along the join path keep the sum exact
+		self._balanced_nodes += other._balanced_nodes + 1
+		self._balanced_stale = self._balanced_stale or other._balanced_stale
+		self._size += other._size + 1
+		self._tombstones += other._tombstones
+		self.max = other.max if other.root.is_real_node() else mid
+		self._join_subtrees(self.root, mid, other.root)
+		self.finger = self.root
+		other._set_empty()
+		return self
+
+	def split(self, key: int) -> Tuple['AVLTree', 'AVLTree']:
+		"""Splits the tree into (keys < key, keys >= key) in O(log n). Both trees are new and
+		reuse this tree's nodes, so self is left empty. Their balanced counts are recounted in
+		O(n) by the first get_amir_balance_factor on each (see _refresh_totals). Tombstones are
+		compacted away first, in O(n): a piece's tombstone count cannot be read off its subtrees."""
+		self.compact()
+		# every node on the search path goes to one side together with its off-path subtree
+		to_left: List[AVLNode] = []
+		to_right: List[AVLNode] = []
+		key = self._sort_key(key)
+		node = self.root
+		while node.is_real_node():
+			if node.sort_key < key:
+				to_left.append(node)
+				node = node.right
+			else:
+				to_right.append(node)
+				node = node.left
+		left, right = self._empty_like(), self._empty_like()
+		# join bottom-up, so each join is paid for by the height of the piece it adds
+		for node in reversed(to_left):
+			left._join_subtrees(node.left, node, left.root)
+		for node in reversed(to_right):
+			right._join_subtrees(right.root, node, node.right)
+		left._refresh_totals()
+		right._refresh_totals()
+		self._set_empty()
+		return left, right
+
+	def _join_subtrees(self, left: AVLNode, mid: AVLNode, right: AVLNode) -> None:
+		"""Makes self.root the AVL join of the detached subtrees left and right around node mid.
+		Costs O(|left.height - right.height| + 1); the totals are refreshed by the caller."""
+		left.parent = None
+		right.parent = None
+		mid.parent = None
+		if left.height > right.height + 1:
+			# hang mid off the right spine of left, at the first node no taller than right + 1
+			self.root = left
+			parent, node = None, left
+			while node.height > right.height + 1:
+				parent, node = node, node.right
+			parent.right = mid
+		elif right.height > left.height + 1:
+			self.root = right
+			parent, node = None, right
+			while node.height > left.height + 1:
+				parent, node = node, node.left
+			parent.left = mid
+		else:
+			parent = None
+			self.root = mid
+		if parent is not None:
+			if parent.right is mid:
+				left = node
+			else:
+				right = node
+		mid.parent = parent
+		mid.left, mid.right = left, right
+		left.parent = mid
+		right.parent = mid
+		self.update_node_data(mid)
+		self.rebalance_after_change(mid)
+
+	def _empty_like(self) -> 'AVLTree':
+		"""Returns a new empty tree with the same configuration as self."""
+		tree = copy.copy(self)
+		tree._set_empty()
+		tree.stats = None
+		return tree
+
+	def _set_empty(self) -> None:
+		self.root = VirtualAVLNode.get_create_instance()
+		self.max = self.root
+		self.finger = self.root
+		self._size = 0
+		self._balanced_nodes = 0
+		self._balanced_stale = False
+		self._tombstones = 0
+
+	def _refresh_totals(self) -> None:
+		"""Re-derives _size, max and finger from the root's subtree data (a multimap's value
+		count is read off the root by size). Used by split, whose pieces' balanced counts cannot
+		be had from the subtrees, as that would cost every node a slot and every update an
+		addition; the count is marked stale and redone in O(n) by the next
+		get_amir_balance_factor. join keeps it exact instead."""
+		if not self.root.is_real_node():
+			self._set_empty()
+			return
+		self._size = self.root.subtree_size
+		self._balanced_stale = True
+		self.max = max_node_of(self.root)
+		self.finger = self.root
+
+	# --- Bulk Construction ---
+	@classmethod
+	def from_sorted(cls, items: Iterable[Tuple[int, str]], key: Optional[Callable[[Any], Any]] = None,
+			multi: bool = False) -> 'AVLTree':
+		"""Builds a height-balanced tree from (key, value) pairs in ascending key order, in O(n).
+		items may be any iterable and is consumed exactly once; with a key function the order
+		is that of the mapped keys. Raises ValueError if a key is smaller than the one before it.
+		With multi, runs of equal keys share one node."""
+		tree = cls(key=key, multi=multi)
+		tree._load_sorted(items)
+		return tree
+
+	def _load_sorted(self, items: Iterable[Tuple[int, str]]) -> None:
+		"""The body of from_sorted, filling this (empty) tree."""
+		multi = self.multi
+		nodes: List[AVLNode] = []
+		for k, val in items:
+			node = self._new_node(k, [val] if multi else val)
+			if nodes and node.sort_key < nodes[-1].sort_key:
+				raise ValueError(f"from_sorted got key {k!r} after {nodes[-1].key!r}")
+			if multi:
+				# value_count is set when the nodes are linked
+				if nodes and node.sort_key == nodes[-1].sort_key:
+					nodes[-1].value.append(val)
+					continue
+			nodes.append(node)
+		self._link_sorted(nodes)
+
+	def _link_sorted(self, nodes: List[AVLNode]) -> None:
+		"""Makes the key-ordered nodes the whole content of this tree, linked as a balanced tree."""
+		self._size = len(nodes)
+		self._balanced_nodes = sum(1 for node in nodes if node.is_balanced)
+		self._balanced_stale = False
+		if not nodes:
+			self.root = VirtualAVLNode.get_create_instance()
+			self.max = self.root
+			self.finger = self.root
+			return
+		self.root = self._build_balanced(nodes, 0, len(nodes) - 1, None)
+		self.max = nodes[-1]
+		self.finger = self.root
+
+	def _build_balanced(self, nodes: List[AVLNode], lo: int, hi: int, parent: Optional[AVLNode]) -> AVLNode:
+		if lo > hi:
+			return VirtualAVLNode.get_create_instance()
+		mid = (lo + hi + 1) // 2
+		node = nodes[mid]
+		node.parent = parent
+		node.left = self._build_balanced(nodes, lo, mid - 1, node)
+		node.right = self._build_balanced(nodes, mid + 1, hi, node)
+		self.update_node_data(node)
+		return node
 
 	# --- Deletion Methods ---
 	def delete(self, node: Optional[AVLNode]) -> int:
+		"""Removes node (in a multimap, its key with all its values)."""
 		if node is None or not node.is_real_node():
 			return 0
+		if self.lazy_delete:
+			return self._delete_lazily(node)
 
 		if node.left.is_real_node() and node.right.is_real_node():
 			succ = min_node_of(node.right)
 			self.replace_node_with(node, succ)
+			self.finger = node
 			node = succ
+		else:
+			self.finger = node.parent if node.parent is not None else self.get_least_none_child(node)
 
 		if node == self.max:
 			self._update_max_on_delete()
 
 		child = self.get_least_none_child(node)
+		if self.stats is not None:
+			self.stats.record_delete()
 
 		self.switch_node_with(node, child)
 		self._size -= 1
@@ -173,19 +657,68 @@ class AVLTree(object):
 			self._balanced_nodes -= 1
 
 		rebalance_count = self.rebalance_after_change(child)
+		# detach the removed node so a stale handle to it is recognised by _climb_towards
+		node.parent = None
 
 		if self._size == 0:
 			self.root = VirtualAVLNode.get_create_instance()
 			self.max = self.root
+			self.finger = self.root
 
 		return rebalance_count
 
+	def _delete_lazily(self, node: AVLNode) -> int:
+		"""Tombstones node, compacting once tombstones reach compact_ratio of the nodes.
+		Returns 0, as no rotation is done."""
+		if node.value is _TOMBSTONE:
+			return 0
+		self._adjust_counts(node, -1, -len(node.value) if self.multi else 0)
+		node.value = _TOMBSTONE
+		self._tombstones += 1
+		self.finger = node
+		if self.stats is not None:
+			self.stats.record_delete()
+		if self._tombstones >= self.compact_ratio * self._size:
+			self.compact()
+		return 0
+
+	def compact(self) -> None:
+		"""Unlinks every tombstone and relinks the live nodes as a balanced tree, in O(n).
+		Does nothing if there are no tombstones."""
+		if not self._tombstones:
+			return
+		live: List[AVLNode] = []
+		dead: List[AVLNode] = []
+		node = self._first_at_least(None)
+		while node is not None:
+			(dead if node.value is _TOMBSTONE else live).append(node)
+			node = successor_of(node)
+		self._link_sorted(live)
+		self._tombstones = 0
+		# detach the removed nodes so a stale handle to one is recognised by _climb_towards
+		for node in dead:
+			node.parent = None
+
+	def discard(self, key: int, val: str) -> int:
+		"""Multimap delete: removes one occurrence of val from the bucket of key, and the node
+		once its bucket is empty. Returns the rebalancing count (0 if nothing was removed)."""
+		if not self.multi:
+			raise ValueError("discard needs a multimap (AVLTree(multi=True)), use delete")
+		node = self.search(key)
+		if node is None or val not in node.value:
+			return 0
+		if len(node.value) > 1:
+			node.value.remove(val)
+			self._adjust_counts(node, 0, -1)
+			return 0
+		return self.delete(node)
+
 	def get_least_none_child(self, node: AVLNode) -> AVLNode:
 		child = node.left if node.left.is_real_node() else node.right
 		return child
 
 	def replace_node_with(self, node: AVLNode, succ: AVLNode) -> None:
-		node.key, node.value = succ.key, succ.value
+		node.key, node.sort_key, node.value = succ.key, succ.sort_key, succ.value
 
 	def _update_max_on_delete(self) -> None:
 		if self.max.left.is_real_node():
@@ -196,6 +729,8 @@ class AVLTree(object):
 			self.max = VirtualAVLNode.get_create_instance()
 
 	# --- Traversal Methods ---
+	# The iterators walk parent pointers, so they use O(1) extra memory and no recursion.
+	# Changing the tree while one of them is running gives undefined results.
 	def avl_to_array(self) -> List[Tuple[int, str]]:
 		result: List[Tuple[int, str]] = []
 		self.inorder_collect(self.root, result)
@@ -204,12 +739,215 @@ class AVLTree(object):
 	def inorder_collect(self, node: Optional[AVLNode], result: List[Tuple[int, str]]) -> None:
 		if node is None or not node.is_real_node():
 			return
-		self.inorder_collect(node.left, result)
-		result.append((node.key, node.value))
-		self.inorder_collect(node.right, result)
+		last = max_node_of(node)
+		node = min_node_of(node)
+		multi = self.multi
+		while True:
+			if node.value is _TOMBSTONE:
+				pass
+			elif multi:
+				result.extend((node.key, val) for val in node.value)
+			else:
+				result.append((node.key, node.value))
+			if node is last:
+				return
+			node = successor_of(node)
+
+	def __iter__(self) -> Iterator[int]:
+		return self.keys()
+
+	def __reversed__(self) -> Iterator[int]:
+		return (key for key, _ in self.reversed())
+
+	def keys(self) -> Iterator[int]:
+		return (key for key, _ in self.items())
+
+	def items(self, lo: Optional[int] = None, hi: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+		"""Yields (key, value) in ascending key order, restricted to lo <= key <= hi when given.
+		Reaching the first item costs O(log n), every further item O(1) amortized."""
+		node = self._first_at_least(lo)
+		hi = self._sort_key(hi)
+		multi = self.multi
+		while node is not None and (hi is None or node.sort_key <= hi):
+			if node.value is _TOMBSTONE:
+				pass
+			elif multi:
+				for val in node.value:
+					yield node.key, val
+			else:
+				yield node.key, node.value
+			node = successor_of(node)
+
+	def reversed(self, lo: Optional[int] = None, hi: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+		"""Like items, in descending key order."""
+		node = self._last_at_most(hi)
+		lo = self._sort_key(lo)
+		multi = self.multi
+		while node is not None and (lo is None or node.sort_key >= lo):
+			if node.value is _TOMBSTONE:
+				pass
+			elif multi:
+				for val in reversed(node.value):
+					yield node.key, val
+			else:
+				yield node.key, node.value
+			node = predecessor_of(node)
+
+	def _buckets(self) -> Iterator[Tuple[int, list]]:
+		"""Yields (key, bucket) per node of a multimap, in ascending key order."""
+		node = self._first_at_least(None)
+		while node is not None:
+			if node.value is not _TOMBSTONE:
+				yield node.key, node.value
+			node = successor_of(node)
+
+	def _first_at_least(self, key: Optional[int]) -> Optional[AVLNode]:
+		"""Returns the node with the smallest key >= key (the minimum if key is None)."""
+		if not self.root.is_real_node():
+			return None
+		if key is None:
+			return min_node_of(self.root)
+		key = self._sort_key(key)
+		found = None
+		node = self.root
+		while node.is_real_node():
+			if node.sort_key >= key:
+				found = node
+				node = node.left
+			else:
+				node = node.right
+		return found
+
+	def _last_at_most(self, key: Optional[int]) -> Optional[AVLNode]:
+		"""Returns the node with the largest key <= key (the maximum if key is None)."""
+		if not self.root.is_real_node():
+			return None
+		if key is None:
+			return self.max
+		key = self._sort_key(key)
+		found = None
+		node = self.root
+		while node.is_real_node():
+			if node.sort_key <= key:
+				found = node
+				node = node.right
+			else:
+				node = node.left
+		return found
+
+	# --- Order Statistics ---
+	def rank(self, key: int) -> int:
+		"""Returns the number of keys smaller than key."""
+		return self._count_below(key, False)
+
+	def select(self, i: int) -> Optional[AVLNode]:
+		"""Returns the node holding the i-th smallest key (counting from 0), None if out of range."""
+		if not 0 <= i < self.root.subtree_size:
+			return None
+		node = self.root
+		while True:
+			left_size = node.left.subtree_size
+			if i < left_size:
+				node = node.left
+			elif node.value is _TOMBSTONE:
+				# counts as absent: the i-th live key is further right
+				i -= left_size
+				node = node.right
+			elif i == left_size:
+				return node
+			else:
+				i -= left_size + 1
+				node = node.right
+
+	def count_range(self, lo: int, hi: int) -> int:
+		"""Returns the number of keys k with lo <= k <= hi."""
+		if self._sort_key(hi) < self._sort_key(lo):
+			return 0
+		return self._count_below(hi, True) - self._count_below(lo, False)
+
+	def _count_below(self, key: int, inclusive: bool) -> int:
+		key = self._sort_key(key)
+		count = 0
+		node = self.root
+		while node.is_real_node():
+			if node.sort_key < key or (inclusive and node.sort_key == key):
+				count += node.left.subtree_size + (node.value is not _TOMBSTONE)
+				node = node.right
+			else:
+				node = node.left
+		return count
+
+	def _sort_key(self, key):
+		"""Maps a query key (None passes through) to the tree's order."""
+		if key is None or self.key_func is None:
+			return key
+		return self.key_func(key)
+
+	# --- Statistics ---
+	def enable_stats(self) -> AVLStats:
+		"""Starts collecting operation statistics (if not already) and returns the collector."""
+		if self.stats is None:
+			self.stats = AVLStats()
+		return self.stats
+
+	def disable_stats(self) -> Optional[AVLStats]:
+		"""Stops collecting and returns what was collected."""
+		stats, self.stats = self.stats, None
+		return stats
+
+	# --- Memory ---
+	def memory_report(self) -> dict:
+		"""Walks the tree and attributes its memory (sys.getsizeof, in bytes) to nodes, keys,
+		sort keys and values, in O(n). Each distinct object is counted once, so shared objects
+		(small ints, interned strings, a value stored under many keys) are not double counted;
+		objects referenced from inside keys or values (e.g. tuple items) are counted as well.
+		overhead_ratio is node (structure) bytes per byte of keys and values."""
+		seen = set()
+
+		def size_of(obj) -> int:
+			if id(obj) in seen:
+				return 0
+			seen.add(id(obj))
+			size = sys.getsizeof(obj)
+			if isinstance(obj, (tuple, list, frozenset, set)):
+				size += sum(size_of(item) for item in obj)
+			elif isinstance(obj, dict):
+				size += sum(size_of(k) + size_of(v) for k, v in obj.items())
+			return size
+
+		nodes = keys = sort_keys = values = 0
+		count = 0
+		node = self._first_at_least(None)
+		while node is not None:
+			count += 1
+			nodes += sys.getsizeof(node)
+			keys += size_of(node.key)
+			if node.sort_key is not node.key:
+				sort_keys += size_of(node.sort_key)
+			values += size_of(node.value)
+			node = successor_of(node)
+		payload = keys + sort_keys + values
+		total = nodes + payload + sys.getsizeof(self)
+		return {
+			"node_count": count,
+			"node_bytes": nodes,
+			"key_bytes": keys,
+			"sort_key_bytes": sort_keys,
+			"value_bytes": values,
+			"total_bytes": total,
+			"bytes_per_node": total / count if count else 0.0,
+			"overhead_ratio": nodes / payload if payload else 0.0,
+		}
 
 	# --- Size/Root/Balance Methods ---
 	def size(self) -> int:
+		"""Number of keys, or of values in a multimap (see node_count)."""
+		if self.multi:
+			return self.root.value_count
+		return self._size - self._tombstones
+
+	def node_count(self) -> int:
+		"""Number of nodes, tombstones included."""
 		return self._size
 
 	def get_root(self) -> Optional[AVLNode]:
@@ -218,13 +956,26 @@ class AVLTree(object):
 		return None
 
 	def get_amir_balance_factor(self) -> float:
+		if self._balanced_stale:
+			self._balanced_nodes = self._count_balanced()
+			self._balanced_stale = False
 		return self._balanced_nodes / self._size if self._size > 0 else 0
 
+	def _count_balanced(self) -> int:
+		count = 0
+		node = self._first_at_least(None)
+		while node is not None:
+			count += node.is_balanced
+			node = successor_of(node)
+		return count
+
 	# --- Rebalancing Methods ---
 	def rebalance_after_change(self, changed_node: AVLNode) -> int:
 		rebalance_count = 0
+		levels = 0
 		node = changed_node.parent
 		while node is not None:
+			levels += 1
 			old_height = node.height
 			self.update_node_data(node)
 			balance = self.get_balance(node)
@@ -236,6 +987,14 @@ class AVLTree(object):
 			if node.height == old_height:
 				break
 			node = node.parent
+		# heights are settled, but the ancestors above still count the changed subtree
+		if node is not None:
+			node = node.parent
+			while node is not None:
+				self.update_subtree_data(node)
+				node = node.parent
+		if self.stats is not None:
+			self.stats.record_rebalance(levels)
 		return rebalance_count
 
 	def update_node_data(self, node: AVLNode) -> None:
@@ -247,11 +1006,27 @@ class AVLTree(object):
 			else:
 				self._balanced_nodes -= 1
 		node.is_balanced = new_is_balanced
+		self.update_subtree_data(node)
+
+	def update_subtree_data(self, node: AVLNode) -> None:
+		"""Recomputes the fields that summarise node's whole subtree from its children.
+		subtree_size counts live nodes, i.e. not lazy-delete tombstones."""
+		node.subtree_size = node.left.subtree_size + node.right.subtree_size + (node.value is not _TOMBSTONE)
+		if self.multi:
+			values = len(node.value) if node.value is not _TOMBSTONE else 0
+			node.value_count = node.left.value_count + node.right.value_count + values
 
 
 	#prints tree fancily, useful for debugging
-	def print_tree_fancily(self, file: Optional[str] = None, append: bool = True, bykey: bool = True) -> None:
-		printree(self.root, file=file, append=append, bykey=bykey)
+	def print_tree_fancily(self, file: Optional[str] = None, append: bool = True, bykey: bool = True,
+			max_depth: Optional[int] = None, focus: Optional[int] = None) -> None:
+		"""Draws the tree, or only the subtree rooted at key focus, at most max_depth levels deep."""
+		node = self.root
+		if focus is not None:
+			node = self.search(focus)
+			if node is None:
+				raise ValueError(f"focus key {focus!r} is not in the tree")
+		printree(node, file=file, append=append, bykey=bykey, max_depth=max_depth)
 
 	def rebalance_node(self, node: AVLNode) -> int:
 		rebalance_count = 0
@@ -265,6 +1040,9 @@ class AVLTree(object):
 				self.rotate_right(node.right)
 				rebalance_count += 1
 			self.rotate_left(node)
+		if self.stats is not None:
+			# the rotated node ends up on the side opposite the one that was too tall
+			self.stats.record_rotation(rotation_kind(node.parent.right is node, rebalance_count == 1))
 		return rebalance_count + 1
 
 	def rotate_left(self, x: AVLNode) -> None:
@@ -315,7 +1093,11 @@ class AVLTree(object):
 			child.parent = node.parent
 
 	def get_max_node(self) -> AVLNode:
-		return self.max
+		node = self.max
+		# in lazy-delete mode the maximum may be a tombstone; max stays on it to guide climbs
+		while node is not None and node.is_real_node() and node.value is _TOMBSTONE:
+			node = predecessor_of(node)
+		return node if node is not None else VirtualAVLNode.get_create_instance()
 	
 	def get_balance(self, node: AVLNode) -> int:
 		return node.get_bf()
@@ -329,88 +1111,3 @@ class AVLTree(object):
 # =============================
 # End of AVL Tree Implementation
 # =============================
-
-
-def printree(t, file=None, append=True, bykey=True):
-	"""Print a textual representation of t
-	bykey=True: show keys instead of values, and also show balance factor
-	file: if provided (as a filename), write output to this file (file is always cleared first)"""
-	rows = trepr(t, bykey)
-	mode = "a" if append else "w"
-	if file:
-		with open(file, mode) as f:
-			for row in rows:
-				print(row)
-				print(row, file=f)
-	else:
-		for row in rows:
-			print(row)
-
-def trepr(t, bykey=False):
-	"""Return a list of textual representations of the levels in t
-	bykey=True: show keys instead of values, and also show balance factor and zero_balance_count"""
-	if t is None:
-		return ["#"]
-
-	# Show key, balance factor, zero_balance_count, and height in compact form
-	if hasattr(t, 'key') and hasattr(t, 'balance_factor') and hasattr(t, 'zero_balance_count') and hasattr(t, 'height'):
-		val = str(t.key) if bykey else str(getattr(t, 'value', getattr(t, 'val', t)))
-		bf = t.balance_factor() if callable(t.balance_factor) else t.balance_factor
-		zbf = t.zero_balance_count
-		h = t.height
-		thistr = f"{val},({bf}),[{zbf}]{{{h}}}"
-	else:
-		thistr = str(getattr(t, 'key', t)) if bykey else str(getattr(t, 'val', t))
-
-	return conc(trepr(getattr(t, 'left', None), bykey), thistr, trepr(getattr(t, 'right', None), bykey))
-
-def conc(left, root, right):
-	"""Return a concatenation of textual representations of
-	a root node, its left node, and its right node
-	root is a string, and left and right are lists of strings"""
-
-	lwid = len(left[-1])
-	rwid = len(right[-1])
-	rootwid = len(root)
-
-	result = [(lwid + 1) * " " + root + (rwid + 1) * " "]
-
-	ls = leftspace(left[0])
-	rs = rightspace(right[0])
-	result.append(ls * " " + (lwid - ls) * "_" + "/" + rootwid * " " + "|" + rs * "_" + (rwid - rs) * " ")
-
-	for i in range(max(len(left), len(right))):
-		row = ""
-		if i < len(left):
-			row += left[i]
-		else:
-			row += lwid * " "
-
-		row += (rootwid + 2) * " "
-
-		if i < len(right):
-			row += right[i]
-		else:
-			row += rwid * " "
-
-		result.append(row)
-
-	return result
-
-def leftspace(row):
-	"""helper for conc"""
-	# row is the first row of a left node
-	# returns the index of where the second whitespace starts
-	i = len(row) - 1
-	while i >= 0 and row[i] == " ":
-		i -= 1
-	return i + 1
-
-def rightspace(row):
-	"""helper for conc"""
-	# row is the first row of a right node
-	# returns the index of where the first whitespace ends
-	i = 0
-	while i < len(row) and row[i] == " ":
-		i += 1
-	return i
\ No newline at end of file
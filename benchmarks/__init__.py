@@ -0,0 +1,6 @@
+"""Benchmark suite for the AVL tree.
+
+Run it with `python -m benchmarks` from the repository root (see --help). Every case is
+timed with time.perf_counter over several repeats after warmup runs, reported as median and
+percentiles, and optionally saved as JSON and compared against a saved baseline.
+"""
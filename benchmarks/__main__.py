@@ -0,0 +1,50 @@
+import argparse
+import sys
+
+from benchmarks.runner import (OPERATIONS, run_suite, run_memory_suite, save_report, load_report, compare,
+                               format_comparison)
+from benchmarks.workloads import WORKLOADS
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Time AVL tree operations.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--workloads", nargs="+", choices=sorted(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument("--ops", nargs="+", choices=OPERATIONS, default=list(OPERATIONS))
+    parser.add_argument("--starts", nargs="+", choices=("root", "max", "finger"), default=["root"],
+                        help="where insert/search descents begin")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--memory", action="store_true",
+                        help="report the memory held by each tree instead of timing operations")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="compare against this saved JSON report")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative increase of the median time (or bytes) counted as a regression (default 0.10)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.memory:
+        report = run_memory_suite(args.sizes, args.workloads)
+        metric = "bytes"
+    else:
+        report = run_suite(args.sizes, args.workloads, args.ops, args.starts, args.repeats, args.warmup)
+        metric = "median"
+    if args.output:
+        save_report(report, args.output)
+        print(f"Saved report: {args.output}")
+    if args.baseline:
+        regressions, improvements = compare(load_report(args.baseline), report, args.threshold, metric)
+        if improvements:
+            print(format_comparison(improvements, "Better than baseline:", metric))
+        if regressions:
+            print(format_comparison(regressions, "Worse than baseline:", metric))
+            return 1
+        print("No regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
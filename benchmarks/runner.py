@@ -0,0 +1,213 @@
+import gc
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+import datetime
+
+from avl_tree import AVLTree
+from benchmarks.workloads import WORKLOADS
+
+
+"""Timing, reporting and baseline comparison for the benchmark suite.
+
+A case is a (setup, run) pair: setup builds whatever run needs (untimed), run is timed once
+per repeat. Warmup runs are executed and thrown away, and a full GC runs before every timed
+run so garbage from one run is not collected inside the next. Nothing is filtered out:
+the median is the headline number and p10/p90 show the spread."""
+
+OPERATIONS = ("insert", "search", "delete", "lazy_delete", "scan")
+
+
+def percentile(sorted_values, q):
+    """Linear-interpolated q-th percentile (0 <= q <= 100) of an ascending list."""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    pos = (len(sorted_values) - 1) * q / 100
+    lower = int(pos)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (pos - lower)
+
+
+def summarize(times):
+    ordered = sorted(times)
+    return {
+        "median": statistics.median(ordered),
+        "mean": statistics.fmean(ordered),
+        "stdev": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        "min": ordered[0],
+        "max": ordered[-1],
+        "p10": percentile(ordered, 10),
+        "p90": percentile(ordered, 90),
+        "runs": times,
+    }
+
+
+def measure(run, setup=None, repeats=5, warmup=1):
+    """Times run(setup()) repeats times after warmup discarded runs; returns summarize()."""
+    times = []
+    for i in range(warmup + repeats):
+        state = setup() if setup is not None else None
+        gc.collect()
+        t0 = time.perf_counter()
+        run(state)
+        elapsed = time.perf_counter() - t0
+        if i >= warmup:
+            times.append(elapsed)
+    return summarize(times)
+
+
+# =============================
+# AVL Tree Cases
+# =============================
+
+def build_tree(keys, start="root", lazy_delete=False):
+    tree = AVLTree(lazy_delete=lazy_delete)
+    for key in keys:
+        tree.insert(key, str(key), start=start)
+    return tree
+
+
+def make_case(op, keys, start="root"):
+    """Returns (setup, run) timing op over keys, in the order keys are given."""
+    if op == "insert":
+        return None, lambda _: build_tree(keys, start)
+    if op == "search":
+        def run_search(tree):
+            for key in keys:
+                tree.search(key, start=start)
+        return lambda: build_tree(sorted(keys)), run_search
+    if op in ("delete", "lazy_delete"):
+        def run_delete(tree):
+            for key in keys:
+                tree.delete(tree.search(key))
+        # lazy_delete: the same deletes against a tree that tombstones and compacts periodically
+        return lambda: build_tree(sorted(keys), lazy_delete=op == "lazy_delete"), run_delete
+    if op == "scan":
+        def run_scan(tree):
+            for _ in tree.items():
+                pass
+        return lambda: build_tree(keys), run_scan
+    raise ValueError(f"unknown operation {op!r}, expected one of {OPERATIONS}")
+
+
+def case_name(op, workload, n, start="root"):
+    suffix = f"[start={start}]" if start != "root" else ""
+    return f"{op}{suffix}/{workload}/n={n}"
+
+
+def run_suite(sizes, workloads=tuple(WORKLOADS), ops=OPERATIONS, starts=("root",), repeats=5, warmup=1,
+              log=print):
+    """Runs every combination and returns the JSON-ready report {"meta": ..., "results": ...}."""
+    results = {}
+    for n in sizes:
+        for workload in workloads:
+            keys = WORKLOADS[workload](n)
+            for op in ops:
+                # start only affects the descents of insert and search
+                for start in (starts if op in ("insert", "search") else ("root",)):
+                    name = case_name(op, workload, n, start)
+                    setup, run = make_case(op, keys, start)
+                    summary = measure(run, setup, repeats, warmup)
+                    summary.update(op=op, workload=workload, n=n, start=start)
+                    results[name] = summary
+                    if log:
+                        log(format_summary(name, summary))
+    return {"meta": environment(repeats, warmup), "results": results}
+
+
+def measure_memory(build):
+    """Runs build() under tracemalloc; returns (its result, bytes still held, peak bytes)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        held, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, held - before, peak - before
+
+
+def run_memory_suite(sizes, workloads=tuple(WORKLOADS), log=print):
+    """Builds one tree per size and workload and reports what it holds, both as traced by
+    tracemalloc and as attributed by AVLTree.memory_report. The report has the same shape as
+    run_suite's; compare it with metric="bytes"."""
+    results = {}
+    for n in sizes:
+        for workload in workloads:
+            keys = WORKLOADS[workload](n)
+            tree, held, peak = measure_memory(lambda: build_tree(keys))
+            name = f"memory/{workload}/n={n}"
+            results[name] = {
+                "bytes": held,
+                "peak_bytes": peak,
+                "bytes_per_node": held / n if n else 0.0,
+                "report": tree.memory_report(),
+                "workload": workload,
+                "n": n,
+            }
+            if log:
+                log(f"{name:<40} {held / 2 ** 20:10.2f} MiB  {results[name]['bytes_per_node']:8.1f} B/node  "
+                    f"peak {peak / 2 ** 20:10.2f} MiB")
+            del tree
+    return {"meta": environment(0, 0), "results": results}
+
+
+def environment(repeats, warmup):
+    return {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "repeats": repeats,
+        "warmup": warmup,
+    }
+
+
+# =============================
+# Reporting
+# =============================
+
+def format_summary(name, summary):
+    return (f"{name:<40} median {summary['median'] * 1e3:10.3f} ms  "
+            f"p10 {summary['p10'] * 1e3:10.3f}  p90 {summary['p90'] * 1e3:10.3f}")
+
+
+def save_report(report, path):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def load_report(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline, current, threshold=0.10, metric="median"):
+    """Compares metric (the median time, or "bytes" for memory reports) of the cases both
+    reports ran. Returns (regressions, improvements), lists of (name, baseline, current, ratio)
+    for cases more than threshold (as a fraction) above or below the baseline."""
+    regressions, improvements = [], []
+    for name, summary in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or base[metric] <= 0:
+            continue
+        ratio = summary[metric] / base[metric]
+        row = (name, base[metric], summary[metric], ratio)
+        if ratio > 1 + threshold:
+            regressions.append(row)
+        elif ratio < 1 - threshold:
+            improvements.append(row)
+    return regressions, improvements
+
+
+def format_comparison(rows, title, metric="median"):
+    lines = [title]
+    for name, base, cur, ratio in rows:
+        if metric == "bytes":
+            lines.append(f"  {name:<40} {base / 2 ** 20:10.2f} MiB -> {cur / 2 ** 20:10.2f} MiB  ({ratio:.2f}x)")
+        else:
+            lines.append(f"  {name:<40} {base * 1e3:10.3f} ms -> {cur * 1e3:10.3f} ms  ({ratio:.2f}x)")
+    return "\n".join(lines)
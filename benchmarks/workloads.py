@@ -0,0 +1,156 @@
+import random
+
+
+"""Key orders the benchmarks and experiments insert, search and delete in.
+
+Every generator returns a list of n distinct ints; all but clustered return a permutation
+of range(n). All of them run in O(n log n) or better."""
+
+
+def sorted_keys(n):
+    return list(range(n))
+
+
+def reversed_keys(n):
+    return list(range(n - 1, -1, -1))
+
+
+def random_keys(n, seed=0):
+    keys = list(range(n))
+    random.Random(seed).shuffle(keys)
+    return keys
+
+
+# =============================
+# k-inversion Permutations
+# =============================
+
+def k_inversions(n, k):
+    """A permutation of range(n) with exactly k inversions (0 <= k <= n(n-1)/2), in O(n log n).
+
+    Value v has n - 1 - v larger values, and inv[v] of them are put before it; inv is filled
+    greedily from the smallest value. Placing values smallest first, every still-free position
+    will hold a larger value, so v goes to the inv[v]-th free position, which a Fenwick tree
+    over the free positions finds in O(log n)."""
+    max_inv = n * (n - 1) // 2
+    if not 0 <= k <= max_inv:
+        raise ValueError(f"k must be between 0 and {max_inv}, got {k}")
+    free = _FreePositions(n)
+    perm = [0] * n
+    remaining = k
+    for v in range(n):
+        before = min(remaining, n - 1 - v)
+        remaining -= before
+        perm[free.take(before)] = v
+    return perm
+
+
+class _FreePositions(object):
+    """The positions 0..n-1, a Fenwick tree of 1 (free) / 0 (taken) counts."""
+
+    def __init__(self, n):
+        self.n = n
+        # all ones: node i covers (i - lowbit(i), i], so holds lowbit(i)
+        self.tree = [i & -i for i in range(n + 1)]
+        self.top = 1 << n.bit_length() if n else 0
+
+    def take(self, index):
+        """Marks the index-th free position (counting from 0) taken and returns it."""
+        tree = self.tree
+        pos = 0
+        rest = index + 1
+        step = self.top
+        # binary lifting: the largest prefix holding fewer than rest free positions
+        while step:
+            nxt = pos + step
+            if nxt <= self.n and tree[nxt] < rest:
+                pos = nxt
+                rest -= tree[nxt]
+            step >>= 1
+        i = pos + 1
+        while i <= self.n:
+            tree[i] -= 1
+            i += i & -i
+        return pos
+
+
+def half_inversions(n):
+    """The k-inversion workload halfway between sorted and reversed."""
+    return k_inversions(n, n * (n - 1) // 4)
+
+
+# =============================
+# Adversarial Orders
+# =============================
+
+def zigzag(n):
+    """0, n-1, 1, n-2, ...: every insert lands at the opposite end from the one before, which
+    defeats searches that start from the last touched node or from the maximum."""
+    keys = []
+    lo, hi = 0, n - 1
+    while lo <= hi:
+        keys.append(lo)
+        if lo != hi:
+            keys.append(hi)
+        lo += 1
+        hi -= 1
+    return keys
+
+
+def _min_nodes(h):
+    """Fewest nodes of an AVL tree of height h (-1 for empty): the Fibonacci tree sizes."""
+    a, b = 0, 1  # heights -1 and 0
+    for _ in range(h + 1):
+        a, b = b, a + b + 1
+    return a
+
+
+def fibonacci_order(n):
+    """An insertion order that builds the tallest possible AVL tree on range(n), with no
+    rotations: the breadth-first order of a tree whose every node has a left subtree one
+    level taller than the right (a Fibonacci tree, padded to n nodes). Searches for the
+    deepest keys then take the worst-case path length, about 1.44 log2 n."""
+    if n == 0:
+        return []
+    height = 0
+    while _min_nodes(height + 1) <= n:
+        height += 1
+    keys = []
+    level = [(0, n, height)]  # (smallest key, node count, height) of each subtree
+    while level:
+        next_level = []
+        for lo, count, h in level:
+            # keep the right subtree minimal, the left takes the rest up to a full tree of h - 1
+            left = min(count - 1 - _min_nodes(h - 2), (1 << h) - 1)
+            right = count - 1 - left
+            keys.append(lo + left)
+            if left:
+                next_level.append((lo, left, h - 1))
+            if right:
+                next_level.append((lo + left + 1, right, h - 2 if right < (1 << (h - 1)) else h - 1))
+        level = next_level
+    return keys
+
+
+def clustered(n, clusters=16, gap=10 ** 6, seed=0):
+    """n keys in dense runs spread gap apart; the runs are visited in random order and each
+    is inserted ascending, like bursts of nearby ids arriving from several sources."""
+    rng = random.Random(seed)
+    order = list(range(clusters))
+    rng.shuffle(order)
+    keys = []
+    for rank, c in enumerate(order):
+        size = n // clusters + (1 if rank < n % clusters else 0)
+        keys.extend(range(c * gap, c * gap + size))
+    return keys
+
+
+WORKLOADS = {
+    "sorted": sorted_keys,
+    "reversed": reversed_keys,
+    "random": random_keys,
+    "k_inversions": half_inversions,
+    "zigzag": zigzag,
+    "fibonacci": fibonacci_order,
+    "clustered": clustered,
+}
@@ -0,0 +1,84 @@
+import sys
+import os
+import time
+import random
+import threading
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from avl_tree import AVLTree
+from concurrent_avl_tree import ConcurrentAVLTree
+
+
+class GlobalLockTree:
+    """The baseline: every call, read or write, behind one mutex."""
+    def __init__(self, tree):
+        self.tree = tree
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            node = self.tree.search(key)
+            return node.value if node is not None else None
+
+    def insert(self, key, val):
+        with self.lock:
+            return self.tree.insert(key, val)
+
+    def delete_key(self, key):
+        with self.lock:
+            return self.tree.delete(self.tree.search(key))
+
+
+def prefilled_tree(n):
+    return AVLTree.from_sorted((k, str(k)) for k in range(0, 2 * n, 2))
+
+
+def worker(tree, ops, read_ratio, key_space, seed, barrier):
+    rng = random.Random(seed)
+    barrier.wait()
+    for _ in range(ops):
+        key = rng.randrange(key_space)
+        if rng.random() < read_ratio:
+            tree.get(key)
+        elif key % 2:
+            tree.insert(key, str(key))
+        else:
+            tree.delete_key(key)
+
+
+def run_scenario(make_tree, threads, read_ratio, ops_per_thread, n):
+    tree = make_tree(prefilled_tree(n))
+    barrier = threading.Barrier(threads + 1)
+    pool = [threading.Thread(target=worker, args=(tree, ops_per_thread, read_ratio, 2 * n, seed, barrier))
+            for seed in range(threads)]
+    for t in pool:
+        t.start()
+    barrier.wait()
+    t0 = time.perf_counter()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    return threads * ops_per_thread / elapsed
+
+
+def run_experiment(thread_counts, read_ratios, ops_per_thread=20_000, n=100_000):
+    results = []
+    for read_ratio in read_ratios:
+        for threads in thread_counts:
+            global_ops = run_scenario(GlobalLockTree, threads, read_ratio, ops_per_thread, n)
+            rw_ops = run_scenario(ConcurrentAVLTree, threads, read_ratio, ops_per_thread, n)
+            results.append((read_ratio, threads, global_ops, rw_ops))
+    return results
+
+
+def print_results(results):
+    print(f"{'reads':>6} {'threads':>8} {'global lock ops/s':>18} {'rw lock ops/s':>14}")
+    for read_ratio, threads, global_ops, rw_ops in results:
+        print(f"{read_ratio:>6.0%} {threads:>8} {global_ops:>18,.0f} {rw_ops:>14,.0f}")
+
+
+if __name__ == "__main__":
+    start_time = time.time()
+    results = run_experiment(thread_counts=[1, 2, 4, 8], read_ratios=[0.5, 0.9, 0.99])
+    print_results(results)
+    print(f"\nTotal experiment time: {time.time() - start_time:.2f} seconds")
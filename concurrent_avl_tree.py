@@ -0,0 +1,153 @@
+# =============================
+# Thread-safe AVL Tree
+# =============================
+
+import threading
+from contextlib import contextmanager
+from typing import Optional, List, Tuple, Iterable, Iterator
+
+from avl_tree import AVLTree, AVLNode
+
+"""A reader-writer locked wrapper around AVLTree.
+
+Any number of threads may run read methods (search, get, items, rank, ...) at the same
+time; insert/delete and the other mutating methods take the lock exclusively. A read that
+would change the tree takes the write lock too: search and get when stats are enabled (they
+are counted), and get_amir_balance_factor when the balanced count is stale (it is stored
+after the recount). Otherwise search and get use a lookup that leaves the finger alone, and
+items, avl_to_array, rank, count_range and size never write. The lock
+prefers writers: once a writer is waiting, new readers queue behind it, so a steady stream
+of readers cannot starve updates."""
+
+
+class ReadWriteLock(object):
+	"""Many readers or one writer, with waiting writers served before new readers."""
+	def __init__(self):
+		self._cond = threading.Condition(threading.Lock())
+		self._readers: int = 0
+		self._writer: bool = False
+		self._writers_waiting: int = 0
+
+	def acquire_read(self) -> None:
+		with self._cond:
+			while self._writer or self._writers_waiting:
+				self._cond.wait()
+			self._readers += 1
+
+	def release_read(self) -> None:
+		with self._cond:
+			self._readers -= 1
+			if self._readers == 0:
+				self._cond.notify_all()
+
+	def acquire_write(self) -> None:
+		with self._cond:
+			self._writers_waiting += 1
+			while self._writer or self._readers:
+				self._cond.wait()
+			self._writers_waiting -= 1
+			self._writer = True
+
+	def release_write(self) -> None:
+		with self._cond:
+			self._writer = False
+			self._cond.notify_all()
+
+	@contextmanager
+	def read_locked(self) -> Iterator[None]:
+		self.acquire_read()
+		try:
+			yield
+		finally:
+			self.release_read()
+
+	@contextmanager
+	def write_locked(self) -> Iterator[None]:
+		self.acquire_write()
+		try:
+			yield
+		finally:
+			self.release_write()
+
+
+# =============================
+# Concurrent AVL Tree Class
+# =============================
+
+class ConcurrentAVLTree(object):
+	"""
+	Thread-safe facade over an AVLTree (a new one unless tree is given).
+	Nodes returned by search stay shared with the tree: reading their fields is only safe
+	while no writer runs, so prefer get, which copies the value out under the lock.
+	"""
+	def __init__(self, tree: Optional[AVLTree] = None):
+		self.tree: AVLTree = tree if tree is not None else AVLTree()
+		self.lock = ReadWriteLock()
+
+	# --- Read Methods ---
+	def search(self, key: int) -> Optional[AVLNode]:
+		if self.tree.stats is not None:
+			# counting the search in the tree's stats is a write
+			with self.lock.write_locked():
+				return self.tree.search(key)
+		with self.lock.read_locked():
+			return self.tree._lookup(key)
+
+	def get(self, key: int, default: Optional[str] = None) -> Optional[str]:
+		if self.tree.stats is not None:
+			with self.lock.write_locked():
+				node = self.tree.search(key)
+				return node.value if node is not None else default
+		with self.lock.read_locked():
+			node = self.tree._lookup(key)
+			return node.value if node is not None else default
+
+	def items(self, lo: Optional[int] = None, hi: Optional[int] = None) -> List[Tuple[int, str]]:
+		"""Returns the range as a list, so the read lock is not held while the caller consumes it."""
+		with self.lock.read_locked():
+			return list(self.tree.items(lo, hi))
+
+	def avl_to_array(self) -> List[Tuple[int, str]]:
+		with self.lock.read_locked():
+			return self.tree.avl_to_array()
+
+	def rank(self, key: int) -> int:
+		with self.lock.read_locked():
+			return self.tree.rank(key)
+
+	def count_range(self, lo: int, hi: int) -> int:
+		with self.lock.read_locked():
+			return self.tree.count_range(lo, hi)
+
+	def size(self) -> int:
+		with self.lock.read_locked():
+			return self.tree.size()
+
+	def get_amir_balance_factor(self) -> float:
+		with self.lock.read_locked():
+			if not self.tree._balanced_stale:
+				return self.tree.get_amir_balance_factor()
+		with self.lock.write_locked():
+			return self.tree.get_amir_balance_factor()
+
+	# --- Write Methods ---
+	def insert(self, key: int, val: str, start="root") -> int:
+		with self.lock.write_locked():
+			return self.tree.insert(key, val, start)
+
+	def delete(self, node: Optional[AVLNode]) -> int:
+		with self.lock.write_locked():
+			return self.tree.delete(node)
+
+	def delete_key(self, key: int) -> int:
+		"""Looks key up and deletes it as one atomic step; returns 0 if key is absent."""
+		with self.lock.write_locked():
+			return self.tree.delete(self.tree.search(key))
+
+	def insert_many(self, pairs: Iterable[Tuple[int, str]]) -> int:
+		with self.lock.write_locked():
+			return self.tree.insert_many(pairs)
+
+	def delete_many(self, keys: Iterable[int]) -> int:
+		with self.lock.write_locked():
+			return self.tree.delete_many(keys)
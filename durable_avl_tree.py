@@ -0,0 +1,251 @@
+# =============================
+# Durable AVL Tree (write-ahead log)
+# =============================
+
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+from typing import Optional, List, Tuple, Iterator
+
+from avl_tree import AVLTree, AVLNode
+from avl_snapshot import TAG_NONE, TAG_STR, TAG_PICKLE
+
+"""An AVLTree whose updates survive restarts.
+
+Every insert/delete appends a record to a write-ahead log. Records are buffered and written
+with a single write + fsync per group (group commit): a group is flushed when it holds
+group_size records, when the oldest buffered record is max_delay seconds old, or on
+commit()/checkpoint()/close(). The age limit holds while the writer is idle too: a
+background thread flushes a group that no further write arrives to flush. An update is
+durable once its group has been flushed.
+
+The directory holds numbered files:
+	wal-<epoch>.log        log records, appended during one epoch
+	snapshot-<epoch>.avlt  the whole tree as of the end of that epoch (avl_snapshot format)
+checkpoint() starts a new log epoch, writes the snapshot of the finished one and then
+deletes the files it supersedes. Recovery loads the newest snapshot and replays the logs of
+later epochs, stopping at the first torn or corrupt record, so a crash at any point of a
+checkpoint replays every update exactly once.
+
+Log record: crc32 (u32) of the rest, payload length (u32), op (u8), value tag (u8),
+key (int64), payload. Keys must fit in a signed 64-bit int."""
+
+RECORD = struct.Struct("<IIBBq")
+OP_INSERT = 1
+OP_DELETE = 2
+
+
+def _encode_value(val) -> Tuple[int, bytes]:
+	if val is None:
+		return TAG_NONE, b""
+	if isinstance(val, str):
+		return TAG_STR, val.encode("utf-8")
+	return TAG_PICKLE, pickle.dumps(val)
+
+
+def _decode_value(tag: int, payload: bytes):
+	if tag == TAG_NONE:
+		return None
+	if tag == TAG_STR:
+		return payload.decode("utf-8")
+	return pickle.loads(payload)
+
+
+def encode_record(op: int, key: int, val=None) -> bytes:
+	tag, payload = _encode_value(val)
+	body = RECORD.pack(0, len(payload), op, tag, key)[4:] + payload
+	return struct.pack("<I", zlib.crc32(body)) + body
+
+
+def read_records(data: bytes) -> Iterator[Tuple[int, int, int, object]]:
+	"""Yields (end offset, op, key, value) for each intact record at the start of data."""
+	pos = 0
+	while pos + RECORD.size <= len(data):
+		crc, length, op, tag, key = RECORD.unpack_from(data, pos)
+		end = pos + RECORD.size + length
+		if end > len(data) or zlib.crc32(data[pos + 4:end]) != crc:
+			return
+		yield end, op, key, _decode_value(tag, data[pos + RECORD.size:end])
+		pos = end
+
+
+# =============================
+# Durable AVL Tree Class
+# =============================
+
+class DurableAVLTree(object):
+	"""
+	Opens (recovering if needed) the tree stored in directory.
+	fsync=False skips the fsync calls, trading crash safety for speed (e.g. in tests).
+	checkpoint_every, if set, checkpoints automatically after that many logged updates.
+	max_delay=None flushes only by group size and on commit()/checkpoint()/close(), and
+	starts no background thread. Updates must come from one thread at a time; the background
+	flush only touches the log buffer and file, under a lock shared with the writer.
+	"""
+	def __init__(self, directory: str, group_size: int = 256, max_delay: Optional[float] = 0.01,
+			fsync: bool = True, checkpoint_every: Optional[int] = None):
+		self.directory = directory
+		self.group_size = group_size
+		self.max_delay = max_delay
+		self.fsync = fsync
+		self.checkpoint_every = checkpoint_every
+		self._buffer = bytearray()
+		self._buffered: int = 0
+		self._buffered_since: float = 0.0
+		self._logged_since_checkpoint: int = 0
+		os.makedirs(directory, exist_ok=True)
+		self.tree: AVLTree = self._recover()
+		self._lock = threading.Condition(threading.RLock())
+		self._closed = False
+		self._flusher: Optional[threading.Thread] = None
+		if max_delay is not None:
+			self._flusher = threading.Thread(target=self._flush_when_due, name="avl-wal-flush", daemon=True)
+			self._flusher.start()
+
+	# --- File Naming ---
+	def _path(self, kind: str, epoch: int) -> str:
+		suffix = "log" if kind == "wal" else "avlt"
+		return os.path.join(self.directory, f"{kind}-{epoch:010d}.{suffix}")
+
+	def _epochs(self, kind: str) -> List[int]:
+		epochs = []
+		for name in os.listdir(self.directory):
+			stem, _, suffix = name.partition(".")
+			prefix, _, number = stem.partition("-")
+			if prefix == kind and number.isdigit() and suffix in ("log", "avlt"):
+				epochs.append(int(number))
+		return sorted(epochs)
+
+	# --- Recovery ---
+	def _recover(self) -> AVLTree:
+		snapshots = self._epochs("snapshot")
+		snapshot_epoch = snapshots[-1] if snapshots else 0
+		tree = AVLTree.load(self._path("snapshot", snapshot_epoch)) if snapshots else AVLTree()
+		logs = [epoch for epoch in self._epochs("wal") if epoch > snapshot_epoch]
+		for epoch in logs:
+			path = self._path("wal", epoch)
+			with open(path, "rb") as f:
+				data = f.read()
+			valid_end = 0
+			for valid_end, op, key, val in read_records(data):
+				self._apply(tree, op, key, val)
+			if valid_end < len(data):
+				# a torn group from a crash: drop it so new records follow intact ones
+				with open(path, "r+b") as f:
+					f.truncate(valid_end)
+		self.epoch = logs[-1] if logs else snapshot_epoch + 1
+		self._log = open(self._path("wal", self.epoch), "ab")
+		return tree
+
+	@staticmethod
+	def _apply(tree: AVLTree, op: int, key: int, val) -> int:
+		if op == OP_INSERT:
+			return tree.insert(key, val, start="finger")
+		return tree.delete(tree.search(key, start="finger"))
+
+	# --- Update Methods ---
+	def insert(self, key: int, val: str) -> int:
+		return self._log_and_apply(OP_INSERT, key, val)
+
+	def delete_key(self, key: int) -> int:
+		"""Deletes key (a no-op returning 0 if it is absent)."""
+		return self._log_and_apply(OP_DELETE, key, None)
+
+	def delete(self, node: Optional[AVLNode]) -> int:
+		if node is None or not node.is_real_node():
+			return 0
+		return self.delete_key(node.key)
+
+	def _log_and_apply(self, op: int, key: int, val) -> int:
+		# encode first, so an update the log cannot represent is rejected before it is applied
+		record = encode_record(op, key, val)
+		with self._lock:
+			result = self._apply(self.tree, op, key, val)
+			if not self._buffered:
+				self._buffered_since = time.monotonic()
+				# a new group: the flusher waits for its deadline
+				self._lock.notify()
+			self._buffer += record
+			self._buffered += 1
+			self._logged_since_checkpoint += 1
+			if self._buffered >= self.group_size or (
+					self.max_delay is not None and time.monotonic() - self._buffered_since >= self.max_delay):
+				self.commit()
+			if self.checkpoint_every is not None and self._logged_since_checkpoint >= self.checkpoint_every:
+				self.checkpoint()
+		return result
+
+	def _flush_when_due(self) -> None:
+		"""Background thread: commits a group once its oldest record is max_delay old."""
+		with self._lock:
+			while not self._closed:
+				if not self._buffered:
+					self._lock.wait()
+					continue
+				remaining = self._buffered_since + self.max_delay - time.monotonic()
+				if remaining > 0:
+					self._lock.wait(remaining)
+				else:
+					self.commit()
+
+	# --- Durability ---
+	def commit(self) -> None:
+		"""Writes and fsyncs the buffered group; every update so far is durable afterwards."""
+		with self._lock:
+			if self._buffer:
+				self._log.write(self._buffer)
+				self._buffer.clear()
+				self._buffered = 0
+			self._log.flush()
+			if self.fsync:
+				os.fsync(self._log.fileno())
+
+	def checkpoint(self) -> None:
+		"""Snapshots the tree and drops the log records the snapshot makes redundant."""
+		with self._lock:
+			self.commit()
+			self._log.close()
+			finished = self.epoch
+			self.epoch += 1
+			self._log = open(self._path("wal", self.epoch), "ab")
+			self.tree.save(self._path("snapshot", finished))
+			for epoch in self._epochs("wal"):
+				if epoch <= finished:
+					os.remove(self._path("wal", epoch))
+			for epoch in self._epochs("snapshot"):
+				if epoch < finished:
+					os.remove(self._path("snapshot", epoch))
+			self._logged_since_checkpoint = 0
+
+	def close(self) -> None:
+		with self._lock:
+			if self._closed:
+				return
+			self._closed = True
+			self.commit()
+			self._log.close()
+			self._lock.notify()
+		if self._flusher is not None:
+			self._flusher.join()
+
+	def __enter__(self) -> 'DurableAVLTree':
+		return self
+
+	def __exit__(self, *exc_info) -> None:
+		self.close()
+
+	# --- Read Methods ---
+	def search(self, key: int) -> Optional[AVLNode]:
+		return self.tree.search(key)
+
+	def items(self, lo: Optional[int] = None, hi: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+		return self.tree.items(lo, hi)
+
+	def avl_to_array(self) -> List[Tuple[int, str]]:
+		return self.tree.avl_to_array()
+
+	def size(self) -> int:
+		return self.tree.size()
@@ -0,0 +1,91 @@
+# =============================
+# Interval Tree
+# =============================
+
+from typing import Optional, List, Tuple, Callable, Any
+
+from avl_tree import AVLTree, AVLNode
+
+"""An AVL tree of closed intervals [lo, hi] answering overlap and stabbing queries.
+
+Keys are (lo, hi) tuples, so the tree is ordered by start (then end) and every AVLTree
+method (insert, search, delete, items, from_sorted, split/join, ...) works on intervals
+unchanged. Each node also stores max_end, the largest hi in its subtree; it is recomputed
+in update_subtree_data, which the rotations and rebalance_after_change already call for
+every node whose subtree changes. A query skips any subtree whose max_end is below the query
+start and stops at the first start past the query end. Every node it visits without reporting
+is then an ancestor of a hit or on the O(log n) boundary paths, so k hits cost O(k log n) in
+the worst case; when the hits are clustered in key order, as with short intervals, they share
+their ancestors and the cost is typically close to O(log n + k)."""
+
+
+class IntervalNode(AVLNode):
+	"""An AVLNode whose key is an interval (lo, hi), plus the max hi of its subtree."""
+	__slots__ = ("max_end",)
+
+	def __init__(self, key: Optional[Tuple[int, int]], value: Optional[str], is_a_virtual_node: bool = False):
+		super().__init__(key, value, is_a_virtual_node)
+		self.max_end: Optional[int] = None if key is None else key[1]
+
+
+class IntervalTree(AVLTree):
+	"""
+	Insert intervals with insert((lo, hi), val). Intervals are closed, lo <= hi.
+	multi=True stores equal intervals in one node, as in AVLTree.
+	"""
+	node_class = IntervalNode
+
+	def __init__(self, key: Optional[Callable[[Any], Any]] = None, multi: bool = False):
+		if key is not None:
+			raise ValueError("IntervalTree orders by interval start and takes no key function")
+		super().__init__(multi=multi)
+
+	def _new_node(self, key: Tuple[int, int], val: str) -> AVLNode:
+		lo, hi = key
+		if hi < lo:
+			raise ValueError(f"interval {key!r} ends before it starts")
+		return super()._new_node(key, val)
+
+	def update_subtree_data(self, node: AVLNode) -> None:
+		super().update_subtree_data(node)
+		max_end = node.key[1]
+		if node.left.is_real_node() and node.left.max_end > max_end:
+			max_end = node.left.max_end
+		if node.right.is_real_node() and node.right.max_end > max_end:
+			max_end = node.right.max_end
+		node.max_end = max_end
+
+	# --- Interval Queries ---
+	def overlap(self, lo: int, hi: int) -> List[Tuple[Tuple[int, int], str]]:
+		"""Returns (interval, value) for every stored interval sharing a point with [lo, hi],
+		ordered by interval. O(k log n) for k hits in the worst case, see the module docstring."""
+		result: List[Tuple[Tuple[int, int], str]] = []
+		multi = self.multi
+		stack: List[AVLNode] = []
+		node = self.root
+		while True:
+			# a subtree whose intervals all end before lo holds no match
+			while node.is_real_node() and node.max_end >= lo:
+				stack.append(node)
+				node = node.left
+			if not stack:
+				return result
+			node = stack.pop()
+			start, end = node.key
+			if start > hi:
+				# in-order, so every remaining interval starts after hi too
+				return result
+			if end >= lo:
+				if multi:
+					result.extend((node.key, val) for val in node.value)
+				else:
+					result.append((node.key, node.value))
+			node = node.right
+
+	def stab(self, point: int) -> List[Tuple[Tuple[int, int], str]]:
+		"""Returns (interval, value) for every stored interval containing point."""
+		return self.overlap(point, point)
+
+	def max_end(self) -> Optional[int]:
+		"""The largest end of any stored interval, None if the tree is empty."""
+		return self.root.max_end if self.root.is_real_node() else None
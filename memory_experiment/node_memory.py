@@ -0,0 +1,55 @@
+import sys
+import os
+import gc
+import tracemalloc
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from avl_tree import AVLNode
+
+
+class DictAVLNode(object):
+    """The node layout before __slots__: the same fields, stored in a per-instance __dict__.
+    The fields are copied from a fresh AVLNode, so the comparison stays like-for-like
+    whenever a slot is added to AVLNode."""
+    def __init__(self, key, value):
+        template = AVLNode(key, value)
+        for field in AVLNode.__slots__:
+            setattr(self, field, getattr(template, field))
+
+
+def bytes_per_node(node_class, n):
+    """Allocate n nodes (keys 0..n-1, no values) and return the traced bytes per node.
+    The list holding the nodes is not counted."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    nodes = [node_class(i, None) for i in range(n)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    used = after - before - sys.getsizeof(nodes)
+    del nodes
+    gc.collect()
+    return used / n
+
+
+def run_experiment(sizes):
+    results = []
+    for n in sizes:
+        before = bytes_per_node(DictAVLNode, n)
+        after = bytes_per_node(AVLNode, n)
+        results.append((n, before, after))
+    return results
+
+
+def print_results(results):
+    print(f"{len(AVLNode.__slots__)} fields per node: {', '.join(AVLNode.__slots__)}")
+    print(f"{'n':>12} {'__dict__ (B/node)':>18} {'__slots__ (B/node)':>19} {'saved':>8}")
+    for n, before, after in results:
+        saved = 1 - after / before
+        print(f"{n:>12,} {before:>18.1f} {after:>19.1f} {saved:>8.1%}")
+
+
+if __name__ == "__main__":
+    # usage: python memory_experiment/node_memory.py [n1 n2 ...]
+    sizes_to_test = [int(arg) for arg in sys.argv[1:]] or [1_000_000, 10_000_000]
+    print_results(run_experiment(sizes_to_test))
@@ -0,0 +1,197 @@
+# =============================
+# Persistent AVL Tree
+# =============================
+
+from typing import Optional, List, Tuple, Iterable, Iterator
+
+"""A persistent (immutable) AVL tree.
+
+insert and delete never modify a node: they copy the O(log n) nodes on the search path and
+return a new tree that shares every other subtree with the old one. Any tree object is
+therefore a consistent point-in-time snapshot that can be read while newer versions are
+being written. Nodes have no parent pointers (a shared subtree has many parents), and an
+empty child is None rather than a virtual node."""
+
+
+class PersistentAVLNode(object):
+	"""An immutable node; subtree_size and balanced_count summarise its subtree."""
+	__slots__ = ("key", "value", "left", "right", "height", "is_balanced", "subtree_size", "balanced_count")
+
+	def __init__(self, key: int, value: Optional[str], left: Optional['PersistentAVLNode'], right: Optional['PersistentAVLNode']):
+		lh = left.height if left is not None else -1
+		rh = right.height if right is not None else -1
+		self.key = key
+		self.value = value
+		self.left = left
+		self.right = right
+		self.height: int = 1 + max(lh, rh)
+		self.is_balanced: bool = lh == rh
+		self.subtree_size: int = 1 + _size_of(left) + _size_of(right)
+		self.balanced_count: int = self.is_balanced + _balanced_of(left) + _balanced_of(right)
+
+	def is_real_node(self) -> bool:
+		return True
+
+	def get_bf(self) -> int:
+		return _height_of(self.left) - _height_of(self.right)
+
+
+# =============================
+# Utility Functions
+# =============================
+
+def _height_of(node: Optional[PersistentAVLNode]) -> int:
+	return node.height if node is not None else -1
+
+
+def _size_of(node: Optional[PersistentAVLNode]) -> int:
+	return node.subtree_size if node is not None else 0
+
+
+def _balanced_of(node: Optional[PersistentAVLNode]) -> int:
+	return node.balanced_count if node is not None else 0
+
+
+def _balance(key: int, value: Optional[str], left: Optional[PersistentAVLNode], right: Optional[PersistentAVLNode]) -> PersistentAVLNode:
+	"""Builds the node (key, value, left, right), rotating if the children's heights differ by 2."""
+	bf = _height_of(left) - _height_of(right)
+	if bf > 1:
+		if _height_of(left.left) >= _height_of(left.right):
+			return PersistentAVLNode(left.key, left.value, left.left, PersistentAVLNode(key, value, left.right, right))
+		pivot = left.right
+		return PersistentAVLNode(pivot.key, pivot.value,
+			PersistentAVLNode(left.key, left.value, left.left, pivot.left),
+			PersistentAVLNode(key, value, pivot.right, right))
+	if bf < -1:
+		if _height_of(right.right) >= _height_of(right.left):
+			return PersistentAVLNode(right.key, right.value, PersistentAVLNode(key, value, left, right.left), right.right)
+		pivot = right.left
+		return PersistentAVLNode(pivot.key, pivot.value,
+			PersistentAVLNode(key, value, left, pivot.left),
+			PersistentAVLNode(right.key, right.value, pivot.right, right.right))
+	return PersistentAVLNode(key, value, left, right)
+
+
+def _insert(node: Optional[PersistentAVLNode], key: int, val: Optional[str]) -> PersistentAVLNode:
+	if node is None:
+		return PersistentAVLNode(key, val, None, None)
+	if key < node.key:
+		return _balance(node.key, node.value, _insert(node.left, key, val), node.right)
+	return _balance(node.key, node.value, node.left, _insert(node.right, key, val))
+
+
+def _delete_min(node: PersistentAVLNode) -> Tuple[Optional[PersistentAVLNode], PersistentAVLNode]:
+	"""Returns (node's subtree without its minimum, the minimum node)."""
+	if node.left is None:
+		return node.right, node
+	rest, smallest = _delete_min(node.left)
+	return _balance(node.key, node.value, rest, node.right), smallest
+
+
+def _delete(node: Optional[PersistentAVLNode], key: int) -> Optional[PersistentAVLNode]:
+	"""Returns node's subtree without key; the very same object if key is not in it."""
+	if node is None:
+		return None
+	if key < node.key:
+		left = _delete(node.left, key)
+		return node if left is node.left else _balance(node.key, node.value, left, node.right)
+	if key > node.key:
+		right = _delete(node.right, key)
+		return node if right is node.right else _balance(node.key, node.value, node.left, right)
+	if node.left is None:
+		return node.right
+	if node.right is None:
+		return node.left
+	rest, succ = _delete_min(node.right)
+	return _balance(succ.key, succ.value, node.left, rest)
+
+
+def _build(items: List[Tuple[int, Optional[str]]], lo: int, hi: int) -> Optional[PersistentAVLNode]:
+	if lo > hi:
+		return None
+	mid = (lo + hi + 1) // 2
+	return PersistentAVLNode(items[mid][0], items[mid][1], _build(items, lo, mid - 1), _build(items, mid + 1, hi))
+
+
+# =============================
+# Persistent AVL Tree Class
+# =============================
+
+class PersistentAVLTree(object):
+	"""
+	An immutable version of an AVL tree; insert and delete return the next version.
+	"""
+	def __init__(self, root: Optional[PersistentAVLNode] = None):
+		self.root: Optional[PersistentAVLNode] = root
+
+	@classmethod
+	def from_sorted(cls, items: Iterable[Tuple[int, str]]) -> 'PersistentAVLTree':
+		"""Builds a tree from (key, value) pairs in ascending key order, in O(n).
+		PersistentAVLTree.from_sorted(tree.items()) snapshots a mutable AVLTree."""
+		items = list(items)
+		for i in range(1, len(items)):
+			if items[i][0] < items[i - 1][0]:
+				raise ValueError(f"from_sorted got key {items[i][0]!r} after {items[i - 1][0]!r}")
+		return cls(_build(items, 0, len(items) - 1))
+
+	# --- Search Methods ---
+	def search(self, key: int) -> Optional[PersistentAVLNode]:
+		node = self.root
+		while node is not None:
+			if key == node.key:
+				return node
+			elif key < node.key:
+				node = node.left
+			else:
+				node = node.right
+		return None
+
+	def find(self, key: int) -> Optional[PersistentAVLNode]:
+		"""Alias for search method."""
+		return self.search(key)
+
+	# --- Update Methods (each returns a new version) ---
+	def insert(self, key: int, val: str) -> 'PersistentAVLTree':
+		return PersistentAVLTree(_insert(self.root, key, val))
+
+	def delete(self, key: int) -> 'PersistentAVLTree':
+		"""Returns the version without key (self if key is not present)."""
+		root = _delete(self.root, key)
+		return self if root is self.root else PersistentAVLTree(root)
+
+	# --- Traversal Methods ---
+	def avl_to_array(self) -> List[Tuple[int, str]]:
+		return list(self.items())
+
+	def __iter__(self) -> Iterator[int]:
+		return (key for key, _ in self.items())
+
+	def items(self, lo: Optional[int] = None, hi: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+		"""Yields (key, value) in ascending order with lo <= key <= hi, using an explicit
+		stack of at most height + 1 nodes."""
+		stack: List[PersistentAVLNode] = []
+		node = self.root
+		while stack or node is not None:
+			while node is not None:
+				if lo is not None and node.key < lo:
+					node = node.right
+				else:
+					stack.append(node)
+					node = node.left
+			if not stack:
+				return
+			node = stack.pop()
+			if hi is not None and node.key > hi:
+				return
+			yield node.key, node.value
+			node = node.right
+
+	# --- Size/Root/Balance Methods ---
+	def size(self) -> int:
+		return _size_of(self.root)
+
+	def get_root(self) -> Optional[PersistentAVLNode]:
+		return self.root
+
+	def get_amir_balance_factor(self) -> float:
+		return _balanced_of(self.root) / self.size() if self.root is not None else 0
@@ -1,88 +1,118 @@
 ## This file contains functions for the representation of binary trees.
 ## Used in class Binary_search_tree's __repr__
 ## Written by a former student in the course - thanks to Amitai Cohen
-## No need to fully understand this code
+## Reworked to lay the tree out iteratively and stream it row by row, so deep or huge
+## trees neither hit the recursion limit nor get re-concatenated at every level.
 
-def printree(t, file=None, append=True, bykey=True):
+import sys
+
+# A laid-out subtree is a tuple (label, width, label_start, rows, left, right):
+# width is the width of every row of its block, label_start the column its label starts at
+# and rows the number of rows; left and right are the children's layouts, None for a leaf.
+LEAF_MISSING = "#"
+LEAF_ELIDED = "..."
+
+
+def printree(t, file=None, append=True, bykey=True, max_depth=None):
     """Print a textual representation of t
     bykey=True: show keys instead of values, and also show balance factor
-    file: if provided (as a filename), write output to this file (file is always cleared first)"""
-    rows = trepr(t, bykey)
-    mode = "a" if append else "w"
+    file: if provided (as a filename), also write output to this file (appended to unless append=False)
+    max_depth: if provided, subtrees below this many levels are shown as '...'"""
     if file:
+        mode = "a" if append else "w"
         with open(file, mode) as f:
-            for row in rows:
+            for row in render_rows(t, bykey, max_depth):
                 print(row)
                 print(row, file=f)
     else:
-        for row in rows:
-            print(row)
+        write_tree(t, sys.stdout, bykey, max_depth)
+
+
+def write_tree(t, out, bykey=True, max_depth=None):
+    """Stream the rows of t to the file object out; returns the number of rows written"""
+    count = 0
+    for row in render_rows(t, bykey, max_depth):
+        out.write(row)
+        out.write("\n")
+        count += 1
+    return count
 
-def trepr(t, bykey=False):
+
+def trepr(t, bykey=False, max_depth=None):
     """Return a list of textual representations of the levels in t
     bykey=True: show keys instead of values, and also show balance factor and zero_balance_count"""
-    if t is None:
-        return ["#"]
+    return list(render_rows(t, bykey, max_depth))
+
+
+def render_rows(t, bykey=False, max_depth=None):
+    """Yield the rows of the drawing of t from top to bottom
+    Only the levels that are drawn are visited, so the top of a huge tree renders quickly."""
+    layout = _layout(t, bykey, max_depth)
+    # each row is drawn from a frontier of blocks, as (layout, row within it) or a blank width
+    frontier = [(layout, 0)]
+    for _ in range(layout[3]):
+        parts = []
+        next_frontier = []
+        for item in frontier:
+            if type(item) is int:
+                parts.append(item * " ")
+                _push_blank(next_frontier, item)
+                continue
+            (label, width, start, _, left, right), row = item
+            if left is None:
+                parts.append(label)
+                _push_blank(next_frontier, width)
+            elif row == 0:
+                parts.append(start * " " + label + (right[1] + 1) * " ")
+                next_frontier.append((item[0], 1))
+            else:
+                lwid, rwid = left[1], right[1]
+                ls = left[2] + len(left[0])
+                rs = right[2]
+                parts.append(ls * " " + (lwid - ls) * "_" + "/" + len(label) * " " + "|" + rs * "_" + (rwid - rs) * " ")
+                next_frontier.append((left, 0))
+                _push_blank(next_frontier, len(label) + 2)
+                next_frontier.append((right, 0))
+        yield "".join(parts)
+        frontier = next_frontier
+
+
+def _push_blank(frontier, width):
+    if frontier and type(frontier[-1]) is int:
+        frontier[-1] += width
+    else:
+        frontier.append(width)
+
 
+def _label(t, bykey):
     # Show key, balance factor, zero_balance_count, and height in compact form
     if hasattr(t, 'key') and hasattr(t, 'balance_factor') and hasattr(t, 'zero_balance_count') and hasattr(t, 'height'):
         val = str(t.key) if bykey else str(getattr(t, 'value', getattr(t, 'val', t)))
         bf = t.balance_factor() if callable(t.balance_factor) else t.balance_factor
         zbf = t.zero_balance_count
         h = t.height
-        thistr = f"{val},({bf}),[{zbf}]{{{h}}}"
-    else:
-        thistr = str(getattr(t, 'key', t)) if bykey else str(getattr(t, 'val', t))
-
-    return conc(trepr(getattr(t, 'left', None), bykey), thistr, trepr(getattr(t, 'right', None), bykey))
-
-def conc(left, root, right):
-    """Return a concatenation of textual representations of
-    a root node, its left node, and its right node
-    root is a string, and left and right are lists of strings"""
-
-    lwid = len(left[-1])
-    rwid = len(right[-1])
-    rootwid = len(root)
-
-    result = [(lwid + 1) * " " + root + (rwid + 1) * " "]
-
-    ls = leftspace(left[0])
-    rs = rightspace(right[0])
-    result.append(ls * " " + (lwid - ls) * "_" + "/" + rootwid * " " + "|" + rs * "_" + (rwid - rs) * " ")
-
-    for i in range(max(len(left), len(right))):
-        row = ""
-        if i < len(left):
-            row += left[i]
-        else:
-            row += lwid * " "
+        return f"{val},({bf}),[{zbf}]{{{h}}}"
+    return str(getattr(t, 'key', t)) if bykey else str(getattr(t, 'val', t))
 
-        row += (rootwid + 2) * " "
 
-        if i < len(right):
-            row += right[i]
+def _layout(t, bykey, max_depth):
+    """Compute the layout of t bottom-up with an explicit stack (post-order)"""
+    done = []
+    stack = [(t, 0, False)]
+    while stack:
+        node, depth, expanded = stack.pop()
+        if node is None:
+            done.append((LEAF_MISSING, 1, 0, 1, None, None))
+        elif max_depth is not None and depth >= max_depth:
+            done.append((LEAF_ELIDED, len(LEAF_ELIDED), 0, 1, None, None))
+        elif not expanded:
+            stack.append((node, depth, True))
+            stack.append((getattr(node, 'right', None), depth + 1, False))
+            stack.append((getattr(node, 'left', None), depth + 1, False))
         else:
-            row += rwid * " "
-
-        result.append(row)
-
-    return result
-
-def leftspace(row):
-    """helper for conc"""
-    # row is the first row of a left node
-    # returns the index of where the second whitespace starts
-    i = len(row) - 1
-    while i >= 0 and row[i] == " ":
-        i -= 1
-    return i + 1
-
-def rightspace(row):
-    """helper for conc"""
-    # row is the first row of a right node
-    # returns the index of where the first whitespace ends
-    i = 0
-    while i < len(row) and row[i] == " ":
-        i += 1
-    return i
\ No newline at end of file
+            right = done.pop()
+            left = done.pop()
+            label = _label(node, bykey)
+            rows = 2 + max(left[3], right[3])
+            done.append((label, left[1] + len(label) + right[1] + 2, left[1] + 1, rows, left, right))
+    return done[0]
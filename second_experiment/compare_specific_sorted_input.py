@@ -8,37 +8,33 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from bst import BSTree
 from avl_tree import AVLTree
+from benchmarks.runner import measure
+from benchmarks.workloads import sorted_keys as generate_sorted
 
-def generate_sorted(n):
-    return list(range(n))
+def time_insertion(tree_class, start_mode, data, repeats):
+    def insert_all(_):
+        tree = tree_class()
+        for val in data:
+            tree.insert(val, str(val), start=start_mode)
+    return measure(insert_all, repeats=repeats)["median"]
 
-def time_insertion(tree_class, start_mode, data):
-    t0 = time.time()
-    tree = tree_class()
-    for val in data:
-        tree.insert(val, str(val), start=start_mode)
-    t1 = time.time()
-    return t1 - t0
+def time_bulk_load(data, repeats):
+    return measure(lambda _: AVLTree.from_sorted((val, str(val)) for val in data), repeats=repeats)["median"]
 
-def experiment_task(args):
-    n, repeats = args
-    sorted_data = generate_sorted(n)
-    avl_sorted_time = sum(time_insertion(AVLTree, "root", sorted_data) for _ in range(repeats)) / repeats
-    avl_max_time = sum(time_insertion(AVLTree, "max", sorted_data) for _ in range(repeats)) / repeats
-    bst_max_time = sum(time_insertion(BSTree, "max", sorted_data) for _ in range(repeats)) / repeats
-    return n, avl_sorted_time, avl_max_time, bst_max_time
-
-def run_experiment(sizes, repeats=1):
-    results = {"AVL (root)": [], "AVL (max)": [], "BST (max)": []}
+def run_experiment(sizes, repeats=5):
+    results = {"AVL (root)": [], "AVL (max)": [], "BST (max)": [], "AVL (from_sorted)": []}
 
     for n in sizes:
-        avl_sorted_time = sum(time_insertion(AVLTree, "root", generate_sorted(n)) for _ in range(repeats)) / repeats
-        avl_max_time = sum(time_insertion(AVLTree, "max", generate_sorted(n)) for _ in range(repeats)) / repeats
-        bst_max_time = sum(time_insertion(BSTree, "max", generate_sorted(n)) for _ in range(repeats)) / repeats
+        data = generate_sorted(n)
+        avl_sorted_time = time_insertion(AVLTree, "root", data, repeats)
+        avl_max_time = time_insertion(AVLTree, "max", data, repeats)
+        bst_max_time = time_insertion(BSTree, "max", data, repeats)
+        bulk_time = time_bulk_load(data, repeats)
 
         results["AVL (root)"].append((n, avl_sorted_time))
         results["AVL (max)"].append((n, avl_max_time))
         results["BST (max)"].append((n, bst_max_time))
+        results["AVL (from_sorted)"].append((n, bulk_time))
 
     return results
 
@@ -51,7 +47,7 @@ def plot_results(results, folder):
         for i, j in zip(x, y):
             plt.text(i, j, f"{j:.6f}", fontsize=8, ha='right')
     plt.xlabel('n (number of elements)')
-    plt.ylabel('Average Insertion Time (seconds)')
+    plt.ylabel('Median Insertion Time (seconds)')
     plt.title('Insertion Time Comparison (Sorted Input)')
     plt.legend()
     plt.grid(True)
@@ -8,38 +8,24 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from bst import BSTree
 # from avl_tree import AVLTree
 from avl_tree import AVLTree
+from benchmarks.runner import measure
+from benchmarks.workloads import sorted_keys as generate_sorted, reversed_keys as generate_reversed
 
 
-
-def generate_sorted(n):
-    return list(range(n))
-
-
-def generate_reversed(n):
-    return list(range(n - 1, -1, -1))
-
-
-def time_insertion(tree_class, start_mode, data):
-    t0 = time.time()
+def insert_all(tree_class, start_mode, data):
     tree = tree_class()
     for val in data:
         tree.insert(val, str(val), start=start_mode)
-    t1 = time.time()
-    return t1 - t0
+    return tree
 
 def run_scenario(args):
     tree_type, start_mode, data, n, repeats = args
-    total_time = 0
-    for _ in range(repeats):
-        if tree_type == "BST":
-            total_time += time_insertion(BSTree, start_mode, data)
-        else:
-            total_time += time_insertion(AVLTree, start_mode, data)
-    avg_time = total_time / repeats
-    return (tree_type, start_mode, "sorted" if data == list(range(n)) else "reversed", n, avg_time)
+    tree_class = BSTree if tree_type == "BST" else AVLTree
+    median_time = measure(lambda _: insert_all(tree_class, start_mode, data), repeats=repeats)["median"]
+    return (tree_type, start_mode, "sorted" if data == list(range(n)) else "reversed", n, median_time)
 
 
-def run_all_experiments(sizes, repeats=1):
+def run_all_experiments(sizes, repeats=5):
     scenarios = [("BST", "root"), ("BST", "max"), ("AVL", "root"), ("AVL", "max")]
     tasks = []
     for n in sizes:
@@ -78,14 +64,10 @@ def plot_results(results, folder):
             for start_mode in ['root', 'max']:
                 y = [r[4] for r in data if r[0] == tree_type and r[1] == start_mode]
                 x = [r[3] for r in data if r[0] == tree_type and r[1] == start_mode]
-                # Discount the last 5 points
-                if len(x) > 5 and len(y) > 5:
-                    x = x[:-5]
-                    y = y[:-5]
                 label = f"{tree_type} ({start_mode})"
                 plt.plot(x, y, label=label)  # Removed marker and point labels
         plt.xlabel('n (number of elements)')
-        plt.ylabel('Average Insertion Time (seconds)')
+        plt.ylabel('Median Insertion Time (seconds)')
         plt.title(f'Insertion Time vs n ({input_type.capitalize()} Data)')
         plt.legend()
         plt.grid(True)
@@ -0,0 +1,163 @@
+# =============================
+# Process-sharded AVL Tree
+# =============================
+
+import multiprocessing
+from bisect import bisect_right
+from multiprocessing.reduction import ForkingPickler
+from typing import Optional, List, Tuple, Iterable
+
+from avl_tree import AVLTree, AVLNode
+
+"""A range-partitioned AVL tree spread over worker processes.
+
+The key space is cut at sorted boundaries into len(boundaries) + 1 ranges; shard i holds the
+keys k with boundaries[i - 1] <= k < boundaries[i] in its own AVLTree, inside its own
+process, so shards do their work on separate cores without sharing the GIL. Calls are
+routed to the owning shard over a pipe. Batch methods send every shard its part of the
+batch before waiting for any reply, which is where the parallel speed-up comes from; a
+single insert/search is one round trip and is slower than a local AVLTree.
+
+Nodes cannot cross process boundaries: search returns a detached AVLNode copy holding
+key and value, and delete accepts any node (or use delete_key)."""
+
+
+def _shard_worker(conn) -> None:
+	"""Serves (method, args) requests against a private AVLTree until it gets "close"."""
+	tree = AVLTree()
+	while True:
+		method, args = conn.recv()
+		if method == "close":
+			conn.close()
+			return
+		try:
+			if method == "search":
+				node = tree.search(*args)
+				result = None if node is None else (node.key, node.value)
+			elif method == "delete_key":
+				result = tree.delete(tree.search(*args))
+			elif method == "items":
+				result = list(tree.items(*args))
+			else:
+				result = getattr(tree, method)(*args)
+		except Exception as e:
+			conn.send((False, e))
+		else:
+			conn.send((True, result))
+
+
+# =============================
+# Sharded AVL Tree Class
+# =============================
+
+class ShardedAVLTree(object):
+	"""
+	Starts one worker process per key range. Call close() (or use it as a context manager)
+	to stop the workers.
+	"""
+	def __init__(self, boundaries: Iterable[int]):
+		self.boundaries: List[int] = sorted(boundaries)
+		self._conns = []
+		self._workers = []
+		for _ in range(len(self.boundaries) + 1):
+			parent_conn, child_conn = multiprocessing.Pipe()
+			worker = multiprocessing.Process(target=_shard_worker, args=(child_conn,), daemon=True)
+			worker.start()
+			child_conn.close()
+			self._conns.append(parent_conn)
+			self._workers.append(worker)
+
+	@classmethod
+	def with_even_ranges(cls, workers: int, lo: int, hi: int) -> 'ShardedAVLTree':
+		"""Splits [lo, hi) into workers ranges of equal width."""
+		step = (hi - lo) / workers
+		return cls(lo + int(step * i) for i in range(1, workers))
+
+	def shard_of(self, key: int) -> int:
+		return bisect_right(self.boundaries, key)
+
+	def _call(self, shard: int, method: str, *args):
+		conn = self._conns[shard]
+		conn.send((method, args))
+		return self._reply(conn)
+
+	def _call_all(self, requests: List[Tuple[int, str, tuple]]) -> list:
+		"""Sends every request before collecting any reply, so the shards work in parallel.
+		Every request is pickled before any is sent, and every reply is read before the first
+		error is raised, so a failed call leaves no reply behind on a pipe for the next call."""
+		payloads = [ForkingPickler.dumps((method, args)) for _, method, args in requests]
+		for (shard, _, _), payload in zip(requests, payloads):
+			self._conns[shard].send_bytes(payload)
+		replies = [self._conns[shard].recv() for shard, _, _ in requests]
+		for ok, result in replies:
+			if not ok:
+				raise result
+		return [result for _, result in replies]
+
+	@staticmethod
+	def _reply(conn):
+		ok, result = conn.recv()
+		if not ok:
+			raise result
+		return result
+
+	# --- Single-key Methods ---
+	def insert(self, key: int, val: str) -> int:
+		return self._call(self.shard_of(key), "insert", key, val)
+
+	def search(self, key: int) -> Optional[AVLNode]:
+		found = self._call(self.shard_of(key), "search", key)
+		return None if found is None else AVLNode(*found)
+
+	def delete(self, node: Optional[AVLNode]) -> int:
+		if node is None or not node.is_real_node():
+			return 0
+		return self.delete_key(node.key)
+
+	def delete_key(self, key: int) -> int:
+		return self._call(self.shard_of(key), "delete_key", key)
+
+	# --- Batch Methods ---
+	def insert_many(self, pairs: Iterable[Tuple[int, str]]) -> int:
+		per_shard: List[List[Tuple[int, str]]] = [[] for _ in self._conns]
+		for pair in pairs:
+			per_shard[self.shard_of(pair[0])].append(pair)
+		return sum(self._call_all([(i, "insert_many", (part,)) for i, part in enumerate(per_shard) if part]))
+
+	def delete_many(self, keys: Iterable[int]) -> int:
+		per_shard: List[List[int]] = [[] for _ in self._conns]
+		for key in keys:
+			per_shard[self.shard_of(key)].append(key)
+		return sum(self._call_all([(i, "delete_many", (part,)) for i, part in enumerate(per_shard) if part]))
+
+	# --- Traversal Methods ---
+	def avl_to_array(self) -> List[Tuple[int, str]]:
+		# shards own consecutive key ranges, so concatenating in shard order keeps keys sorted
+		parts = self._call_all([(i, "avl_to_array", ()) for i in range(len(self._conns))])
+		return [item for part in parts for item in part]
+
+	def items(self, lo: Optional[int] = None, hi: Optional[int] = None) -> List[Tuple[int, str]]:
+		first = 0 if lo is None else self.shard_of(lo)
+		last = len(self._conns) - 1 if hi is None else self.shard_of(hi)
+		parts = self._call_all([(i, "items", (lo, hi)) for i in range(first, last + 1)])
+		return [item for part in parts for item in part]
+
+	def size(self) -> int:
+		return sum(self._call_all([(i, "size", ()) for i in range(len(self._conns))]))
+
+	# --- Lifecycle ---
+	def close(self) -> None:
+		for conn, worker in zip(self._conns, self._workers):
+			try:
+				conn.send(("close", ()))
+			except (BrokenPipeError, OSError):
+				pass
+			conn.close()
+			worker.join()
+		self._conns, self._workers = [], []
+
+	def __enter__(self) -> 'ShardedAVLTree':
+		return self
+
+	def __exit__(self, *exc_info) -> None:
+		self.close()
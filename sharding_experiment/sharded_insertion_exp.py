@@ -0,0 +1,70 @@
+import time
+import sys
+import os
+import random
+import matplotlib.pyplot as plt
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from avl_tree import AVLTree
+from sharded_avl_tree import ShardedAVLTree
+
+
+KEY_SPACE = 10 ** 9
+
+
+def generate_random(n, seed=0):
+    return random.Random(seed).sample(range(KEY_SPACE), n)
+
+
+def time_single_tree(data, batch_size):
+    tree = AVLTree()
+    t0 = time.perf_counter()
+    for i in range(0, len(data), batch_size):
+        tree.insert_many((k, str(k)) for k in data[i:i + batch_size])
+    return time.perf_counter() - t0
+
+
+def time_sharded(data, workers, batch_size):
+    with ShardedAVLTree.with_even_ranges(workers, 0, KEY_SPACE) as tree:
+        t0 = time.perf_counter()
+        for i in range(0, len(data), batch_size):
+            tree.insert_many([(k, str(k)) for k in data[i:i + batch_size]])
+        return time.perf_counter() - t0
+
+
+def run_experiment(n, worker_counts, batch_size=50_000, repeats=1):
+    data = generate_random(n)
+    baseline = sum(time_single_tree(data, batch_size) for _ in range(repeats)) / repeats
+    results = []
+    for workers in worker_counts:
+        elapsed = sum(time_sharded(data, workers, batch_size) for _ in range(repeats)) / repeats
+        results.append((workers, elapsed, n / elapsed))
+        print(f"{workers} workers: {elapsed:.2f}s ({n / elapsed:,.0f} inserts/s), single tree {baseline:.2f}s")
+    return baseline, results
+
+
+def plot_results(baseline, results, n, folder):
+    workers = [r[0] for r in results]
+    throughput = [r[2] for r in results]
+    plt.figure(figsize=(10, 6))
+    plt.plot(workers, throughput, marker='o', label='ShardedAVLTree')
+    plt.axhline(n / baseline, color='gray', linestyle='--', label='single AVLTree')
+    plt.xlabel('worker processes')
+    plt.ylabel('inserts per second')
+    plt.title(f'Batched insert throughput vs workers (n={n}, random keys)')
+    plt.legend()
+    plt.grid(True)
+    plt.tight_layout()
+    out_path = os.path.join(folder, 'sharded_insert_scaling.png')
+    plt.savefig(out_path)
+    plt.close()
+    print(f"Saved graph: {out_path}")
+
+
+if __name__ == "__main__":
+    n = 1_000_000
+    worker_counts = list(range(1, (os.cpu_count() or 1) + 1))
+    start_time = time.time()
+    baseline, results = run_experiment(n, worker_counts)
+    plot_results(baseline, results, n, os.path.dirname(__file__))
+    print(f"\nTotal experiment time: {time.time() - start_time:.2f} seconds")
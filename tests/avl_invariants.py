@@ -0,0 +1,28 @@
+"""Structural checks shared by the test modules.
+
+Kept apart from the abdul_test suites so a test can check a tree without building one of
+their TestCase instances (importing abdul_test1 also truncates avl_error_log.txt)."""
+
+
+def assert_avl_invariants(test, tree):
+    """Checks, with test's assertions, that every node of tree has the right height, is
+    balanced and is linked to its parent, and that get_amir_balance_factor matches a recount."""
+    root = tree.get_root()
+    if root is not None:
+        test.assertIsNone(root.parent, "root has a parent")
+    total, balanced = _check_subtree(test, root)[1:]
+    test.assertAlmostEqual(tree.get_amir_balance_factor(), balanced / total if total else 0, places=6)
+
+
+def _check_subtree(test, node):
+    """Returns (height, node count, balanced node count) of node's subtree."""
+    if node is None or not node.is_real_node():
+        return -1, 0, 0
+    for child in (node.left, node.right):
+        if child.is_real_node():
+            test.assertIs(child.parent, node, f"broken parent link below key {node.key!r}")
+    lh, ln, lb = _check_subtree(test, node.left)
+    rh, rn, rb = _check_subtree(test, node.right)
+    test.assertLessEqual(abs(lh - rh), 1, f"unbalanced at key {node.key!r}: {lh=} {rh=}")
+    test.assertEqual(node.height, max(lh, rh) + 1, f"height mismatch at key {node.key!r}")
+    return max(lh, rh) + 1, ln + rn + 1, lb + rb + (lh == rh)
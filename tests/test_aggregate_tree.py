@@ -0,0 +1,65 @@
+import unittest
+import os
+import random
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from aggregate_tree import AggregateTree, Monoid, SUM, MIN, MAX, COUNT
+
+
+class TestAggregateTree(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(20)
+        self.data = {k: rng.randrange(-1_000, 1_000) for k in rng.sample(range(50_000), 1_500)}
+
+    def build(self, monoid):
+        tree = AggregateTree(monoid)
+        for k, v in self.data.items():
+            tree.insert(k, v)
+        return tree
+
+    def in_range(self, lo, hi):
+        return [v for k, v in sorted(self.data.items()) if (lo is None or k >= lo) and (hi is None or k <= hi)]
+
+    def test_range_folds_match_scan(self):
+        rng = random.Random(21)
+        trees = {monoid: self.build(monoid) for monoid in (SUM, MIN, MAX, COUNT)}
+        for _ in range(200):
+            lo = rng.randrange(-10, 50_010)
+            hi = lo + rng.randrange(5_000)
+            values = self.in_range(lo, hi)
+            self.assertEqual(trees[SUM].aggregate(lo, hi), sum(values))
+            self.assertEqual(trees[MIN].aggregate(lo, hi), min(values, default=float("inf")))
+            self.assertEqual(trees[MAX].aggregate(lo, hi), max(values, default=float("-inf")))
+            self.assertEqual(trees[COUNT].aggregate(lo, hi), len(values))
+        self.assertEqual(trees[SUM].aggregate(), sum(self.data.values()))
+        self.assertEqual(trees[SUM].aggregate(hi=25_000), sum(self.in_range(None, 25_000)))
+        self.assertEqual(trees[SUM].aggregate(10, 5), 0)
+
+    def test_non_commutative_fold_keeps_key_order(self):
+        concat = Monoid("", lambda a, b: a + b, lambda key, value: value)
+        tree = AggregateTree.from_sorted(((i, chr(97 + i)) for i in range(26)), monoid=concat)
+        for i in range(26, 40):
+            tree.insert(i, str(i % 10))
+        self.assertEqual(tree.aggregate(3, 8), "defghi")
+        self.assertEqual(tree.aggregate(24, 31), "yz678901")
+
+    def test_maintained_through_updates(self):
+        tree = self.build(SUM)
+        keys = sorted(self.data)
+        for k in keys[::3]:
+            tree.delete(tree.search(k))
+            del self.data[k]
+        for k in keys[1::3][::5]:
+            tree.set_value(tree.search(k), 1)
+            self.data[k] = 1
+        left, right = tree.split(keys[700])
+        self.assertEqual(left.aggregate(), sum(self.in_range(None, keys[700] - 1)))
+        left.join(keys[700], right, 5)
+        self.assertEqual(left.aggregate(), sum(self.data.values()) + 5)
+        self.assertEqual(left.aggregate(keys[100], keys[900]),
+                         sum(self.in_range(keys[100], keys[900])) + 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
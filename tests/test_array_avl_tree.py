@@ -0,0 +1,70 @@
+import unittest
+from unittest import mock
+import random
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from array_avl_tree import ArrayAVLTree
+
+import abdul_test1
+import abdul_test2
+import abdul_test3
+import test_insert_delete
+
+# The existing suites run unchanged against the array backend: the abdul_test
+# cases build self.tree in setUp, test_insert_delete calls AVLTree() directly.
+
+
+class ArrayTestAVLTree(abdul_test1.TestAVLTree):
+    def setUp(self):
+        super().setUp()
+        self.tree = ArrayAVLTree()
+
+
+class ArrayTestAdvancedAVLTree2(abdul_test2.TestAdvancedAVLTree):
+    def setUp(self):
+        self.tree = ArrayAVLTree()
+
+
+class ArrayTestAdvancedAVLTree3(abdul_test3.TestAdvancedAVLTree):
+    def setUp(self):
+        self.tree = ArrayAVLTree()
+
+
+class ArrayTestInsertDeleteReturnValues(test_insert_delete.TestInsertDeleteReturnValues):
+    def setUp(self):
+        patcher = mock.patch.object(test_insert_delete, "AVLTree", ArrayAVLTree)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestArrayStorage(unittest.TestCase):
+
+    def test_deleted_slots_are_reused(self):
+        tree = ArrayAVLTree()
+        for k in range(100):
+            tree.insert(k, str(k))
+        for k in range(0, 100, 2):
+            tree.delete(tree.search(k))
+        slots = len(tree._keys)
+        for k in range(0, 100, 2):
+            tree.insert(k, str(k))
+        self.assertEqual(len(tree._keys), slots)
+        self.assertEqual(tree.avl_to_array(), [(k, str(k)) for k in range(100)])
+
+    def test_random_ops_match_linked_tree(self):
+        from avl_tree import AVLTree
+        rng = random.Random(7)
+        linked, flat = AVLTree(), ArrayAVLTree()
+        keys = rng.sample(range(10_000), 2_000)
+        for k in keys:
+            self.assertEqual(linked.insert(k, str(k), "max"), flat.insert(k, str(k), "max"))
+        for k in keys[:1_000]:
+            self.assertEqual(linked.delete(linked.search(k)), flat.delete(flat.search(k)))
+        self.assertEqual(linked.avl_to_array(), flat.avl_to_array())
+        self.assertEqual(linked.get_amir_balance_factor(), flat.get_amir_balance_factor())
+        self.assertEqual(linked.get_max_node().key, flat.get_max_node().key)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import asyncio
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from async_avl_tree import AsyncAVLTree
+from avl_tree import AVLTree
+
+
+class TestAsyncAVLTree(unittest.IsolatedAsyncioTestCase):
+
+    async def test_concurrent_writes_are_coalesced(self):
+        tree = AsyncAVLTree()
+        counts = await asyncio.gather(*(tree.ainsert(k, str(k)) for k in range(300, 0, -1)))
+        self.assertEqual(tree.batches_applied, 1)
+        self.assertTrue(all(isinstance(c, int) and c >= 0 for c in counts))
+        self.assertEqual(tree.tree.avl_to_array(), [(k, str(k)) for k in range(1, 301)])
+
+    async def test_large_bursts_are_sliced(self):
+        tree = AsyncAVLTree(max_batch=100)
+        await asyncio.gather(*(tree.ainsert(k, str(k)) for k in range(1_000)))
+        self.assertEqual(tree.batches_applied, 10)
+        self.assertEqual(tree.size(), 1_000)
+
+    async def test_insert_delete_runs_keep_arrival_order(self):
+        tree = AsyncAVLTree()
+        await asyncio.gather(tree.ainsert(1, "a"), tree.adelete(1), tree.ainsert(1, "b"), tree.adelete(7))
+        self.assertEqual(tree.tree.avl_to_array(), [(1, "b")])
+
+    async def test_batches_sort_by_the_key_function(self):
+        tree = AsyncAVLTree(AVLTree(key=lambda d: d["t"]))
+        await asyncio.wait_for(asyncio.gather(*(tree.ainsert({"t": t}, str(t)) for t in (3, 1, 2))), 1)
+        self.assertEqual([key["t"] for key in tree.tree], [1, 2, 3])
+
+    async def test_bad_key_fails_only_its_writer(self):
+        tree = AsyncAVLTree(AVLTree(key=lambda d: d["t"]))
+        results = await asyncio.wait_for(asyncio.gather(
+            tree.ainsert({"t": 2}, "a"), tree.ainsert({}, "b"), tree.ainsert({"t": 1}, "c"),
+            return_exceptions=True), 1)
+        self.assertEqual([type(r) for r in results], [int, KeyError, int])
+        self.assertEqual([key["t"] for key in tree.tree], [1, 2])
+        # the flush task survived, later writes still go through
+        await asyncio.wait_for(tree.ainsert({"t": 5}, "c"), 1)
+        self.assertEqual(tree.size(), 3)
+
+    async def test_failed_batch_fails_every_writer(self):
+        # sort keys that cannot be compared fail the sort of the whole run
+        tree = AsyncAVLTree()
+        results = await asyncio.wait_for(
+            asyncio.gather(tree.ainsert(1, "a"), tree.ainsert("x", "b"), return_exceptions=True), 1)
+        self.assertTrue(all(isinstance(r, TypeError) for r in results))
+        await asyncio.wait_for(tree.ainsert(5, "c"), 1)
+        self.assertEqual(tree.size(), 1)
+
+    async def test_drain_waits_for_queued_writes(self):
+        tree = AsyncAVLTree()
+        pending = [asyncio.ensure_future(tree.ainsert(k, str(k))) for k in range(10)]
+        await asyncio.sleep(0)  # let the writers enqueue
+        await tree.drain()
+        self.assertEqual(tree.size(), 10)
+        await asyncio.gather(*pending)
+
+    async def test_chunked_scan_survives_writes_between_chunks(self):
+        tree = AsyncAVLTree(scan_chunk=16)
+        await asyncio.gather(*(tree.ainsert(k, str(k)) for k in range(0, 200, 2)))
+        seen = []
+        async for key, _ in tree.aitems(10, 150):
+            seen.append(key)
+            if key == 40:
+                # applied while the scan is suspended between chunks
+                await asyncio.gather(tree.ainsert(141, "x"), tree.adelete(100), tree.ainsert(5, "y"))
+        self.assertEqual(seen, sorted(seen))
+        self.assertIn(141, seen)
+        self.assertNotIn(100, seen)
+        self.assertNotIn(5, seen)
+
+    async def test_scan_keeps_duplicate_runs_together(self):
+        tree = AsyncAVLTree(scan_chunk=4)
+        for k in [1, 2, 3, 3, 3, 3, 3, 4, 5]:
+            tree.tree.insert(k, str(k))
+        self.assertEqual([k async for k, _ in tree.aitems()], [1, 2, 3, 3, 3, 3, 3, 4, 5])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import os
+import random
+import sys
+import tempfile
+from unittest import mock
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from avl_tree import AVLTree
+from avl_snapshot import MappedAVLTree, write_snapshot
+
+
+class TestSnapshots(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".avlt")
+        os.close(handle)
+        self.addCleanup(os.remove, self.path)
+        rng = random.Random(13)
+        self.keys = sorted(rng.sample(range(-10 ** 12, 10 ** 12), 2_000))
+        self.tree = AVLTree.from_sorted((k, f"v{k}é") for k in self.keys)
+
+    def test_save_load_round_trip(self):
+        self.tree.insert(5, None)
+        self.tree.insert(6, {"not": "a string"})
+        self.tree.save(self.path)
+        loaded = AVLTree.load(self.path)
+        self.assertEqual(loaded.avl_to_array(), self.tree.avl_to_array())
+        self.assertEqual(loaded.size(), self.tree.size())
+        self.assertEqual(loaded.get_max_node().key, self.keys[-1])
+
+    def test_load_does_not_need_the_memory_map(self):
+        # MappedAVLTree refuses big-endian hosts; loading must not go through it
+        self.tree.save(self.path)
+        with mock.patch("avl_snapshot.MappedAVLTree", side_effect=NotImplementedError):
+            self.assertEqual(AVLTree.load(self.path).avl_to_array(), self.tree.avl_to_array())
+
+    def test_mapped_queries(self):
+        self.tree.save(self.path)
+        with MappedAVLTree(self.path) as mapped:
+            self.assertEqual(mapped.size(), len(self.keys))
+            for k in self.keys[::97]:
+                self.assertEqual(mapped.search(k).value, f"v{k}é")
+            self.assertIsNone(mapped.search(self.keys[0] - 1))
+            lo, hi = self.keys[100], self.keys[200]
+            self.assertEqual(list(mapped.items(lo, hi)), list(self.tree.items(lo, hi)))
+            self.assertEqual(mapped.count_range(lo, hi), 101)
+            self.assertEqual(mapped.rank(self.keys[10]), 10)
+            self.assertEqual(list(mapped), self.keys)
+
+    def test_empty_snapshot(self):
+        AVLTree().save(self.path)
+        self.assertEqual(AVLTree.load(self.path).size(), 0)
+        with MappedAVLTree(self.path) as mapped:
+            self.assertIsNone(mapped.search(1))
+            self.assertEqual(mapped.avl_to_array(), [])
+
+    def test_rejects_bad_input(self):
+        with self.assertRaises(ValueError):
+            write_snapshot(self.path, [(2, "b"), (1, "a")])
+        with open(self.path, "wb") as f:
+            f.write(b"not a snapshot at all....")
+        with self.assertRaises(ValueError):
+            MappedAVLTree(self.path)
+        with self.assertRaises(ValueError):
+            AVLTree.load(self.path)
+        self.tree.save(self.path)
+        full = os.path.getsize(self.path)
+        for length in (full - 1, full // 2, 4, 0):
+            self.tree.save(self.path)
+            with open(self.path, "r+b") as f:
+                f.truncate(length)
+            with self.assertRaises(ValueError):
+                AVLTree.load(self.path)
+            with self.assertRaises(ValueError):
+                MappedAVLTree(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
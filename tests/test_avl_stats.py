@@ -0,0 +1,61 @@
+import unittest
+import json
+import os
+import random
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from avl_tree import AVLTree
+
+
+class TestAVLStats(unittest.TestCase):
+
+    def test_disabled_by_default(self):
+        tree = AVLTree()
+        tree.insert(1, "a")
+        tree.search(1)
+        self.assertIsNone(tree.stats)
+
+    def test_rotation_kinds(self):
+        cases = {
+            "single_left": [1, 2, 3],
+            "single_right": [3, 2, 1],
+            "double_right_left": [1, 3, 2],
+            "double_left_right": [3, 1, 2],
+        }
+        for kind, keys in cases.items():
+            tree = AVLTree()
+            stats = tree.enable_stats()
+            for k in keys:
+                tree.insert(k, str(k))
+            self.assertEqual(stats.rotations[kind], 1, kind)
+            self.assertEqual(sum(stats.rotations.values()), 1, kind)
+
+    def test_counters(self):
+        rng = random.Random(16)
+        tree = AVLTree()
+        stats = tree.enable_stats()
+        keys = rng.sample(range(10 ** 6), 2_000)
+        for k in keys:
+            tree.insert(k, str(k))
+        for k in keys[:500]:
+            tree.search(k)
+        self.assertIsNone(tree.search(-1))
+        for k in keys[:100]:
+            tree.delete(tree.search(k))
+        report = stats.as_dict()
+        self.assertEqual(report["operations"]["insert"], 2_000)
+        self.assertEqual(report["operations"]["delete"], 100)
+        self.assertEqual(report["operations"]["search"], 601)
+        self.assertEqual(report["operations"]["search_hit"], 600)
+        self.assertEqual(sum(report["insert_path"].values()), 2_000)
+        self.assertEqual(sum(report["rebalance_levels"].values()), 2_099)
+        self.assertLessEqual(max(report["search_path"]), tree.root.height + 1)
+        self.assertGreater(report["comparisons_per_search"], report["mean_search_path"])
+        json.dumps(report)
+        self.assertIs(tree.disable_stats(), stats)
+        tree.search(keys[200])
+        self.assertEqual(stats.operations["search"], 601)
+
+
+if __name__ == '__main__':
+    unittest.main()
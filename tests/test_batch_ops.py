@@ -0,0 +1,66 @@
+import unittest
+import random
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from avl_tree import AVLTree
+from avl_invariants import assert_avl_invariants
+
+
+class TestBatchOps(unittest.TestCase):
+
+    def test_insert_many_matches_sorted_single_inserts(self):
+        rng = random.Random(1)
+        base = rng.sample(range(5_000), 1_000)
+        batch = rng.sample(range(5_000, 10_000), 500) + rng.sample(range(-5_000, 0), 500)
+        expected, tree = AVLTree(), AVLTree()
+        for k in base:
+            expected.insert(k, str(k))
+            tree.insert(k, str(k))
+        expected_count = sum(expected.insert(k, str(k)) for k in sorted(batch))
+        self.assertEqual(tree.insert_many((k, str(k)) for k in batch), expected_count)
+        self.assertEqual(tree.avl_to_array(), expected.avl_to_array())
+        self.assertEqual(tree.get_max_node().key, 9_999 if 9_999 in batch else max(batch + base))
+        self.assertEqual(tree.size(), 2_000)
+        assert_avl_invariants(self, tree)
+
+    def test_insert_many_interleaved_with_existing_keys(self):
+        tree = AVLTree()
+        for k in range(0, 400, 2):
+            tree.insert(k, str(k))
+        tree.insert_many([(k, str(k)) for k in range(399, 0, -2)])
+        self.assertEqual(tree.avl_to_array(), [(k, str(k)) for k in range(400)])
+        assert_avl_invariants(self, tree)
+
+    def test_insert_many_into_empty_tree_bulk_loads(self):
+        tree = AVLTree()
+        self.assertEqual(tree.insert_many([(3, "c"), (1, "a"), (2, "b")]), 0)
+        self.assertEqual(tree.avl_to_array(), [(1, "a"), (2, "b"), (3, "c")])
+        self.assertEqual(tree.get_max_node().key, 3)
+        assert_avl_invariants(self, tree)
+
+    def test_delete_many_matches_sorted_single_deletes(self):
+        rng = random.Random(2)
+        keys = rng.sample(range(10_000), 2_000)
+        expected, tree = AVLTree(), AVLTree()
+        for k in keys:
+            expected.insert(k, str(k))
+            tree.insert(k, str(k))
+        doomed = rng.sample(keys, 1_200) + [-1, 10_001]
+        expected_count = sum(expected.delete(expected.search(k)) for k in sorted(doomed))
+        self.assertEqual(tree.delete_many(doomed), expected_count)
+        self.assertEqual(tree.avl_to_array(), expected.avl_to_array())
+        self.assertEqual(tree.get_max_node().key, expected.get_max_node().key)
+        self.assertEqual(tree.size(), 800)
+        assert_avl_invariants(self, tree)
+
+    def test_delete_many_everything(self):
+        tree = AVLTree()
+        tree.insert_many((k, str(k)) for k in range(100))
+        tree.delete_many(range(100))
+        self.assertIsNone(tree.get_root())
+        self.assertEqual(tree.size(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
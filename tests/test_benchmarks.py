@@ -0,0 +1,113 @@
+import unittest
+import os
+import random
+import sys
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from avl_tree import AVLTree
+from benchmarks import runner, workloads
+
+
+def count_inversions(perm):
+    return sum(1 for i in range(len(perm)) for j in range(i + 1, len(perm)) if perm[i] > perm[j])
+
+
+def merge_count(perm):
+    """(sorted perm, inversions) in O(n log n)."""
+    if len(perm) < 2:
+        return perm, 0
+    mid = len(perm) // 2
+    left, a = merge_count(perm[:mid])
+    right, b = merge_count(perm[mid:])
+    merged, count, i, j = [], a + b, 0, 0
+    while i < len(left) and j < len(right):
+        if left[i] <= right[j]:
+            merged.append(left[i])
+            i += 1
+        else:
+            merged.append(right[j])
+            j += 1
+            count += len(left) - i
+    return merged + left[i:] + right[j:], count
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_k_inversions_is_exact(self):
+        for n in (1, 2, 7, 20):
+            for k in range(n * (n - 1) // 2 + 1):
+                perm = workloads.k_inversions(n, k)
+                self.assertEqual(sorted(perm), list(range(n)))
+                self.assertEqual(count_inversions(perm), k)
+        with self.assertRaises(ValueError):
+            workloads.k_inversions(4, 7)
+
+    def test_k_inversions_large(self):
+        rng = random.Random(22)
+        n = 5_000
+        for k in (1, n * (n - 1) // 2 - 1, rng.randrange(n * (n - 1) // 2)):
+            ordered, count = merge_count(workloads.k_inversions(n, k))
+            self.assertEqual(ordered, list(range(n)))
+            self.assertEqual(count, k)
+
+    def test_fibonacci_order_builds_tallest_tree_without_rotations(self):
+        for n, height in ((1, 0), (4, 2), (12, 4), (33, 6), (1_000, 13)):
+            keys = workloads.fibonacci_order(n)
+            self.assertEqual(sorted(keys), list(range(n)))
+            tree = AVLTree()
+            stats = tree.enable_stats()
+            for key in keys:
+                tree.insert(key, None)
+            self.assertEqual(tree.get_root().height, height)
+            self.assertEqual(sum(stats.rotations.values()), 0)
+
+    def test_other_generators(self):
+        self.assertEqual(workloads.zigzag(5), [0, 4, 1, 3, 2])
+        keys = workloads.clustered(100, clusters=3, gap=1_000)
+        self.assertEqual(len(set(keys)), 100)
+        self.assertEqual(sorted({k // 1_000 for k in keys}), [0, 1, 2])
+        for name, generate in workloads.WORKLOADS.items():
+            self.assertEqual(len(set(generate(257))), 257, name)
+
+    def test_summary_statistics(self):
+        summary = runner.summarize([5.0, 1.0, 3.0, 2.0, 4.0])
+        self.assertEqual(summary["median"], 3.0)
+        self.assertAlmostEqual(summary["p10"], 1.4)
+        self.assertAlmostEqual(summary["p90"], 4.6)
+        self.assertEqual((summary["min"], summary["max"]), (1.0, 5.0))
+        self.assertEqual(runner.summarize([2.0])["p90"], 2.0)
+
+    def test_measure_discards_warmup(self):
+        calls = []
+        summary = runner.measure(lambda state: calls.append(state), setup=lambda: "s", repeats=3, warmup=2)
+        self.assertEqual(calls, ["s"] * 5)
+        self.assertEqual(len(summary["runs"]), 3)
+
+    def test_suite_report_round_trip_and_compare(self):
+        report = runner.run_suite([50], repeats=2, warmup=0, starts=("root", "finger"), log=None)
+        self.assertIn("insert/random/n=50", report["results"])
+        self.assertIn("search[start=finger]/k_inversions/n=50", report["results"])
+        self.assertNotIn("delete[start=finger]/sorted/n=50", report["results"])
+        handle, path = tempfile.mkstemp(suffix=".json")
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+        runner.save_report(report, path)
+        baseline = runner.load_report(path)
+        self.assertEqual(runner.compare(baseline, report), ([], []))
+        slower = {"results": {name: dict(s, median=s["median"] * 2) for name, s in report["results"].items()}}
+        regressions, improvements = runner.compare(baseline, slower, threshold=0.5)
+        self.assertEqual(len(regressions), len(report["results"]))
+        self.assertEqual(improvements, [])
+
+    def test_memory_suite(self):
+        report = runner.run_memory_suite([2_000], workloads=("random",), log=None)
+        result = report["results"]["memory/random/n=2000"]
+        self.assertEqual(result["report"]["node_count"], 2_000)
+        # tracemalloc sees the nodes, keys and values the tree holds, and little else
+        self.assertGreater(result["bytes"], result["report"]["node_bytes"])
+        self.assertLess(result["bytes"], 2 * result["report"]["total_bytes"])
+        self.assertEqual(runner.compare(report, report, metric="bytes"), ([], []))
+
+
+if __name__ == '__main__':
+    unittest.main()
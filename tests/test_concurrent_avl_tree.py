@@ -0,0 +1,111 @@
+import unittest
+import threading
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from concurrent_avl_tree import ConcurrentAVLTree, ReadWriteLock
+
+
+class TestReadWriteLock(unittest.TestCase):
+
+    def test_readers_share_the_lock(self):
+        lock = ReadWriteLock()
+        both_inside = threading.Barrier(2, timeout=5)
+
+        def reader():
+            with lock.read_locked():
+                both_inside.wait()
+
+        threads = [threading.Thread(target=reader) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertFalse(both_inside.broken)
+
+    def test_writer_excludes_readers(self):
+        lock = ReadWriteLock()
+        events = []
+        lock.acquire_write()
+        reader = threading.Thread(target=lambda: (lock.acquire_read(), events.append("read"), lock.release_read()))
+        reader.start()
+        reader.join(0.1)
+        events.append("write done")
+        lock.release_write()
+        reader.join()
+        self.assertEqual(events, ["write done", "read"])
+
+
+class TestConcurrentAVLTree(unittest.TestCase):
+
+    def test_parallel_writers_and_readers(self):
+        tree = ConcurrentAVLTree()
+        errors = []
+
+        def writer(base):
+            for k in range(base, base + 500):
+                tree.insert(k, str(k))
+            for k in range(base, base + 500, 2):
+                tree.delete_key(k)
+
+        def reader():
+            try:
+                for _ in range(200):
+                    keys = [k for k, _ in tree.items()]
+                    if keys != sorted(keys):
+                        errors.append(keys)
+                    tree.get(250)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(b,)) for b in range(0, 2_000, 500)]
+        threads += [threading.Thread(target=reader) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+        self.assertEqual([k for k, _ in tree.avl_to_array()], list(range(1, 2_000, 2)))
+        self.assertEqual(tree.size(), 1_000)
+        self.assertEqual(tree.get(7), "7")
+        self.assertIsNone(tree.get(8))
+
+    def test_reads_leave_the_tree_alone(self):
+        tree = ConcurrentAVLTree()
+        tree.insert_many((k, str(k)) for k in range(100))
+        finger = tree.tree.finger
+        self.assertEqual(tree.search(3).key, 3)
+        self.assertEqual(tree.get(70), "70")
+        self.assertIsNone(tree.get(100))
+        self.assertIs(tree.tree.finger, finger)
+
+    def test_side_effecting_reads_take_the_write_lock(self):
+        tree = ConcurrentAVLTree()
+        tree.insert_many((k, str(k)) for k in range(100))
+        stats = tree.tree.enable_stats()
+        left, _ = tree.tree.split(50)
+        tree.tree = left
+        left.stats = stats
+        self.assertTrue(left._balanced_stale)
+        # a reader holds the lock, so only the reads that keep to it can finish
+        tree.lock.acquire_read()
+        results = {}
+        threads = [threading.Thread(target=lambda name=name, read=read: results.__setitem__(name, read()))
+                   for name, read in (("rank", lambda: tree.rank(10)), ("search", lambda: tree.get(10)),
+                                      ("balance", tree.get_amir_balance_factor))]
+        for t in threads:
+            t.start()
+        threads[0].join(5)
+        threads[1].join(0.1)
+        self.assertEqual(results, {"rank": 10})
+        tree.lock.release_read()
+        for t in threads:
+            t.join()
+        self.assertEqual(results["search"], "10")
+        self.assertEqual(stats.operations["search"], 1)
+        self.assertFalse(left._balanced_stale)
+        self.assertEqual(results["balance"], left.get_amir_balance_factor())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from avl_tree import AVLTree
+from durable_avl_tree import DurableAVLTree
+
+
+class TestDurableAVLTree(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def open(self, **kwargs):
+        kwargs.setdefault("fsync", False)
+        return DurableAVLTree(self.directory, **kwargs)
+
+    def wal_paths(self):
+        return sorted(os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                      if name.startswith("wal-"))
+
+    def test_reopen_replays_log(self):
+        rng = random.Random(14)
+        expected = AVLTree()
+        with self.open(group_size=64) as durable:
+            for k in rng.sample(range(10 ** 6), 1_000):
+                durable.insert(k, f"v{k}")
+                expected.insert(k, f"v{k}")
+            for k, _ in expected.avl_to_array()[::3]:
+                durable.delete_key(k)
+                expected.delete(expected.search(k))
+            durable.delete_key(-1)
+        with self.open() as reopened:
+            self.assertEqual(reopened.avl_to_array(), expected.avl_to_array())
+            self.assertEqual(reopened.size(), expected.size())
+
+    def test_values_of_any_type(self):
+        with self.open() as durable:
+            durable.insert(1, None)
+            durable.insert(2, {"a": [1, 2]})
+            durable.insert(3, "naïve")
+        with self.open() as reopened:
+            self.assertEqual(reopened.avl_to_array(), [(1, None), (2, {"a": [1, 2]}), (3, "naïve")])
+
+    def test_uncommitted_group_is_lost_torn_tail_ignored(self):
+        durable = self.open(group_size=10, max_delay=None)
+        for k in range(25):
+            durable.insert(k, "v")
+        # simulate a crash: the 5 buffered records never reach the log, and a torn write does
+        durable._log.write(b"\x01\x02\x03 torn")
+        durable._log.close()
+        with self.open() as reopened:
+            self.assertEqual([k for k, _ in reopened.avl_to_array()], list(range(20)))
+            reopened.insert(100, "after")
+        with self.open() as again:
+            self.assertEqual(again.size(), 21)
+            self.assertIsNotNone(again.search(100))
+
+    def test_idle_group_is_flushed_after_max_delay(self):
+        with self.open(max_delay=0.01) as durable:
+            durable.insert(1, "v")
+            path = self.wal_paths()[0]
+            deadline = time.monotonic() + 5
+            while os.path.getsize(path) == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertGreater(os.path.getsize(path), 0)
+            self.assertEqual(durable._buffered, 0)
+
+    def test_checkpoint_truncates_log(self):
+        with self.open() as durable:
+            for k in range(500):
+                durable.insert(k, "v")
+            durable.checkpoint()
+            self.assertEqual([os.path.getsize(p) for p in self.wal_paths()], [0])
+            durable.delete_key(0)
+            durable.insert(1000, "w")
+        with self.open() as reopened:
+            self.assertEqual(reopened.size(), 500)
+            self.assertIsNone(reopened.search(0))
+            self.assertEqual(reopened.search(1000).value, "w")
+
+    def test_crash_during_checkpoint_does_not_replay_twice(self):
+        durable = self.open()
+        for k in range(100):
+            durable.insert(k, "v")
+        durable.commit()
+        old_log = self.wal_paths()[0]
+        with open(old_log, "rb") as f:
+            old_records = f.read()
+        durable.checkpoint()
+        durable.close()
+        # the snapshot was written but the crash came before the old log was removed
+        with open(old_log, "wb") as f:
+            f.write(old_records)
+        with self.open() as reopened:
+            self.assertEqual(reopened.size(), 100)
+
+    def test_automatic_checkpoints(self):
+        with self.open(checkpoint_every=100) as durable:
+            for k in range(350):
+                durable.insert(k, "v")
+        names = os.listdir(self.directory)
+        self.assertEqual(sum(name.startswith("snapshot-") for name in names), 1)
+        with self.open() as reopened:
+            self.assertEqual(reopened.size(), 350)
+
+
+if __name__ == '__main__':
+    unittest.main()
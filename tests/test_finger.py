@@ -0,0 +1,73 @@
+import unittest
+import random
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from avl_tree import AVLTree
+
+
+def jittered(n, window, seed):
+    rng = random.Random(seed)
+    keys = list(range(n))
+    for i in range(0, n - window, window // 2):
+        chunk = keys[i:i + window]
+        rng.shuffle(chunk)
+        keys[i:i + window] = chunk
+    return keys
+
+
+class TestFingerSearch(unittest.TestCase):
+
+    def test_finger_inserts_build_the_same_tree_as_root_inserts(self):
+        for keys in (jittered(2_000, 16, 3), random.Random(4).sample(range(2_000), 2_000), list(range(500, 0, -1))):
+            by_root, by_finger, by_max = AVLTree(), AVLTree(), AVLTree()
+            for k in keys:
+                expected = by_root.insert(k, str(k))
+                self.assertEqual(by_finger.insert(k, str(k), "finger"), expected)
+                self.assertEqual(by_max.insert(k, str(k), "max"), expected)
+            self.assertEqual(by_finger.avl_to_array(), by_root.avl_to_array())
+            self.assertEqual(by_finger.get_root().key, by_root.get_root().key)
+            self.assertEqual(by_max.get_root().key, by_root.get_root().key)
+
+    def test_search_from_finger_and_from_handle(self):
+        tree = AVLTree()
+        for k in jittered(1_000, 10, 5):
+            tree.insert(k, str(k), "finger")
+        handle = tree.search(400)
+        for k in range(0, 1_000, 7):
+            self.assertEqual(tree.search(k, start="finger").value, str(k))
+            self.assertEqual(tree.search(k, start=handle).value, str(k))
+            self.assertEqual(tree.search(k, start="max").value, str(k))
+        self.assertIsNone(tree.search(1_500, start="finger"))
+        self.assertIsNone(tree.search(-1, start=handle))
+
+    def test_finger_follows_last_touched_node(self):
+        tree = AVLTree()
+        for k in (10, 5, 15):
+            tree.insert(k, str(k))
+        self.assertEqual(tree.finger.key, 15)
+        tree.search(5)
+        self.assertEqual(tree.finger.key, 5)
+        tree.delete(tree.search(5))
+        self.assertTrue(tree.finger.is_real_node())
+        self.assertEqual(tree.finger.key, 10)
+
+    def test_stale_handle_falls_back_to_root(self):
+        tree = AVLTree()
+        for k in range(50):
+            tree.insert(k, str(k))
+        stale = tree.search(49)
+        tree.delete(stale)
+        tree.insert(60, "60", start=stale)
+        self.assertEqual(tree.search(60, start=stale).value, "60")
+        self.assertEqual([k for k, _ in tree.avl_to_array()], list(range(49)) + [60])
+
+    def test_rejects_unknown_start(self):
+        tree = AVLTree()
+        tree.insert(1, "a")
+        with self.assertRaises(ValueError):
+            tree.insert(2, "b", start="middle")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from avl_tree import AVLTree
+from avl_invariants import assert_avl_invariants
+
+
+class TestFromSorted(unittest.TestCase):
+
+    def _check(self, tree, n):
+        assert_avl_invariants(self, tree)
+        self.assertEqual(tree.size(), n)
+
+    def test_builds_balanced_tree_for_every_small_size(self):
+        for n in range(0, 70):
+            tree = AVLTree.from_sorted((k, str(k)) for k in range(n))
+            self._check(tree, n)
+            self.assertEqual(tree.avl_to_array(), [(k, str(k)) for k in range(n)])
+            if n:
+                self.assertEqual(tree.get_max_node().key, n - 1)
+            else:
+                self.assertIsNone(tree.get_root())
+
+    def test_tree_stays_usable_after_bulk_load(self):
+        tree = AVLTree.from_sorted((k, str(k)) for k in range(0, 200, 2))
+        for k in range(1, 200, 2):
+            tree.insert(k, str(k), "max")
+        for k in range(0, 200, 4):
+            tree.delete(tree.search(k))
+        self._check(tree, 150)
+        self.assertEqual(tree.get_max_node().key, 199)
+
+    def test_consumes_generator_once(self):
+        consumed = []
+
+        def gen():
+            for k in range(10):
+                consumed.append(k)
+                yield k, str(k)
+
+        tree = AVLTree.from_sorted(gen())
+        self.assertEqual(consumed, list(range(10)))
+        self.assertEqual(tree.size(), 10)
+
+    def test_rejects_unsorted_input(self):
+        with self.assertRaises(ValueError):
+            AVLTree.from_sorted([(1, "a"), (3, "c"), (2, "b")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import os
+import random
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from interval_tree import IntervalTree
+from avl_invariants import assert_avl_invariants
+
+
+def brute_overlap(intervals, lo, hi):
+    return sorted((iv, val) for iv, val in intervals if iv[0] <= hi and iv[1] >= lo)
+
+
+class TestIntervalTree(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(19)
+        self.intervals = []
+        for i in range(1_500):
+            lo = rng.randrange(10_000)
+            self.intervals.append(((lo, lo + rng.randrange(300)), f"r{i}"))
+        self.tree = IntervalTree()
+        for iv, val in self.intervals:
+            self.tree.insert(iv, val)
+
+    def assert_max_end(self, node):
+        if not node.is_real_node():
+            return -1
+        expected = max(node.key[1], self.assert_max_end(node.left), self.assert_max_end(node.right))
+        self.assertEqual(node.max_end, expected)
+        return expected
+
+    def test_overlap_and_stab_match_scan(self):
+        rng = random.Random(20)
+        for _ in range(200):
+            lo = rng.randrange(-100, 10_400)
+            hi = lo + rng.randrange(50)
+            self.assertEqual(sorted(self.tree.overlap(lo, hi)), brute_overlap(self.intervals, lo, hi))
+        self.assertEqual(sorted(self.tree.stab(5_000)), brute_overlap(self.intervals, 5_000, 5_000))
+        self.assertEqual(self.tree.overlap(20_000, 30_000), [])
+        self.assertEqual(self.tree.max_end(), max(iv[1] for iv, _ in self.intervals))
+
+    def test_max_end_maintained_through_deletes_and_rotations(self):
+        for iv, _ in self.intervals[::2]:
+            self.tree.delete(self.tree.search(iv))
+        remaining = self.intervals[1::2]
+        self.assert_max_end(self.tree.get_root())
+        assert_avl_invariants(self, self.tree)
+        self.assertEqual(sorted(self.tree.overlap(4_000, 4_100)), brute_overlap(remaining, 4_000, 4_100))
+
+    def test_bulk_split_join(self):
+        tree = IntervalTree.from_sorted(sorted(self.intervals))
+        self.assert_max_end(tree.get_root())
+        left, right = tree.split((5_000, 5_000))
+        self.assert_max_end(left.get_root())
+        self.assert_max_end(right.get_root())
+        self.assertEqual(sorted(right.stab(5_100)), brute_overlap(
+            [(iv, v) for iv, v in self.intervals if iv >= (5_000, 5_000)], 5_100, 5_100))
+        left.join((5_000, 5_000), right)
+        self.assert_max_end(left.get_root())
+        self.assertEqual(left.size(), len(self.intervals) + 1)
+
+    def test_rejects_bad_input(self):
+        with self.assertRaises(ValueError):
+            self.tree.insert((5, 4), "backwards")
+        with self.assertRaises(ValueError):
+            IntervalTree(key=abs)
+        self.assertIsNone(IntervalTree().max_end())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import random
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from avl_tree import AVLTree
+
+
+class TestIterators(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(21)
+        self.keys = sorted(rng.sample(range(0, 2_000, 2), 400))
+        self.tree = AVLTree()
+        for k in rng.sample(self.keys, len(self.keys)):
+            self.tree.insert(k, str(k))
+
+    def test_full_iteration(self):
+        expected = [(k, str(k)) for k in self.keys]
+        self.assertEqual(list(self.tree.items()), expected)
+        self.assertEqual(self.tree.avl_to_array(), expected)
+        self.assertEqual(list(self.tree), self.keys)
+        self.assertEqual(list(self.tree.keys()), self.keys)
+        self.assertEqual(list(reversed(self.tree)), self.keys[::-1])
+        self.assertEqual(list(self.tree.reversed()), expected[::-1])
+
+    def test_range_scans(self):
+        rng = random.Random(22)
+        for _ in range(100):
+            lo, hi = sorted(rng.randint(-10, 2_010) for _ in range(2))
+            expected = [(k, str(k)) for k in self.keys if lo <= k <= hi]
+            self.assertEqual(list(self.tree.items(lo, hi)), expected)
+            self.assertEqual(list(self.tree.reversed(lo, hi)), expected[::-1])
+        self.assertEqual(list(self.tree.items(lo=self.keys[-1] + 1)), [])
+        self.assertEqual(list(self.tree.items(hi=self.keys[0] - 1)), [])
+        self.assertEqual(list(self.tree.items(hi=self.keys[2])), [(k, str(k)) for k in self.keys[:3]])
+
+    def test_scans_are_lazy(self):
+        scan = self.tree.items(self.keys[10])
+        self.assertEqual(next(scan), (self.keys[10], str(self.keys[10])))
+        self.assertEqual(next(scan), (self.keys[11], str(self.keys[11])))
+
+    def test_inorder_collect_of_subtree(self):
+        result = []
+        root = self.tree.get_root()
+        self.tree.inorder_collect(root.left, result)
+        self.assertEqual([k for k, _ in result], [k for k in self.keys if k < root.key])
+
+    def test_empty_tree(self):
+        tree = AVLTree()
+        self.assertEqual(list(tree), [])
+        self.assertEqual(list(tree.items(0, 10)), [])
+        self.assertEqual(list(tree.reversed()), [])
+        self.assertEqual(tree.avl_to_array(), [])
+
+    def test_deep_tree_without_recursion_limit(self):
+        tree = AVLTree.from_sorted((k, None) for k in range(200_000))
+        self.assertEqual(sum(1 for _ in tree), 200_000)
+
+
+if __name__ == "__main__":
+    unittest.main()
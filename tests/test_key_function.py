@@ -0,0 +1,65 @@
+import unittest
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+from functools import cmp_to_key
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from avl_tree import AVLTree
+from avl_invariants import assert_avl_invariants
+
+
+class TestKeyFunction(unittest.TestCase):
+
+    def test_case_insensitive_strings(self):
+        tree = AVLTree(key=str.lower)
+        for word in ["banana", "Apple", "cherry", "date", "Elder"]:
+            tree.insert(word, word.upper())
+        self.assertEqual(list(tree), ["Apple", "banana", "cherry", "date", "Elder"])
+        self.assertEqual(tree.search("APPLE").key, "Apple")
+        self.assertEqual(tree.search("elder", start="finger").value, "ELDER")
+        self.assertIsNone(tree.search("fig"))
+        self.assertEqual(tree.rank("C"), 2)
+        self.assertEqual(tree.count_range("B", "D"), 2)
+        self.assertEqual([k for k, _ in tree.items("BANANA", "Date")], ["banana", "cherry", "date"])
+        tree.delete(tree.search("CHERRY"))
+        self.assertEqual(list(tree), ["Apple", "banana", "date", "Elder"])
+
+    def test_descending_timestamps_keep_invariants(self):
+        base = datetime(2024, 1, 1)
+        stamps = [base + timedelta(minutes=m) for m in random.Random(17).sample(range(10 ** 5), 500)]
+        tree = AVLTree(key=lambda stamp: -stamp.timestamp())
+        tree.insert_many((stamp, None) for stamp in stamps)
+        for stamp in stamps[:100]:
+            tree.insert(stamp + timedelta(seconds=1), None, start="max")
+        tree.delete_many(stamps[100:200])
+        expected = sorted(stamps[:100] + [s + timedelta(seconds=1) for s in stamps[:100]] + stamps[200:], reverse=True)
+        self.assertEqual(list(tree), expected)
+        self.assertEqual(tree.get_max_node().key, expected[-1])
+        assert_avl_invariants(self, tree)
+
+    def test_bulk_split_join_and_comparator(self):
+        by_second = cmp_to_key(lambda a, b: (a[1] > b[1]) - (a[1] < b[1]))
+        pairs = [((i, 100 - i), str(i)) for i in range(100)]
+        tree = AVLTree.from_sorted(reversed(pairs), key=by_second)
+        self.assertEqual(tree.search((7, 93)).value, "7")
+        with self.assertRaises(ValueError):
+            AVLTree.from_sorted(pairs, key=by_second)
+        left, right = tree.split((50, 50))
+        self.assertEqual(left.size(), 49)
+        self.assertEqual(next(iter(right))[1], 50)
+        left.join((0, 50), right, "mid")
+        self.assertEqual(left.size(), 101)
+        with self.assertRaises(ValueError):
+            left.join((0, 0), AVLTree(key=by_second))
+
+    def test_save_refuses_key_function_trees(self):
+        tree = AVLTree(key=lambda k: -k)
+        for k in range(5):
+            tree.insert(k, str(k))
+        with self.assertRaises(ValueError):
+            tree.save(os.devnull)
+
+
+if __name__ == '__main__':
+    unittest.main()
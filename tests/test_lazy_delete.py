@@ -0,0 +1,174 @@
+import unittest
+import os
+import random
+import sys
+import threading
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from avl_tree import AVLTree
+from concurrent_avl_tree import ConcurrentAVLTree
+from avl_invariants import assert_avl_invariants
+
+
+class TestLazyDelete(unittest.TestCase):
+
+    def setUp(self):
+        self.keys = list(range(1_000))
+        random.Random(24).shuffle(self.keys)
+        self.tree = AVLTree(lazy_delete=True)
+        for key in self.keys:
+            self.tree.insert(key, str(key))
+
+    def assert_live_sizes(self, tree):
+        """subtree_size of every node counts the live keys below it, tombstones excluded."""
+        def live_below(node):
+            if not node.is_real_node():
+                return 0
+            count = live_below(node.left) + live_below(node.right) + (tree.search(node.key) is node)
+            self.assertEqual(node.subtree_size, count, f"subtree_size mismatch at key {node.key}")
+            return count
+        live_below(tree.root)
+
+    def test_delete_tombstones_without_rotations(self):
+        root, height = self.tree.get_root(), self.tree.get_root().height
+        for key in self.keys[:400]:
+            self.assertEqual(self.tree.delete(self.tree.search(key)), 0)
+        # below the default ratio nothing is unlinked
+        self.assertIs(self.tree.get_root(), root)
+        self.assertEqual(self.tree.get_root().height, height)
+        self.assertEqual(self.tree.node_count(), 1_000)
+        self.assertEqual(self.tree.size(), 600)
+        live = sorted(self.keys[400:])
+        self.assertEqual(self.tree.avl_to_array(), [(k, str(k)) for k in live])
+        self.assertEqual(list(self.tree.reversed()), [(k, str(k)) for k in reversed(live)])
+        self.assertEqual(list(self.tree.items(100, 200)), [(k, str(k)) for k in live if 100 <= k <= 200])
+        self.assertIsNone(self.tree.search(self.keys[0]))
+        self.assertEqual(self.tree.get_max_node().key, live[-1])
+        self.assertEqual(self.tree.delete(self.tree.search(self.keys[0])), 0)
+        self.assertEqual(self.tree.size(), 600)
+
+    def test_compaction_at_ratio(self):
+        for key in self.keys[:499]:
+            self.tree.delete(self.tree.search(key))
+        self.assertEqual(self.tree.node_count(), 1_000)
+        self.tree.delete(self.tree.search(self.keys[499]))
+        self.assertEqual(self.tree.node_count(), 500)
+        self.assertEqual(self.tree.size(), 500)
+        self.assertEqual(self.tree.get_root().height, 8)
+        assert_avl_invariants(self, self.tree)
+        self.assertEqual(list(self.tree), sorted(self.keys[500:]))
+        for key in self.keys[500:]:
+            self.tree.delete(self.tree.search(key))
+        self.assertEqual(self.tree.size(), 0)
+        self.assertIsNone(self.tree.get_root())
+
+    def test_insert_revives_tombstone(self):
+        node = self.tree.search(7)
+        self.tree.delete(node)
+        self.assertEqual(self.tree.insert(7, "again"), 0)
+        self.assertIs(self.tree.search(7), node)
+        self.assertEqual(node.value, "again")
+        self.assertEqual(self.tree.size(), 1_000)
+        self.assertEqual(self.tree.node_count(), 1_000)
+
+    def test_order_statistics_skip_tombstones(self):
+        for key in range(0, 1_000, 3):
+            self.tree.delete(self.tree.search(key))
+        live = [k for k in range(1_000) if k % 3]
+        for key in (-1, 0, 1, 2, 3, 500, 998, 999, 1_000):
+            self.assertEqual(self.tree.rank(key), sum(1 for k in live if k < key))
+        self.assertEqual([self.tree.select(i).key for i in range(len(live))], live)
+        self.assertIsNone(self.tree.select(len(live)))
+        self.assertEqual(self.tree.count_range(100, 199), sum(1 for k in live if 100 <= k <= 199))
+        # answered without compacting: these are reads
+        self.assertEqual(self.tree.node_count(), 1_000)
+        self.assert_live_sizes(self.tree)
+        self.tree.insert(3, "back")
+        self.assert_live_sizes(self.tree)
+        self.assertEqual(self.tree.rank(4), 3)
+        self.assertEqual(self.tree.select(2).key, 3)
+
+    def test_concurrent_rank_reads(self):
+        tree = AVLTree(lazy_delete=True, compact_ratio=1.0)
+        for key in range(3_000):
+            tree.insert(key, str(key))
+        for key in range(0, 3_000, 2):
+            tree.delete(tree.search(key))
+        shared = ConcurrentAVLTree(tree)
+        ranks = []
+        threads = [threading.Thread(target=lambda: ranks.append(shared.rank(1_500))) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(ranks, [750] * 4)
+        assert_avl_invariants(self, tree)
+        self.assertEqual([k for k, _ in shared.avl_to_array()], list(range(1, 3_000, 2)))
+
+    def test_batches_revive_without_compacting(self):
+        root = self.tree.get_root()
+        self.tree.delete(self.tree.search(10))
+        self.tree.delete(self.tree.search(20))
+        self.tree.insert_many([(20, "x"), (1_500, "y"), (-1, "z")])
+        # one tombstone is revived, the other stays; only the new keys are linked
+        self.assertIs(self.tree.get_root(), root)
+        self.assertEqual(self.tree.node_count(), 1_002)
+        self.assertEqual(self.tree.size(), 1_001)
+        self.assertEqual(self.tree.search(20).value, "x")
+        self.assertIsNone(self.tree.search(10))
+        assert_avl_invariants(self, self.tree)
+        self.assert_live_sizes(self.tree)
+
+    def test_join_carries_tombstones(self):
+        left, right = AVLTree(lazy_delete=True), AVLTree(lazy_delete=True)
+        left.insert_many((k, str(k)) for k in range(100))
+        right.insert_many((k, str(k)) for k in range(101, 200))
+        left.delete(left.search(50))
+        right.delete(right.search(150))
+        left.join(100, right, "mid")
+        self.assertEqual(left.node_count(), 200)
+        self.assertEqual(left.size(), 198)
+        self.assertEqual(list(left), [k for k in range(200) if k not in (50, 150)])
+        left.insert(150, "back")
+        self.assertEqual(left.size(), 199)
+        assert_avl_invariants(self, left)
+        self.assert_live_sizes(left)
+        # a deleted maximum at or above the join key would end up on the wrong side of it
+        left.delete(left.search(199))
+        right = AVLTree(lazy_delete=True)
+        right.insert(300, "r")
+        left.join(199, right)
+        self.assertEqual(left.node_count(), 200)
+        self.assertEqual(list(left)[-3:], [198, 199, 300])
+        assert_avl_invariants(self, left)
+
+    def test_split_join_and_batches(self):
+        self.tree.delete_many(range(0, 1_000, 2))
+        self.tree.insert_many((k, str(k)) for k in range(0, 100, 2))
+        left, right = self.tree.split(500)
+        self.assertEqual(left.size() + right.size(), 550)
+        self.assertEqual(list(right), list(range(501, 1_000, 2)))
+        self.assertTrue(right.lazy_delete)
+        left.join(500, right)
+        assert_avl_invariants(self, left)
+        self.assertEqual(left.size(), 551)
+
+    def test_multimap(self):
+        tree = AVLTree(multi=True, lazy_delete=True, compact_ratio=1)
+        for i in range(30):
+            tree.insert(i % 3, i)
+        tree.discard(1, 1)
+        tree.delete(tree.search(2))
+        self.assertEqual(tree.size(), 19)
+        self.assertEqual(tree.search_all(2), [])
+        tree.insert(2, "x")
+        self.assertEqual(tree.search_all(2), ["x"])
+        self.assertEqual(tree.size(), 20)
+        self.assertEqual(tree.node_count(), 3)
+
+    def test_bad_ratio(self):
+        with self.assertRaises(ValueError):
+            AVLTree(lazy_delete=True, compact_ratio=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
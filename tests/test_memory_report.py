@@ -0,0 +1,44 @@
+import unittest
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from avl_tree import AVLTree, AVLNode
+
+
+class TestMemoryReport(unittest.TestCase):
+
+    def test_attribution(self):
+        tree = AVLTree.from_sorted((k, f"value-{k}") for k in range(1_000, 2_000))
+        report = tree.memory_report()
+        self.assertEqual(report["node_count"], 1_000)
+        self.assertEqual(report["node_bytes"], 1_000 * sys.getsizeof(AVLNode(0, None)))
+        self.assertEqual(report["key_bytes"], sum(sys.getsizeof(k) for k in range(1_000, 2_000)))
+        self.assertEqual(report["value_bytes"], sum(sys.getsizeof(f"value-{k}") for k in range(1_000, 2_000)))
+        self.assertEqual(report["sort_key_bytes"], 0)
+        self.assertEqual(report["total_bytes"], report["node_bytes"] + report["key_bytes"]
+                         + report["value_bytes"] + sys.getsizeof(tree))
+        self.assertAlmostEqual(report["overhead_ratio"],
+                               report["node_bytes"] / (report["key_bytes"] + report["value_bytes"]))
+
+    def test_shared_and_nested_objects(self):
+        shared = "x" * 1_000
+        tree = AVLTree(key=str.lower)
+        for word in ("Alpha", "Beta", "Gamma"):
+            tree.insert(word, shared)
+        report = tree.memory_report()
+        self.assertEqual(report["value_bytes"], sys.getsizeof(shared))
+        self.assertGreater(report["sort_key_bytes"], 0)
+        multi = AVLTree(multi=True)
+        multi.insert(1, "a" * 100)
+        multi.insert(1, "b" * 100)
+        bucket = multi.search(1).value
+        self.assertEqual(multi.memory_report()["value_bytes"],
+                         sys.getsizeof(bucket) + sum(sys.getsizeof(v) for v in bucket))
+
+    def test_empty_tree(self):
+        report = AVLTree().memory_report()
+        self.assertEqual((report["node_count"], report["bytes_per_node"], report["overhead_ratio"]), (0, 0.0, 0.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
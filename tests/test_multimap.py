@@ -0,0 +1,91 @@
+import unittest
+import os
+import random
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from avl_tree import AVLTree
+from avl_invariants import assert_avl_invariants
+
+
+class TestMultimap(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(18)
+        self.events = [(rng.randrange(20), f"e{i}") for i in range(2_000)]
+        self.tree = AVLTree(multi=True)
+        for key, val in self.events:
+            self.tree.insert(key, val)
+
+    def expected(self, key):
+        return [val for k, val in self.events if k == key]
+
+    def test_buckets_keep_one_node_per_key(self):
+        self.assertEqual(self.tree.node_count(), 20)
+        self.assertEqual(self.tree.size(), 2_000)
+        self.assertLessEqual(self.tree.get_root().height, 5)
+        for key in range(20):
+            self.assertEqual(self.tree.search_all(key), self.expected(key))
+        self.assertEqual(self.tree.search_all(99), [])
+        self.assertEqual(self.tree.avl_to_array(), sorted(self.events, key=lambda e: e[0]))
+        self.assertEqual(list(self.tree.reversed(3, 3)), [(3, v) for v in reversed(self.expected(3))])
+        self.assertEqual(self.tree.count_range(0, 9), 10)
+        assert_avl_invariants(self, self.tree)
+
+    def test_discard_and_delete(self):
+        first, second = self.expected(7)[:2]
+        self.tree.discard(7, first)
+        self.assertEqual(self.tree.search_all(7)[0], second)
+        self.assertEqual(self.tree.size(), 1_999)
+        self.assertEqual(self.tree.discard(7, "missing"), 0)
+        self.tree.delete(self.tree.search(7))
+        self.assertEqual(self.tree.search_all(7), [])
+        self.assertEqual(self.tree.size(), 2_000 - len(self.expected(7)))
+        self.assertEqual(self.tree.node_count(), 19)
+        single = AVLTree(multi=True)
+        single.insert(1, "a")
+        single.discard(1, "a")
+        self.assertEqual((single.size(), single.node_count()), (0, 0))
+        with self.assertRaises(ValueError):
+            AVLTree().discard(1, "a")
+
+    def test_bulk_and_split_join(self):
+        ordered = sorted(self.events, key=lambda e: e[0])
+        tree = AVLTree.from_sorted(ordered, multi=True)
+        self.assertEqual(tree.node_count(), 20)
+        self.assertEqual(tree.avl_to_array(), ordered)
+        other = AVLTree(multi=True)
+        other.insert_many(self.events)
+        self.assertEqual(other.avl_to_array(), ordered)
+        left, right = tree.split(10)
+        self.assertEqual(left.size(), sum(1 for k, _ in self.events if k < 10))
+        self.assertEqual(left.size() + right.size(), 2_000)
+        with self.assertRaises(ValueError):
+            left.join(10, right)
+        right.delete(right.search(10))
+        left.join(10, right, "mid")
+        self.assertEqual(left.search_all(10), ["mid"])
+        self.assertEqual(left.size(), 2_001 - len(self.expected(10)))
+
+    def test_subtree_value_counts(self):
+        def check(node):
+            if not node.is_real_node():
+                return 0
+            count = check(node.left) + check(node.right) + len(node.value)
+            self.assertEqual(node.value_count, count)
+            return count
+
+        rng = random.Random(8)
+        for key, val in self.events[:300]:
+            self.tree.discard(key, val)
+        for key in rng.sample(range(20), 5):
+            self.tree.delete(self.tree.search(key))
+        check(self.tree.root)
+        left, right = self.tree.split(9)
+        self.assertEqual(check(left.root), left.size())
+        self.assertEqual(check(right.root), right.size())
+        self.assertEqual(left.size(), sum(len(left.search_all(k)) for k in range(9)))
+        self.assertFalse(hasattr(AVLTree().node_class, "value_count"))
+
+
+if __name__ == '__main__':
+    unittest.main()
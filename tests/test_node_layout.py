@@ -0,0 +1,25 @@
+import unittest
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from avl_tree import AVLNode, VirtualAVLNode, AVLTree
+
+
+class TestNodeLayout(unittest.TestCase):
+
+    def test_nodes_have_no_instance_dict(self):
+        self.assertFalse(hasattr(AVLNode(1, "a"), "__dict__"))
+        self.assertFalse(hasattr(VirtualAVLNode.get_create_instance(), "__dict__"))
+
+    def test_virtual_node_contract_kept(self):
+        tree = AVLTree()
+        tree.insert(1, "a")
+        leaf = tree.search(1)
+        self.assertTrue(leaf.is_real_node())
+        self.assertFalse(leaf.left.is_real_node())
+        self.assertIs(leaf.left, leaf.right)
+        self.assertEqual(leaf.left.height, -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
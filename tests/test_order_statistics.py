@@ -0,0 +1,62 @@
+import unittest
+import bisect
+import random
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from avl_tree import AVLTree
+
+
+class TestOrderStatistics(unittest.TestCase):
+
+    def _assert_sizes(self, node):
+        if not node.is_real_node():
+            return 0
+        size = self._assert_sizes(node.left) + self._assert_sizes(node.right) + 1
+        self.assertEqual(node.subtree_size, size, f"subtree_size mismatch at key {node.key}")
+        return size
+
+    def _assert_queries(self, tree, keys):
+        keys = sorted(keys)
+        self._assert_sizes(tree.root)
+        for probe in range(-2, (keys[-1] if keys else 0) + 3):
+            self.assertEqual(tree.rank(probe), bisect.bisect_left(keys, probe))
+        for i, k in enumerate(keys):
+            self.assertEqual(tree.select(i).key, k)
+        self.assertIsNone(tree.select(len(keys)))
+        self.assertIsNone(tree.select(-1))
+        rng = random.Random(len(keys))
+        for _ in range(50):
+            lo, hi = sorted(rng.randint(-5, len(keys) * 3 + 5) for _ in range(2))
+            expected = bisect.bisect_right(keys, hi) - bisect.bisect_left(keys, lo)
+            self.assertEqual(tree.count_range(lo, hi), expected)
+        self.assertEqual(tree.count_range(5, 4), 0)
+
+    def test_queries_through_inserts_and_deletes(self):
+        rng = random.Random(11)
+        keys = rng.sample(range(3_000), 600)
+        tree = AVLTree()
+        for k in keys:
+            tree.insert(k, str(k), "max")
+        self._assert_queries(tree, keys)
+        for k in keys[:350]:
+            tree.delete(tree.search(k))
+        self._assert_queries(tree, keys[350:])
+
+    def test_queries_after_bulk_operations(self):
+        tree = AVLTree.from_sorted((k, str(k)) for k in range(0, 500, 5))
+        self._assert_queries(tree, range(0, 500, 5))
+        tree.insert_many((k, str(k)) for k in range(1, 500, 5))
+        tree.delete_many(range(0, 500, 10))
+        expected = sorted(set(range(0, 500, 5)) - set(range(0, 500, 10)) | set(range(1, 500, 5)))
+        self._assert_queries(tree, expected)
+
+    def test_empty_tree(self):
+        tree = AVLTree()
+        self.assertEqual(tree.rank(3), 0)
+        self.assertIsNone(tree.select(0))
+        self.assertEqual(tree.count_range(0, 10), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import random
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from avl_tree import AVLTree
+from persistent_avl_tree import PersistentAVLTree
+
+
+class TestPersistentAVLTree(unittest.TestCase):
+
+    def _check(self, node):
+        """Returns (height, size, balanced) and asserts the stored fields and the AVL property."""
+        if node is None:
+            return -1, 0, 0
+        lh, ls, lb = self._check(node.left)
+        rh, rs, rb = self._check(node.right)
+        self.assertLessEqual(abs(lh - rh), 1)
+        self.assertEqual(node.height, max(lh, rh) + 1)
+        self.assertEqual(node.subtree_size, ls + rs + 1)
+        self.assertEqual(node.balanced_count, lb + rb + (lh == rh))
+        if node.left is not None:
+            self.assertLess(node.left.key, node.key)
+        if node.right is not None:
+            self.assertGreater(node.right.key, node.key)
+        return node.height, node.subtree_size, node.balanced_count
+
+    def test_old_versions_are_unchanged(self):
+        rng = random.Random(9)
+        keys = rng.sample(range(5_000), 800)
+        versions = [PersistentAVLTree()]
+        for k in keys:
+            versions.append(versions[-1].insert(k, str(k)))
+        for i in (0, 1, 50, 400, 800):
+            self.assertEqual([k for k, _ in versions[i].avl_to_array()], sorted(keys[:i]))
+            self._check(versions[i].root)
+        current = versions[-1]
+        for k in keys[:500]:
+            current = current.delete(k)
+        self.assertEqual([k for k, _ in current.avl_to_array()], sorted(keys[500:]))
+        self._check(current.root)
+        self.assertEqual(versions[-1].size(), 800)
+        self.assertEqual(versions[-1].search(keys[0]).value, str(keys[0]))
+
+    def test_updates_share_untouched_subtrees(self):
+        tree = PersistentAVLTree.from_sorted((k, str(k)) for k in range(1_023))
+        newer = tree.insert(2_000, "x")
+        self.assertIs(newer.root.left, tree.root.left)
+        self.assertIs(tree.delete(-1), tree)
+
+    def test_matches_mutable_tree_queries(self):
+        mutable = AVLTree()
+        persistent = PersistentAVLTree()
+        for k in random.Random(3).sample(range(300), 300):
+            mutable.insert(k, str(k))
+            persistent = persistent.insert(k, str(k))
+        self.assertEqual(persistent.avl_to_array(), mutable.avl_to_array())
+        self.assertEqual(persistent.get_amir_balance_factor(), mutable.get_amir_balance_factor())
+        self.assertEqual(list(persistent.items(40, 60)), list(mutable.items(40, 60)))
+        snapshot = PersistentAVLTree.from_sorted(mutable.items())
+        self.assertEqual(snapshot.avl_to_array(), mutable.avl_to_array())
+        self._check(snapshot.root)
+
+    def test_empty_tree(self):
+        tree = PersistentAVLTree()
+        self.assertIsNone(tree.get_root())
+        self.assertEqual(tree.size(), 0)
+        self.assertEqual(tree.get_amir_balance_factor(), 0)
+        self.assertIsNone(tree.search(1))
+        self.assertEqual(tree.avl_to_array(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import io
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from avl_tree import AVLTree
+from printree import trepr, write_tree
+
+
+class Node(object):
+    def __init__(self, key, left=None, right=None):
+        self.key, self.left, self.right = key, left, right
+
+
+class TestPrintree(unittest.TestCase):
+
+    def test_small_tree_drawing(self):
+        tree = AVLTree()
+        for k in [5, 3, 8, 1]:
+            tree.insert(k, str(k))
+        self.assertEqual(trepr(tree.root, bykey=True), [
+            "                               5                    ",
+            "                     _________/ |_________          ",
+            "                    3                     8         ",
+            "          _________/ |__               __/ |__      ",
+            "         1              None       None       None  ",
+            "      __/ |__          /    |     /    |     /    | ",
+            "  None       None     #      #   #      #   #      #",
+            " /    |     /    |                                  ",
+            "#      #   #      #                                 ",
+        ])
+
+    def test_max_depth_and_focus(self):
+        tree = AVLTree.from_sorted((k, str(k)) for k in range(100_000))
+        rows = trepr(tree.root, bykey=True, max_depth=3)
+        self.assertEqual(len(rows), 7)
+        self.assertEqual(rows[-1].split(), ["..."] * 8)
+        out = io.StringIO()
+        sys_stdout, sys.stdout = sys.stdout, out
+        try:
+            tree.print_tree_fancily(max_depth=1, focus=25_000)
+        finally:
+            sys.stdout = sys_stdout
+        self.assertEqual(out.getvalue().split(), ["25000", "/", "|", "...", "..."])
+        with self.assertRaises(ValueError):
+            tree.print_tree_fancily(focus=-1)
+
+    def test_deep_tree_does_not_recurse(self):
+        root = None
+        for k in range(sys.getrecursionlimit() + 10):
+            root = Node(k, root, None)
+        out = io.StringIO()
+        rows = write_tree(root, out)
+        self.assertEqual(rows, 2 * (sys.getrecursionlimit() + 10) + 1)
+        self.assertEqual(len(out.getvalue().splitlines()), rows)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import random
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from sharded_avl_tree import ShardedAVLTree
+
+
+class TestShardedAVLTree(unittest.TestCase):
+
+    def setUp(self):
+        self.tree = ShardedAVLTree([100, 200, 300])
+        self.addCleanup(self.tree.close)
+
+    def test_routing_and_merged_output(self):
+        keys = random.Random(1).sample(range(-50, 400), 200)
+        for k in keys[:100]:
+            self.assertGreaterEqual(self.tree.insert(k, str(k)), 0)
+        self.tree.insert_many((k, str(k)) for k in keys[100:])
+        self.assertEqual(self.tree.avl_to_array(), [(k, str(k)) for k in sorted(keys)])
+        self.assertEqual(self.tree.size(), 200)
+        self.assertEqual(self.tree.search(keys[0]).value, str(keys[0]))
+        self.assertIsNone(self.tree.search(10_000))
+        self.assertEqual(self.tree.items(150, 250), [(k, str(k)) for k in sorted(keys) if 150 <= k <= 250])
+
+    def test_deletes(self):
+        self.tree.insert_many((k, str(k)) for k in range(0, 400, 5))
+        self.tree.delete(self.tree.search(105))
+        self.tree.delete_key(200)
+        self.tree.delete_many(range(0, 100, 5))
+        self.assertEqual([k for k, _ in self.tree.avl_to_array()],
+                         [k for k in range(100, 400, 5) if k not in (105, 200)])
+
+    def test_failed_batch_leaves_pipes_in_step(self):
+        self.tree.insert(1, "a")
+        # the lambda cannot be pickled, so no shard is sent anything
+        with self.assertRaises(Exception):
+            self.tree.insert_many([(2, "b"), (150, lambda: 0)])
+        self.assertEqual(self.tree.size(), 1)
+        self.assertEqual(self.tree.items(), [(1, "a")])
+        # a shard's error is raised only after every other shard's reply is read
+        with self.assertRaises(AttributeError):
+            self.tree._call_all([(0, "size", ()), (1, "no_such_method", ()), (2, "size", ())])
+        self.assertEqual(self.tree.avl_to_array(), [(1, "a")])
+        self.assertEqual(self.tree.size(), 1)
+
+    def test_even_ranges(self):
+        with ShardedAVLTree.with_even_ranges(4, 0, 100) as tree:
+            self.assertEqual(tree.boundaries, [25, 50, 75])
+            self.assertEqual(tree.shard_of(24), 0)
+            self.assertEqual(tree.shard_of(25), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
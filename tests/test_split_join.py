@@ -0,0 +1,86 @@
+import unittest
+import random
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from avl_tree import AVLTree
+from avl_invariants import assert_avl_invariants
+
+
+class TestSplitJoin(unittest.TestCase):
+
+    def _assert_valid(self, tree, keys):
+        assert_avl_invariants(self, tree)
+        self.assertEqual([k for k, _ in tree.avl_to_array()], sorted(keys))
+        self.assertEqual(tree.size(), len(keys))
+        if keys:
+            self.assertEqual(tree.get_max_node().key, max(keys))
+            self.assertEqual(tree.root.subtree_size, len(keys))
+        else:
+            self.assertIsNone(tree.get_root())
+
+    def _random_tree(self, keys, seed):
+        tree = AVLTree()
+        for k in random.Random(seed).sample(keys, len(keys)):
+            tree.insert(k, str(k))
+        return tree
+
+    def test_split_at_every_kind_of_key(self):
+        keys = list(range(0, 600, 3))
+        for pivot in (-5, 0, 1, 3, 150, 299, 300, 597, 598, 1_000):
+            tree = self._random_tree(keys, pivot)
+            left, right = tree.split(pivot)
+            self._assert_valid(left, [k for k in keys if k < pivot])
+            self._assert_valid(right, [k for k in keys if k >= pivot])
+            self.assertIsNone(tree.get_root())
+            self.assertEqual(tree.size(), 0)
+
+    def test_split_pieces_stay_usable(self):
+        keys = list(range(300))
+        tree = self._random_tree(keys, 1)
+        tree.enable_stats()
+        left, right = tree.split(120)
+        # the pieces do not share (or inherit) the original tree's collector
+        self.assertIsNone(left.stats)
+        self.assertIsNone(right.stats)
+        left.insert(1_000, "x")
+        right.delete(right.search(200))
+        self.assertEqual(right.rank(250), 250 - 120 - 1)
+        self._assert_valid(left, list(range(120)) + [1_000])
+        self._assert_valid(right, [k for k in range(120, 300) if k != 200])
+
+    def test_join_trees_of_very_different_heights(self):
+        for small, big in ((0, 500), (1, 500), (7, 300), (300, 7), (500, 1), (500, 0), (40, 45)):
+            low_keys = list(range(small))
+            high_keys = list(range(small + 1, small + 1 + big))
+            t1 = self._random_tree(low_keys, small)
+            t2 = self._random_tree(high_keys, big)
+            joined = AVLTree.join(t1, small, t2, val="mid")
+            self.assertIs(joined, t1)
+            # the balanced count is carried through the join, not left for a recount
+            self.assertFalse(joined._balanced_stale)
+            self._assert_valid(joined, low_keys + [small] + high_keys)
+            self.assertEqual(joined.search(small).value, "mid")
+            self.assertIsNone(t2.get_root())
+
+    def test_split_then_join_round_trip(self):
+        rng = random.Random(5)
+        keys = rng.sample(range(10_000), 1_000)
+        tree = self._random_tree(keys, 6)
+        for _ in range(20):
+            pivot = rng.choice(keys)
+            left, right = tree.split(pivot)
+            node = right.select(0)
+            right.delete(node)
+            tree = left.join(pivot, right, val=str(pivot))
+            self._assert_valid(tree, keys)
+
+    def test_join_rejects_overlapping_ranges(self):
+        with self.assertRaises(ValueError):
+            self._random_tree([1, 5], 0).join(3, self._random_tree([4, 8], 0))
+        with self.assertRaises(ValueError):
+            self._random_tree([1, 2], 0).join(3, self._random_tree([2, 8], 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
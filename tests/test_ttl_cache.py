@@ -0,0 +1,90 @@
+import unittest
+import os
+import random
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from ttl_cache import TTLCache
+from avl_invariants import assert_avl_invariants
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = TTLCache(ttl=10, clock=self.clock)
+
+    def test_get_set_and_expiry(self):
+        self.cache.set("a", 1)
+        self.clock.now = 5
+        self.cache.set("b", 2)
+        self.cache.set("c", 3, ttl=1)
+        self.assertEqual(self.cache.next_expiry(), 6)
+        self.assertEqual(self.cache.get("a"), 1)
+        self.assertIn("c", self.cache)
+        self.clock.now = 10
+        self.assertIsNone(self.cache.get("a"))
+        self.assertNotIn("c", self.cache)
+        self.assertEqual(len(self.cache), 3)
+        self.assertEqual(self.cache.expire(), [("c", 3), ("a", 1)])
+        self.assertEqual(self.cache.expire(), [])
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(self.cache.next_expiry(), 15)
+        self.assertEqual(self.cache.expire(100), [("b", 2)])
+        self.assertIsNone(self.cache.next_expiry())
+        self.assertEqual(len(self.cache), 0)
+
+    def test_overwrite_and_pop(self):
+        self.cache.set("a", 1)
+        self.cache.set("b", 2, ttl=20)
+        self.clock.now = 8
+        self.cache.set("a", "new")
+        self.assertEqual(self.cache.expires_at("a"), 18)
+        self.assertEqual(self.cache.next_expiry(), 18)
+        self.assertEqual(self.cache.pop("b"), 2)
+        self.assertEqual(self.cache.pop("b", "gone"), "gone")
+        self.assertEqual(self.cache.expire(17), [])
+        self.assertEqual(self.cache.expire(18), [("a", "new")])
+
+    def test_equal_expiries_keep_set_order(self):
+        for i in range(5):
+            self.cache.set(i, i)
+        self.assertEqual([key for key, _ in self.cache.expire(10)], [0, 1, 2, 3, 4])
+
+    def test_needs_a_ttl(self):
+        with self.assertRaises(ValueError):
+            TTLCache().set("a", 1)
+
+    def test_random_against_dict(self):
+        rng = random.Random(25)
+        expected = {}
+        for step in range(5_000):
+            self.clock.now += rng.random()
+            op = rng.random()
+            key = rng.randrange(300)
+            if op < 0.6:
+                ttl = rng.choice((10, 10, 10, rng.uniform(0, 30)))
+                self.cache.set(key, step, ttl=ttl)
+                expected[key] = (step, self.clock.now + ttl)
+            elif op < 0.8:
+                self.assertEqual(self.cache.pop(key), expected.pop(key, (None,))[0])
+            else:
+                due = sorted((exp, key) for key, (_, exp) in expected.items() if exp <= self.clock.now)
+                self.assertEqual([key for key, _ in self.cache.expire()], [key for _, key in due])
+                for _, key in due:
+                    del expected[key]
+            self.assertEqual(len(self.cache), len(expected))
+            self.assertEqual(self.cache.next_expiry(), min((exp for _, exp in expected.values()), default=None))
+        assert_avl_invariants(self, self.cache._expiry)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+# =============================
+# TTL Cache
+# =============================
+
+import math
+import time
+from typing import Optional, List, Tuple, Dict, Callable, Any, Hashable
+
+from avl_tree import AVLTree, AVLNode, VirtualAVLNode, min_node_of, successor_of
+
+"""A key-value cache whose entries expire a fixed time after they are set.
+
+A dict maps each key to its entry, and an AVLTree orders the entries by (expiry, seq), seq
+being a counter that keeps equal expiries distinct and in set order. The cache tracks the
+tree's minimum node the way AVLTree tracks self.max, so checking whether anything is due is
+O(1), and expire(now) cuts every due entry off the min side with one split, in O(log n + k)
+for k expired entries instead of a scan over all of them. Most entries are set with the same
+ttl, so their expiries arrive in ascending order and are inserted with start="max"."""
+
+
+class TTLCache(object):
+	"""
+	ttl is the default lifetime for set, in the units of clock (seconds of time.monotonic by
+	default). An entry past its expiry is no longer returned by get or counted by `in`, but it
+	stays in the cache, and in len, until expire removes it.
+	"""
+
+	def __init__(self, ttl: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+		self.ttl: Optional[float] = ttl
+		self.clock: Callable[[], float] = clock
+		self._entries: Dict[Hashable, Tuple[Any, Tuple[float, int]]] = {}  # key -> (value, expiry key)
+		self._expiry: AVLTree = AVLTree()  # (expires_at, seq) -> key
+		self.min: AVLNode = self._expiry.root  # node of the earliest expiry
+		self._seq: int = 0
+
+	# --- Access Methods ---
+	def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+		"""Stores value under key until ttl (default: the cache's ttl) from now, replacing any
+		previous entry and its expiry."""
+		if ttl is None:
+			ttl = self.ttl
+		if ttl is None:
+			raise ValueError("set needs a ttl, as the cache has no default ttl")
+		if key in self._entries:
+			self._remove(self._entries[key][1])
+		expiry_key = (self.clock() + ttl, self._seq)
+		self._seq += 1
+		self._expiry.insert(expiry_key, key, start="max")
+		if not self.min.is_real_node() or expiry_key < self.min.key:
+			self.min = self._expiry.finger  # the node insert just placed
+		self._entries[key] = (value, expiry_key)
+
+	def get(self, key: Hashable, default: Any = None) -> Any:
+		entry = self._entries.get(key)
+		if entry is None or entry[1][0] <= self.clock():
+			return default
+		return entry[0]
+
+	def pop(self, key: Hashable, default: Any = None) -> Any:
+		"""Removes key and returns its value (even if it has expired), default if absent."""
+		entry = self._entries.pop(key, None)
+		if entry is None:
+			return default
+		self._remove(entry[1])
+		return entry[0]
+
+	def __contains__(self, key: Hashable) -> bool:
+		entry = self._entries.get(key)
+		return entry is not None and entry[1][0] > self.clock()
+
+	def __len__(self) -> int:
+		return len(self._entries)
+
+	def expires_at(self, key: Hashable) -> Optional[float]:
+		entry = self._entries.get(key)
+		return None if entry is None else entry[1][0]
+
+	def next_expiry(self) -> Optional[float]:
+		"""The earliest expiry time in the cache, None if it is empty. O(1)."""
+		return self.min.key[0] if self.min.is_real_node() else None
+
+	# --- Expiry ---
+	def expire(self, now: Optional[float] = None) -> List[Tuple[Hashable, Any]]:
+		"""Removes every entry whose expiry is <= now (default: the clock) and returns them as
+		(key, value) pairs, earliest expiry first."""
+		if now is None:
+			now = self.clock()
+		if not self.min.is_real_node() or self.min.key[0] > now:
+			return []
+		# (now, seq) < (now, inf) for every seq, so the left part is exactly what is due
+		due, self._expiry = self._expiry.split((now, math.inf))
+		self.min = min_node_of(self._expiry.root) if self._expiry.root.is_real_node() else self._expiry.root
+		entries = self._entries
+		return [(key, entries.pop(key)[0]) for _, key in due.items()]
+
+	def _remove(self, expiry_key: Tuple[float, int]) -> None:
+		node = self._expiry.search(expiry_key)
+		if node is self.min:
+			# the minimum has no left child, so delete unlinks it without moving its successor
+			nxt = successor_of(node)
+			self.min = nxt if nxt is not None else VirtualAVLNode.get_create_instance()
+		self._expiry.delete(node)